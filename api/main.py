@@ -1,14 +1,22 @@
 from fastapi import FastAPI, HTTPException, Depends, APIRouter, Body, Request
 from typing import List, Dict, Any
-from api.schemas import CourseSchema, ProgramSchema, CategorySchema, RequirementSchema, PlanCreateSchema, PlanSchema, RecommendationSchema, ValidationResultSchema
+from api.schemas import CourseSchema, CourseRequirementMatchSchema, CourseClosureSchema, CourseRequiresSchema, CriticalPathSchema, ScheduleSchema, ProgramSchema, CategorySchema, RequirementSchema, PlanCreateSchema, PlanSchema, CourseOperationsSchema, PlanDiffSchema, ImportReportSchema, RecommendationSchema, ValidationResultSchema
 from models.courses.catalog import Catalog
+from models.courses.registry import catalog_registry
+from models.graph.dependency_graph import catalog_graph
 from models.requirements.program_builder import ProgramBuilder
+from models.requirements.registry import program_registry
+from models.requirements.requirement_index import RequirementIndex
 from models.requirements.policy_engine import PolicyEngine
-from models.planning.academic_planner import AcademicPlanner
+from models.planning.plan_store import PlanManager, make_plan_store
 from models.planning.semester import Semester
-import threading
-from fastapi.responses import JSONResponse
+from models.planning.transcript_import import TranscriptImporter, read_transcripts
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from api.streaming import NDJSON_MEDIA_TYPE, course_fragments, json_array, ndjson, recommendation_lines, recommendations_json
 from core.exceptions import EnrollmentError, ResourceNotFoundError
+from config.config import RECOMMENDATION_PAGE_SIZE, RECOMMENDATION_MAX_PAGE_SIZE
+from core.cache import cache_stats, invalidate_all_caches
 from core.logging import get_logger
 
 app = FastAPI(title="Academic Planning API")
@@ -47,21 +55,24 @@ planning_router = APIRouter()
 recommendations_router = APIRouter()
 validation_router = APIRouter()
 policies_router = APIRouter()
+metrics_router = APIRouter()
 
-# --- In-memory plan storage (thread-safe) ---
-plans: Dict[int, AcademicPlanner] = {}
-plan_lock = threading.Lock()
-plan_counter = 0
+# Cached requirement, graph and eligibility results are derived from catalog data; a new snapshot starts a new generation.
+catalog_registry.add_listener(lambda catalog: invalidate_all_caches())
 
 def get_catalog():
-    return Catalog()
+    return catalog_registry.get()
 
 def get_programs():
-    return ProgramBuilder.build_programs_from_db()
+    return program_registry.get_all()
 
 def get_policy_engine():
     return PolicyEngine()
 
+# --- Plan storage ---
+# Plan state lives in the configured store; planners are rebuilt from it on demand against the shared catalog.
+plan_manager = PlanManager(make_plan_store(), get_catalog, program_registry.get_by_db_ids, get_policy_engine)
+
 def serialize_restriction(r):
     if r is None:
         return None
@@ -123,18 +134,10 @@ def program_to_dict(p, i):
         'school': p.school
     }
 
-def serialize_recommendations(obj):
-    # Recursively serialize recommendations structure
-    if isinstance(obj, list):
-        return [serialize_recommendations(item) for item in obj]
-    elif hasattr(obj, 'to_dict'):
-        return obj.to_dict()
-    elif hasattr(obj, 'get_course_code'):
-        return obj.get_course_code()
-    elif isinstance(obj, dict):
-        return {k: serialize_recommendations(v) for k, v in obj.items()}
-    else:
-        return obj
+def wants_ndjson(request: Request, format: str) -> bool:
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be 'json' or 'ndjson'")
+    return format == "ndjson" or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
 
 @app.get("/", tags=["Health"])
 def health_check():
@@ -142,21 +145,16 @@ def health_check():
 
 # --- Courses ---
 @courses_router.get("/courses", response_model=List[CourseSchema], tags=["Courses"])
-def list_courses():
+def list_courses(request: Request, format: str = "json"):
+    """
+    Every course in the catalog, streamed from pre-encoded course fragments: a JSON array, or one
+    course per line with format=ndjson or an `Accept: application/x-ndjson` header.
+    """
     catalog = get_catalog()
-    return [CourseSchema(
-        course_code=str(c.to_dict().get('course_code', '')),
-        title=str(c.to_dict().get('title', '')),
-        subject_name=c.to_dict().get('subject_name'),
-        subject_code=c.to_dict().get('subject_code'),
-        course_number=c.to_dict().get('course_number'),
-        level=c.to_dict().get('level'),
-        axle=c.to_dict().get('axle'),
-        credits=c.to_dict().get('credits'),
-        prerequisites=c.to_dict().get('prerequisites'),
-        corequisites=c.to_dict().get('corequisites'),
-        description=c.to_dict().get('description')
-    ) for c in catalog.courses]
+    fragments = course_fragments(catalog, catalog.courses)
+    if wants_ndjson(request, format):
+        return StreamingResponse(ndjson(fragments), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(json_array(fragments), media_type="application/json")
 
 @courses_router.get("/courses/{course_code}", response_model=CourseSchema, tags=["Courses"])
 def get_course(course_code: str):
@@ -179,6 +177,45 @@ def get_course(course_code: str):
         description=d.get('description')
     )
 
+@courses_router.get("/courses/{course_code}/requirements", response_model=List[CourseRequirementMatchSchema], tags=["Courses"])
+def get_course_requirements(course_code: str):
+    """Every program requirement the course can count toward."""
+    catalog = get_catalog()
+    if not catalog.get_by_course_code(course_code):
+        raise HTTPException(status_code=404, detail="Course not found")
+    programs = get_programs()
+    positions = {id(p): i for i, p in enumerate(programs)}
+    index = RequirementIndex(programs, catalog)
+    return [CourseRequirementMatchSchema(
+        program_id=positions[id(program)],
+        program=program.name,
+        category=category,
+        requirement=requirement.describe()
+    ) for program, category, requirement in index.matches(course_code)]
+
+def get_course_graph(course_code: str):
+    catalog = get_catalog()
+    if not catalog.get_by_course_code(course_code):
+        raise HTTPException(status_code=404, detail="Course not found")
+    return catalog_graph(catalog)
+
+@courses_router.get("/courses/{course_code}/prerequisites/all", response_model=CourseClosureSchema, tags=["Courses"])
+def get_all_prerequisites(course_code: str):
+    """Everything the course requires, directly or through other prerequisites."""
+    graph = get_course_graph(course_code)
+    return CourseClosureSchema(course_code=course_code, courses=graph.get_all_prerequisites(course_code))
+
+@courses_router.get("/courses/{course_code}/unlocks", response_model=CourseClosureSchema, tags=["Courses"])
+def get_unlocked_courses(course_code: str):
+    """Everything taking the course eventually unlocks."""
+    graph = get_course_graph(course_code)
+    return CourseClosureSchema(course_code=course_code, courses=graph.get_all_dependents(course_code))
+
+@courses_router.get("/courses/{course_code}/requires/{prerequisite}", response_model=CourseRequiresSchema, tags=["Courses"])
+def course_requires(course_code: str, prerequisite: str):
+    graph = get_course_graph(course_code)
+    return CourseRequiresSchema(course_code=course_code, prerequisite=prerequisite, required=graph.requires(course_code, prerequisite))
+
 # --- Programs ---
 @programs_router.get("/programs", response_model=List[ProgramSchema], tags=["Programs"])
 def list_programs():
@@ -244,30 +281,45 @@ def get_requirement(requirement_id: int):
 # --- Planning ---
 @planning_router.post("/plans", response_model=PlanSchema, tags=["Planning"])
 def create_plan(plan: PlanCreateSchema):
-    global plan_counter
-    with plan_lock:
-        plan_id = plan_counter
-        plan_counter += 1
-    catalog = get_catalog()
-    programs = get_programs()
-    selected_programs = [programs[pid] for pid in plan.program_ids if 0 <= pid < len(programs)]
     start_semester = Semester(plan.start_semester, plan.year)
-    planner = AcademicPlanner(catalog, selected_programs, start_semester, policy_engine=get_policy_engine())
-    with plan_lock:
-        plans[plan_id] = planner
+    plan_id, planner = plan_manager.create(program_registry.db_ids(plan.program_ids), start_semester)
     return {
         'id': plan_id,
-        'programs': [program_to_dict(p, i) for i, p in enumerate(selected_programs)],
+        'programs': [program_to_dict(p, i) for i, p in enumerate(planner.plan_config.programs)],
         'completed_courses': [],
         'current_semester': str(start_semester),
         'assignments': {}
     }
 
+@planning_router.post("/plans/import", response_model=ImportReportSchema, tags=["Planning"])
+async def import_transcripts(request: Request, format: str = "jsonl"):
+    """
+    Create one plan per student from a JSONL or CSV transcript feed sent as the request body.
+    Rejected with 413 when a bounded plan store has no room for every student.
+    """
+    if format not in ("jsonl", "csv"):
+        raise HTTPException(status_code=400, detail="format must be 'jsonl' or 'csv'")
+    body = (await request.body()).decode()
+    records = list(read_transcripts(body.splitlines(), format))
+    capacity = plan_manager.store.free_capacity()
+    readable = sum(1 for record in records if record.error is None)
+    if capacity is not None and readable > capacity:
+        # A bounded store would silently drop the earliest imported plans
+        raise HTTPException(status_code=413, detail=f"Importing {readable} students would evict stored plans: "
+                                                    f"the plan store has room for {capacity} more (PLAN_STORE_MAX_PLANS)")
+    importer = TranscriptImporter(
+        get_catalog(),
+        [(entry.db_id, entry.program) for entry in program_registry.entries()],
+        plan_manager.import_plan,
+        get_policy_engine().policy_config,
+    )
+    return await run_in_threadpool(importer.run, records)
+
 @planning_router.get("/plans/{plan_id}", response_model=PlanSchema, tags=["Planning"])
 def get_plan(plan_id: int):
     if plan_id < 0:
         raise HTTPException(status_code=404, detail="Plan not found")
-    planner = plans.get(plan_id)
+    planner = plan_manager.get(plan_id)
     if not planner:
         raise HTTPException(status_code=404, detail="Plan not found")
     return {
@@ -282,31 +334,59 @@ def get_plan(plan_id: int):
 def add_completed_course(plan_id: int, data: dict = Body(...)):
     if plan_id < 0:
         raise HTTPException(status_code=404, detail="Plan not found")
-    planner = plans.get(plan_id)
+    planner = plan_manager.get(plan_id)
     if not planner:
         raise HTTPException(status_code=404, detail="Plan not found")
     planner.add_completed_courses(data)
+    plan_manager.save(plan_id, planner)
     return get_plan(plan_id)
 
 @planning_router.post("/plans/{plan_id}/remove_completed_course", response_model=PlanSchema, tags=["Planning"])
 def remove_completed_course(plan_id: int, data: dict = Body(...)):
     if plan_id < 0:
         raise HTTPException(status_code=404, detail="Plan not found")
-    planner = plans.get(plan_id)
+    planner = plan_manager.get(plan_id)
     if not planner:
         raise HTTPException(status_code=404, detail="Plan not found")
     course_code = data.get("course_code")
-    planner.student_state.completed_courses = [c for c in planner.student_state.completed_courses if c.get_course_code() != course_code]
+    planner.remove_completed_course(course_code)
+    plan_manager.save(plan_id, planner)
+    return get_plan(plan_id)
+
+@planning_router.post("/plans/{plan_id}/course_operations", response_model=PlanDiffSchema, tags=["Planning"])
+def apply_course_operations(plan_id: int, data: CourseOperationsSchema):
+    """Apply add/remove/reassign operations in one transaction; nothing changes if any of them is invalid."""
+    if plan_id < 0:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    planner = plan_manager.get(plan_id)
+    if not planner:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    operations = [{"op": o.op, "course_code": o.course_code, "assignments": o.assignments} for o in data.operations]
+    diff = planner.apply_course_operations(operations)
+    plan_manager.save(plan_id, planner)
+    return {"id": plan_id, **diff}
+
+@planning_router.post("/plans/{plan_id}/auto_assign", response_model=PlanSchema, tags=["Planning"])
+def auto_assign(plan_id: int):
+    """Reassign the plan's completed courses to the categories that complete the most credits."""
+    if plan_id < 0:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    planner = plan_manager.get(plan_id)
+    if not planner:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    planner.auto_assign()
+    plan_manager.save(plan_id, planner)
     return get_plan(plan_id)
 
 @planning_router.post("/plans/{plan_id}/advance_semester", response_model=PlanSchema, tags=["Planning"])
 def advance_semester(plan_id: int):
     if plan_id < 0:
         raise HTTPException(status_code=404, detail="Plan not found")
-    planner = plans.get(plan_id)
+    planner = plan_manager.get(plan_id)
     if not planner:
         raise HTTPException(status_code=404, detail="Plan not found")
     planner.advance_semester()
+    plan_manager.save(plan_id, planner)
     return get_plan(plan_id)
 
 @planning_router.get("/plans/{plan_id}/progress", response_model=PlanSchema, tags=["Planning"])
@@ -315,24 +395,53 @@ def get_progress(plan_id: int):
         raise HTTPException(status_code=404, detail="Plan not found")
     return get_plan(plan_id)
 
+@planning_router.get("/plans/{plan_id}/critical_path", response_model=CriticalPathSchema, tags=["Planning"])
+def get_critical_path(plan_id: int):
+    """Minimum semesters to finish the plan's programs, and the prerequisite chain that forces it."""
+    if plan_id < 0:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    planner = plan_manager.get(plan_id)
+    if not planner:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return CriticalPathSchema(**planner.get_critical_path())
+
+@planning_router.get("/plans/{plan_id}/schedule", response_model=ScheduleSchema, tags=["Planning"])
+def get_schedule(plan_id: int, max_credits: int = Semester.MAX_CREDITS):
+    """Term-by-term schedule from the current semester through graduation."""
+    if plan_id < 0:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    if max_credits < 1:
+        raise HTTPException(status_code=400, detail="max_credits must be positive")
+    planner = plan_manager.get(plan_id)
+    if not planner:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return ScheduleSchema(**planner.generate_schedule(max_credits))
+
 # --- Recommendations ---
 @recommendations_router.get("/plans/{plan_id}/recommendations", response_model=RecommendationSchema, tags=["Recommendations"])
-def get_recommendations(plan_id: int):
+def get_recommendations(request: Request, plan_id: int, limit: int = RECOMMENDATION_PAGE_SIZE, offset: int = 0, format: str = "json"):
+    """
+    The best `limit` courses per category, skipping the first `offset`; `totals` counts every candidate.
+    With format=ndjson (or `Accept: application/x-ndjson`), one {category, total, items} object per line.
+    """
     if plan_id < 0:
         raise HTTPException(status_code=404, detail="Plan not found")
-    planner = plans.get(plan_id)
+    if not 0 < limit <= RECOMMENDATION_MAX_PAGE_SIZE or offset < 0:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {RECOMMENDATION_MAX_PAGE_SIZE} and offset non-negative")
+    planner = plan_manager.get(plan_id)
     if not planner:
         raise HTTPException(status_code=404, detail="Plan not found")
-    recs = planner.get_recommendations()
-    recs_serialized = serialize_recommendations(recs)
-    return RecommendationSchema(recommendations=recs_serialized)
+    ranked = planner.get_ranked_recommendations(limit, offset)
+    if wants_ndjson(request, format):
+        return StreamingResponse(ndjson(recommendation_lines(planner.catalog, ranked)), media_type=NDJSON_MEDIA_TYPE)
+    return Response(recommendations_json(planner.catalog, ranked), media_type="application/json")
 
 # --- Validation ---
 @validation_router.post("/plans/{plan_id}/validate", response_model=ValidationResultSchema, tags=["Validation"])
 def validate_plan(plan_id: int):
     if plan_id < 0:
         raise HTTPException(status_code=404, detail="Plan not found")
-    planner = plans.get(plan_id)
+    planner = plan_manager.get(plan_id)
     if not planner:
         raise HTTPException(status_code=404, detail="Plan not found")
     result = planner.validate_plan()
@@ -367,6 +476,23 @@ def get_policy(policy_id: int):
         raise HTTPException(status_code=404, detail="Policy not found")
     return engine.policy_config[policy_id]
 
+# --- Metrics ---
+@metrics_router.get("/metrics/catalog", tags=["Metrics"])
+def catalog_metrics():
+    return catalog_registry.stats()
+
+@metrics_router.get("/metrics/programs", tags=["Metrics"])
+def program_metrics():
+    return program_registry.stats()
+
+@metrics_router.get("/metrics/cache", tags=["Metrics"])
+def cache_metrics():
+    return cache_stats()
+
+@metrics_router.get("/metrics/plans", tags=["Metrics"])
+def plan_metrics():
+    return plan_manager.stats()
+
 # --- Register routers ---
 app.include_router(courses_router)
 app.include_router(programs_router)
@@ -375,4 +501,5 @@ app.include_router(requirements_router)
 app.include_router(planning_router)
 app.include_router(recommendations_router)
 app.include_router(validation_router)
-app.include_router(policies_router) 
\ No newline at end of file
+app.include_router(policies_router)
+app.include_router(metrics_router) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Any, Tuple
+from typing import List, Optional, Any, Tuple, Dict
 
 class CourseSchema(BaseModel):
     course_code: str
@@ -21,6 +21,12 @@ class RequirementSchema(BaseModel):
     min_credits: Optional[int]
     notes: Optional[str]
 
+class CourseRequirementMatchSchema(BaseModel):
+    program_id: int
+    program: str
+    category: str
+    requirement: str
+
 class CategorySchema(BaseModel):
     id: Optional[int]
     category: str
@@ -49,10 +55,72 @@ class PlanSchema(BaseModel):
     current_semester: str
     assignments: Any
 
-class RecommendationSchema(BaseModel):
-    recommendations: Any
-
 class ValidationResultSchema(BaseModel):
     is_valid: bool
     errors: List[str]
-    warnings: List[str] 
\ No newline at end of file
+    warnings: List[str]
+
+class CourseOperationSchema(BaseModel):
+    op: str
+    course_code: str
+    assignments: List[Tuple[str, str]] = []
+
+class CourseOperationsSchema(BaseModel):
+    operations: List[CourseOperationSchema]
+
+class AssignmentChangeSchema(BaseModel):
+    before: List[Tuple[str, str]]
+    after: List[Tuple[str, str]]
+
+class PlanDiffSchema(BaseModel):
+    id: int
+    added: List[str]
+    removed: List[str]
+    assignments: Dict[str, AssignmentChangeSchema]
+    validation: ValidationResultSchema
+
+class ImportFailureSchema(BaseModel):
+    student_id: str
+    error: str
+
+class ImportReportSchema(BaseModel):
+    plans_created: int
+    failed: int
+    plan_ids: Dict[str, int]
+    failures: List[ImportFailureSchema]
+    skipped_courses: Dict[str, List[str]] = {}
+    seconds: float
+    plans_per_minute: Optional[int]
+
+class RecommendationSchema(BaseModel):
+    recommendations: Any
+    totals: Dict[str, int] = {}
+    offset: int = 0
+    limit: Optional[int] = None
+
+class CourseClosureSchema(BaseModel):
+    course_code: str
+    courses: List[str]
+
+class CourseRequiresSchema(BaseModel):
+    course_code: str
+    prerequisite: str
+    required: bool
+
+class CriticalPathSchema(BaseModel):
+    semesters: int
+    critical_path: List[str]
+    longest_chain: List[str]
+    layers: List[List[str]]
+    unreachable: List[str]
+
+class ScheduledTermSchema(BaseModel):
+    term: str
+    courses: List[str]
+    credits: int
+    assignments: Any
+
+class ScheduleSchema(BaseModel):
+    semesters: List[ScheduledTermSchema]
+    complete: bool
+    unmet: List[Dict[str, str]]
@@ -0,0 +1,103 @@
+import json
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List
+from models.courses.catalog import Catalog
+from models.courses.course import Course
+
+try:
+    import orjson
+except ImportError:
+    # The standard library encoder gives the same bytes, only slower
+    orjson = None
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Course fragments per chunk of a streamed array: few enough to start sending at once, enough to avoid tiny writes
+CHUNK_ITEMS = 256
+
+# Field order of CourseSchema, so streamed courses read the same as validated ones
+COURSE_FIELDS = ("course_code", "title", "subject_name", "subject_code", "course_number", "level",
+                 "axle", "credits", "prerequisites", "corequisites", "description")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+_lock = threading.Lock()
+# catalog snapshot -> course code -> encoded course. Weak keys drop the fragments with the snapshot.
+_fragments: "weakref.WeakKeyDictionary[Catalog, Dict[str, bytes]]" = weakref.WeakKeyDictionary()
+
+
+def course_fragment(catalog: Catalog, course: Course) -> bytes:
+    """The course encoded as a JSON object, once per catalog snapshot."""
+    fragments = _fragments.get(catalog)
+    if fragments is None:
+        with _lock:
+            fragments = _fragments.setdefault(catalog, {})
+    code = course.get_course_code()
+    fragment = fragments.get(code)
+    if fragment is None:
+        fragment = dumps({field: getattr(course, field) for field in COURSE_FIELDS})
+        fragments[code] = fragment
+    return fragment
+
+
+def course_fragments(catalog: Catalog, courses: Iterable[Course]) -> Iterator[bytes]:
+    """Fragments are encoded as they are reached, so the first ones are ready before the last are built."""
+    for course in courses:
+        yield course_fragment(catalog, course)
+
+
+def json_array(fragments: Iterable[bytes], chunk_items: int = CHUNK_ITEMS) -> Iterator[bytes]:
+    """A JSON array of pre-encoded items, in chunks of chunk_items."""
+    chunk: List[bytes] = []
+    separator = b"["
+    for fragment in fragments:
+        chunk.append(fragment)
+        if len(chunk) >= chunk_items:
+            yield separator + b",".join(chunk)
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + b",".join(chunk)
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+def ndjson(fragments: Iterable[bytes], chunk_items: int = CHUNK_ITEMS) -> Iterator[bytes]:
+    """One pre-encoded item per line, in chunks of chunk_items lines."""
+    chunk: List[bytes] = []
+    for fragment in fragments:
+        chunk.append(fragment)
+        if len(chunk) >= chunk_items:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def item_fragment(catalog: Catalog, item) -> bytes:
+    """A recommended course, or a corequisite group as an array of courses."""
+    if isinstance(item, list):
+        return b"[" + b",".join(course_fragment(catalog, course) for course in item) + b"]"
+    return course_fragment(catalog, item)
+
+
+def recommendations_json(catalog: Catalog, ranked: Dict[str, Any]) -> bytes:
+    """RecommendationSchema JSON for get_ranked_recommendations output, spliced from course fragments."""
+    categories = b",".join(
+        dumps(category) + b":[" + b",".join(item_fragment(catalog, item) for item in items) + b"]"
+        for category, items in ranked["recommendations"].items()
+    )
+    return (b'{"recommendations":{' + categories + b'},"totals":' + dumps(ranked["totals"])
+            + b',"offset":' + dumps(ranked["offset"]) + b',"limit":' + dumps(ranked["limit"]) + b"}")
+
+
+def recommendation_lines(catalog: Catalog, ranked: Dict[str, Any]) -> Iterator[bytes]:
+    """One {"category", "total", "items"} object per category, for NDJSON."""
+    for category, items in ranked["recommendations"].items():
+        yield (b'{"category":' + dumps(category) + b',"total":' + dumps(ranked["totals"][category])
+               + b',"items":[' + b",".join(item_fragment(catalog, item) for item in items) + b"]}")
@@ -36,6 +36,58 @@ def load_policy_config(path=POLICY_PATH):
 
 POLICY_CONFIG = load_policy_config()
 
+# === CATALOG SNAPSHOT ===
+# Seconds between background probes of the courses table; 0 disables refreshing.
+CATALOG_REFRESH_INTERVAL = float(os.getenv('CATALOG_REFRESH_INTERVAL', 30))
+# Snapshot file built by db/scripts/build_catalog_snapshot.py; when set, courses are read from it, not the database.
+CATALOG_SNAPSHOT_PATH = os.getenv('CATALOG_SNAPSHOT_PATH', '')
+# Course rows fetched per round trip when the catalog is read from the database.
+CATALOG_LOAD_BATCH_SIZE = int(os.getenv('CATALOG_LOAD_BATCH_SIZE', 2000))
+# Seconds between background probes of the program tables; 0 disables refreshing.
+PROGRAM_REFRESH_INTERVAL = float(os.getenv('PROGRAM_REFRESH_INTERVAL', 30))
+
+# === CACHE CONFIGURATION ===
+# 'redis' puts a shared Redis tier behind the in-process cache; 'memory' runs without Redis.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'redis').lower()
+# Lifetime of cached requirement, graph and eligibility results in Redis; 0 keeps entries until evicted by Redis.
+CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', 3600)) or None
+# Seconds a process trusts its locally known cache generation before re-reading it from Redis.
+CACHE_GENERATION_CHECK_INTERVAL = float(os.getenv('CACHE_GENERATION_CHECK_INTERVAL', 1))
+# In-process tier: entries per namespace and their lifetime in seconds (0 = no expiry).
+CACHE_L1_MAX_ENTRIES = int(os.getenv('CACHE_L1_MAX_ENTRIES', 10000))
+CACHE_L1_TTL_SECONDS = float(os.getenv('CACHE_L1_TTL_SECONDS', 300))
+# Redis writes are pipelined in batches of this size, or flushed after this many seconds.
+CACHE_L2_BATCH_SIZE = int(os.getenv('CACHE_L2_BATCH_SIZE', 100))
+CACHE_L2_FLUSH_INTERVAL = float(os.getenv('CACHE_L2_FLUSH_INTERVAL', 0.05))
+# Seconds to skip Redis after a connection error before trying it again.
+CACHE_L2_RETRY_SECONDS = float(os.getenv('CACHE_L2_RETRY_SECONDS', 30))
+
+# === PLAN STORE CONFIGURATION ===
+# Where plan state lives: 'memory' (this process only), 'redis' or 'postgres' (shared across workers).
+PLAN_STORE_BACKEND = os.getenv('PLAN_STORE_BACKEND', 'memory').lower()
+# Plans kept by the memory backend; 0 = unbounded. The memory backend is the store of record, so a limit
+# drops (and logs) the least recently used plans for good; bound memory with PLAN_CACHE_MAX_LIVE instead.
+PLAN_STORE_MAX_PLANS = int(os.getenv('PLAN_STORE_MAX_PLANS', 0))
+# Lifetime of a plan in Redis after its last save; 0 keeps plans until deleted.
+PLAN_STORE_TTL_SECONDS = int(os.getenv('PLAN_STORE_TTL_SECONDS', 30 * 24 * 3600)) or None
+# Rehydrated planners kept in memory, and seconds without access before one is dropped (0 = never).
+PLAN_CACHE_MAX_LIVE = int(os.getenv('PLAN_CACHE_MAX_LIVE', 256))
+PLAN_CACHE_IDLE_SECONDS = float(os.getenv('PLAN_CACHE_IDLE_SECONDS', 900))
+
+# === TRANSCRIPT IMPORT ===
+# Worker processes building imported plans (0 = one per CPU, 1 = build in the calling process).
+IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', 0))
+# Students sent to a worker per task.
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 50))
+
+# === RECOMMENDATIONS ===
+# Courses per category on one page of /plans/{id}/recommendations, and the most a page may ask for.
+RECOMMENDATION_PAGE_SIZE = int(os.getenv('RECOMMENDATION_PAGE_SIZE', 10))
+RECOMMENDATION_MAX_PAGE_SIZE = int(os.getenv('RECOMMENDATION_MAX_PAGE_SIZE', 100))
+# Weights of the ranking terms: unmet requirements a course can satisfy, courses it unlocks (log scale),
+# its critical-path height and how well its credits fit what the category still needs.
+RECOMMENDATION_WEIGHTS = {'requirements': 3.0, 'unlocks': 1.0, 'height': 2.0, 'credit_fit': 1.0}
+
 # === SEMESTER DEFAULTS ===
 DEFAULT_START_SEMESTER = os.getenv('DEFAULT_START_SEMESTER', 'Fall')
 DEFAULT_START_YEAR = int(os.getenv('DEFAULT_START_YEAR', 2024))
@@ -47,5 +99,11 @@ __all__ = [
     'REDIS_HOST', 'REDIS_PORT', 'REDIS_DB', 'REDIS_PASSWORD',
     'DB_USER', 'DB_PASSWORD', 'DB_HOST', 'DB_PORT', 'DB_NAME', 'DATABASE_URL',
     'COURSES_RAW_PATH', 'COURSES_PARSED_PATH', 'PROGRAMS_PATH', 'POLICY_PATH',
-    'POLICY_CONFIG', 'DEFAULT_START_SEMESTER', 'DEFAULT_START_YEAR', 'CATALOG_URL'
+    'POLICY_CONFIG', 'CATALOG_REFRESH_INTERVAL', 'CATALOG_SNAPSHOT_PATH', 'CATALOG_LOAD_BATCH_SIZE', 'PROGRAM_REFRESH_INTERVAL',
+    'CACHE_BACKEND', 'CACHE_TTL_SECONDS', 'CACHE_GENERATION_CHECK_INTERVAL', 'CACHE_L1_MAX_ENTRIES', 'CACHE_L1_TTL_SECONDS',
+    'CACHE_L2_BATCH_SIZE', 'CACHE_L2_FLUSH_INTERVAL', 'CACHE_L2_RETRY_SECONDS',
+    'PLAN_STORE_BACKEND', 'PLAN_STORE_MAX_PLANS', 'PLAN_STORE_TTL_SECONDS', 'PLAN_CACHE_MAX_LIVE', 'PLAN_CACHE_IDLE_SECONDS',
+    'IMPORT_WORKERS', 'IMPORT_CHUNK_SIZE',
+    'RECOMMENDATION_PAGE_SIZE', 'RECOMMENDATION_MAX_PAGE_SIZE', 'RECOMMENDATION_WEIGHTS',
+    'DEFAULT_START_SEMESTER', 'DEFAULT_START_YEAR', 'CATALOG_URL'
 ] 
\ No newline at end of file
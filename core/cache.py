@@ -0,0 +1,379 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from config.config import (
+    REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD, CACHE_BACKEND, CACHE_TTL_SECONDS,
+    CACHE_GENERATION_CHECK_INTERVAL, CACHE_L1_MAX_ENTRIES, CACHE_L1_TTL_SECONDS,
+    CACHE_L2_BATCH_SIZE, CACHE_L2_FLUSH_INTERVAL, CACHE_L2_RETRY_SECONDS
+)
+from core.refresh import BackgroundRefresher
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+def fingerprint(*parts: Any) -> str:
+    """Short stable hash of the given parts, used in place of long literal key components."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+def course_set_fingerprint(courses: Iterable[Any]) -> str:
+    """Order-independent fingerprint of a set of courses, given as Course objects or course codes."""
+    codes = sorted(c if isinstance(c, str) else c.get_course_code() for c in courses)
+    return fingerprint(*codes)
+
+# === Compact course-set payloads ===
+# A format byte followed by course codes joined with 0x1f. Payloads in an unknown format fail to decode
+# and are evicted, so the format can change without flushing Redis.
+COURSE_CODES_FORMAT = 1
+_CODE_SEPARATOR = '\x1f'
+
+def encode_course_codes(codes: Sequence[str]) -> bytes:
+    return bytes((COURSE_CODES_FORMAT,)) + _CODE_SEPARATOR.join(codes).encode()
+
+def decode_course_codes(raw: bytes) -> Tuple[str, ...]:
+    if not raw or raw[0] != COURSE_CODES_FORMAT:
+        raise ValueError(f"Unsupported course payload format: {raw[:1]!r}")
+    body = raw[1:].decode()
+    return tuple(body.split(_CODE_SEPARATOR)) if body else ()
+
+def rehydrate_courses(codes: Iterable[str], courses: Iterable[Any]) -> List[Any]:
+    """Map cached course codes back onto the caller's Course objects, keeping the cached order."""
+    by_code = {course.get_course_code(): course for course in courses}
+    return [by_code[code] for code in codes if code in by_code]
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache bounded by entry count, with a per-entry time to live.
+    Holds decoded values, so a hit costs one dict lookup and no deserialization.
+    """
+
+    def __init__(self, max_entries: int = CACHE_L1_MAX_ENTRIES, ttl: Optional[float] = CACHE_L1_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (found, value)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires and expires < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisL2:
+    """
+    Shared second-level cache in Redis.
+    Writes are buffered and sent in pipelined batches, either when a batch fills up or from a
+    background flusher. When Redis is unreachable the tier is skipped for `retry_seconds`
+    and every operation degrades to a miss, so callers only ever lose cache hits.
+    """
+
+    def __init__(self, client, batch_size: int = CACHE_L2_BATCH_SIZE,
+                 flush_interval: float = CACHE_L2_FLUSH_INTERVAL, retry_seconds: float = CACHE_L2_RETRY_SECONDS):
+        self.client = client
+        self.batch_size = batch_size
+        self.retry_seconds = retry_seconds
+        self._pending: List[Tuple[str, bytes, Optional[int]]] = []
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self._flusher = BackgroundRefresher(self.flush, flush_interval, name="cache-l2-flusher")
+        self.errors = 0
+        self.flushes = 0
+        self.flushed_writes = 0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        if self.available():
+            logger.warning(f"Redis cache {operation} failed, using the in-process cache only for {self.retry_seconds}s: {error}")
+        self._down_until = time.monotonic() + self.retry_seconds
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.available():
+            return None
+        try:
+            return self.client.get(key)
+        except Exception as e:
+            self._failed("read", e)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: Optional[int]) -> None:
+        if not self.available():
+            return
+        with self._lock:
+            self._pending.append((key, value, ttl))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+        else:
+            self._flusher.start()
+
+    def delete(self, key: str) -> None:
+        if not self.available():
+            return
+        try:
+            self.client.delete(key)
+        except Exception as e:
+            self._failed("delete", e)
+
+    def incr(self, key: str) -> Optional[int]:
+        if not self.available():
+            return None
+        try:
+            return int(self.client.incr(key))
+        except Exception as e:
+            self._failed("incr", e)
+            return None
+
+    def get_int(self, key: str) -> Optional[int]:
+        value = self.get(key)
+        return int(value) if value is not None else None
+
+    def flush(self) -> int:
+        """Send all buffered writes in one pipeline. Returns the number of writes sent."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending or not self.available():
+            return 0
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value, ttl in pending:
+                pipe.set(key, value, ex=ttl)
+            pipe.execute()
+        except Exception as e:
+            self._failed("write", e)
+            return 0
+        self.flushes += 1
+        self.flushed_writes += len(pending)
+        return len(pending)
+
+    def stop(self) -> None:
+        self._flusher.stop()
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": self.available(),
+            "pending_writes": len(self._pending),
+            "flushes": self.flushes,
+            "flushed_writes": self.flushed_writes,
+            "errors": self.errors,
+        }
+
+
+def make_l2(backend: str = CACHE_BACKEND) -> Optional[RedisL2]:
+    """The shared L2 tier for the configured backend, or None in pure in-memory mode."""
+    if backend == 'memory':
+        return None
+    if backend != 'redis':
+        raise ValueError(f"Unknown CACHE_BACKEND '{backend}', expected 'memory' or 'redis'")
+    import redis
+    return RedisL2(redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD))
+
+
+class CacheNamespace:
+    """
+    A named group of cache entries sharing one generation number, served from an in-process
+    L1 in front of an optional shared L2. Every key embeds the current generation, so invalidating
+    the namespace is O(1): entries written under older generations are never read again and expire
+    through their TTL. With an L2 the generation lives in Redis and is re-read at most every
+    `generation_check_interval` seconds, so other processes pick up invalidations.
+    """
+
+    def __init__(self, name: str, encode: Callable[[Any], bytes], decode: Callable[[bytes], Any],
+                 l2: Optional[RedisL2] = None, ttl: Optional[int] = CACHE_TTL_SECONDS,
+                 l1: Optional[LRUCache] = None, generation_check_interval: float = CACHE_GENERATION_CHECK_INTERVAL):
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+        self.l2 = l2
+        self.ttl = ttl
+        self.l1 = l1 if l1 is not None else LRUCache()
+        self.generation_check_interval = generation_check_interval
+        self._generation = 0
+        # Last generation read from or written to the L2. Any change of it is adopted, even to a smaller
+        # value (e.g. Redis restarted and lost it), since only the L2 orders invalidations across processes.
+        self._remote_generation: Optional[int] = None
+        # An invalidation made while Redis was unreachable: its generation is local, so entries are kept in
+        # L1 only until it is replayed to Redis
+        self._unsynced = False
+        self._generation_checked: Optional[float] = None
+        self._lock = threading.Lock()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def generation_key(self) -> str:
+        return f"cache_gen:{self.name}"
+
+    def generation(self) -> int:
+        if self.l2 is None:
+            return self._generation
+        now = time.monotonic()
+        if self._generation_checked is None or now - self._generation_checked >= self.generation_check_interval:
+            if self._unsynced:
+                remote = self.l2.incr(self.generation_key)
+            else:
+                remote = self.l2.get_int(self.generation_key)
+            with self._lock:
+                if remote is not None and (self._unsynced or remote != self._remote_generation):
+                    self._remote_generation = self._generation = remote
+                    self._unsynced = False
+                    self.l1.clear()
+                self._generation_checked = now
+        return self._generation
+
+    def _shared(self) -> Optional[RedisL2]:
+        return self.l2 if not self._unsynced else None
+
+    def key(self, *parts: Any) -> str:
+        return f"{self.name}:g{self.generation()}:{fingerprint(*parts)}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """The cached value for key, or None on a miss."""
+        found, value = self.l1.get(key)
+        if found:
+            self.l1_hits += 1
+            return value
+        l2 = self._shared()
+        raw = l2.get(key) if l2 is not None else None
+        if raw is not None:
+            try:
+                value = self.decode(raw)
+            except Exception:
+                self.evict(key)
+            else:
+                self.l2_hits += 1
+                self.l1.set(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self.l1.set(key, value)
+        l2 = self._shared()
+        if l2 is not None:
+            l2.set(key, self.encode(value), self.ttl)
+        self.writes += 1
+
+    def evict(self, key: str) -> None:
+        """Drop a single entry, e.g. one that could not be decoded."""
+        self.l1.delete(key)
+        if self.l2 is not None:
+            self.l2.delete(key)
+        self.evictions += 1
+
+    def invalidate(self) -> int:
+        """Invalidate every entry in the namespace in O(1) by moving to the next generation."""
+        remote = self.l2.incr(self.generation_key) if self.l2 is not None else None
+        with self._lock:
+            if remote is not None:
+                self._remote_generation = self._generation = remote
+                self._unsynced = False
+            else:
+                self._generation += 1
+                self._unsynced = self.l2 is not None
+            self._generation_checked = time.monotonic()
+            self.l1.clear()
+        self.invalidations += 1
+        return self._generation
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.l1_hits + self.l2_hits
+        lookups = hits + self.misses
+        return {
+            "generation": self._generation,
+            "ttl": self.ttl,
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else None,
+            "writes": self.writes,
+            "evictions": self.evictions + self.l1.evictions,
+            "expirations": self.l1.expirations,
+            "l1_entries": len(self.l1),
+            "invalidations": self.invalidations,
+        }
+
+
+def _encode_int(value: int) -> bytes:
+    return str(value).encode()
+
+def _encode_json(value: Any) -> bytes:
+    return json.dumps(value).encode()
+
+def _encode_bool(value: bool) -> bytes:
+    return b'True' if value else b'False'
+
+l2_cache = make_l2()
+
+requirement_credits_cache = CacheNamespace("req_credits", _encode_int, int, l2=l2_cache)
+requirement_completed_cache = CacheNamespace("req_completed", encode_course_codes, decode_course_codes, l2=l2_cache)
+graph_cache = CacheNamespace("graph", _encode_json, json.loads, l2=l2_cache)
+eligibility_cache = CacheNamespace("eligibility", _encode_bool, lambda raw: raw == b'True', l2=l2_cache)
+
+CACHE_NAMESPACES: Dict[str, CacheNamespace] = {
+    ns.name: ns for ns in (requirement_credits_cache, requirement_completed_cache, graph_cache, eligibility_cache)
+}
+
+def invalidate_requirement_cache() -> None:
+    requirement_credits_cache.invalidate()
+    requirement_completed_cache.invalidate()
+
+def invalidate_graph_cache() -> None:
+    graph_cache.invalidate()
+    eligibility_cache.invalidate()
+
+def invalidate_all_caches() -> None:
+    for ns in CACHE_NAMESPACES.values():
+        ns.invalidate()
+
+def cache_stats() -> Dict[str, Any]:
+    stats: Dict[str, Any] = {name: ns.stats() for name, ns in CACHE_NAMESPACES.items()}
+    stats["l2"] = l2_cache.stats() if l2_cache is not None else None
+    return stats
@@ -58,4 +58,8 @@ class InvalidAssignmentError(EnrollmentError):
     pass
 
 class DatabaseError(EnrollmentError):
-    pass 
\ No newline at end of file
+    pass 
+
+class InvalidSnapshotError(EnrollmentError):
+    """Raised when a catalog snapshot file cannot be read or was written in another format."""
+    pass
@@ -0,0 +1,47 @@
+import threading
+from typing import Callable, Optional
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Calls a refresh function periodically on a daemon thread.
+    Errors are logged and never stop the loop, so callers keep serving their last good state.
+    """
+
+    def __init__(self, refresh_fn: Callable[[], object], interval: float, name: str = "refresher"):
+        self.refresh_fn = refresh_fn
+        self.interval = interval
+        self.name = name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self.interval is None or self.interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.interval)
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh_fn()
+            except Exception as e:
+                logger.error(f"{self.name}: refresh failed: {e}", exc_info=True)
@@ -3,6 +3,7 @@ from .course import Course
 from .program import Program
 from .requirement_category import RequirementCategory
 from .requirement import Requirement
+from .plan import Plan
  
 # Use one Base for all models (they currently each declare their own)
 # For now, expose all models for easy import 
\ No newline at end of file
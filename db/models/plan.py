@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, LargeBinary, DateTime, func
+from .base import Base
+
+class Plan(Base):
+    __tablename__ = 'plans'
+    id = Column(Integer, primary_key=True)
+    state = Column(LargeBinary, nullable=False)  # serialized PlanState
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<Plan(id={self.id}, bytes={len(self.state) if self.state else 0})>"
@@ -12,7 +12,7 @@ class Program(Base):
     notes = Column(Text)
     school = Column(String)
 
-    categories = relationship('RequirementCategory', back_populates='program', cascade="all, delete-orphan")
+    categories = relationship('RequirementCategory', back_populates='program', cascade="all, delete-orphan", order_by='RequirementCategory.id')
 
     __table_args__ = (UniqueConstraint('name', 'type', name='_program_name_type_uc'),)
 
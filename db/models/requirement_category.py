@@ -12,7 +12,7 @@ class RequirementCategory(Base):
     notes = Column(Text)
 
     program = relationship('Program', back_populates='categories')
-    requirements = relationship('Requirement', back_populates='category', cascade="all, delete-orphan")
+    requirements = relationship('Requirement', back_populates='category', cascade="all, delete-orphan", order_by='Requirement.id')
 
     def __repr__(self):
         return f"<RequirementCategory(category={self.category}, program_id={self.program_id})>"
@@ -0,0 +1,46 @@
+import argparse
+import hashlib
+import json
+from config.config import CATALOG_SNAPSHOT_PATH, COURSES_PARSED_PATH
+from db.migrations.migrate_courses import parse_credits
+from models.courses.catalog import Catalog
+from models.courses.course import Course
+from models.courses.registry import probe_course_version
+from models.courses.snapshot import write_snapshot
+
+
+def courses_from_json(path):
+    """Courses of a parsed.json file as migrate_courses stores them: credits as integers, axle as a list, first of each code kept."""
+    with open(path, "rb") as f:
+        payload = f.read()
+    courses, seen = [], set()
+    for record in json.loads(payload):
+        if record.get('course_code') in seen:
+            continue
+        seen.add(record.get('course_code'))
+        axle = record.get('axle')
+        axle = axle if isinstance(axle, list) else [axle] if axle else []
+        courses.append(Course(dict(record, credits=parse_credits(record.get('credits')), axle=axle)))
+    return courses, f"json:{hashlib.sha256(payload).hexdigest()[:16]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the course catalog into a memory-mapped snapshot file.")
+    parser.add_argument("output", nargs="?", default=CATALOG_SNAPSHOT_PATH or None, help="Defaults to CATALOG_SNAPSHOT_PATH")
+    parser.add_argument("--source", choices=["json", "db"], default="json", help="parsed.json or the courses table")
+    parser.add_argument("--json", default=COURSES_PARSED_PATH, help="parsed.json to read with --source json")
+    args = parser.parse_args()
+    if not args.output:
+        parser.error("no output path given and CATALOG_SNAPSHOT_PATH is not set")
+
+    if args.source == "db":
+        version = probe_course_version()
+        courses = Catalog.load_courses()
+    else:
+        courses, version = courses_from_json(args.json)
+    write_snapshot(courses, args.output, version)
+    print(json.dumps({"output": args.output, "version": version, "courses": len(courses)}))
+
+
+if __name__ == "__main__":
+    main()
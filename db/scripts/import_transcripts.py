@@ -0,0 +1,39 @@
+import argparse
+import json
+from config.config import IMPORT_WORKERS, IMPORT_CHUNK_SIZE, PLAN_STORE_BACKEND
+from models.courses.registry import catalog_registry
+from models.requirements.registry import program_registry
+from models.planning.plan_store import PlanManager, make_plan_store
+from models.planning.transcript_import import TranscriptImporter, detect_format, read_transcripts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create one plan per student from a JSONL or CSV transcript file.")
+    parser.add_argument("path", help="Transcript file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Defaults to the file extension")
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS, help="Worker processes; 0 = one per CPU, 1 = no pool")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Students per worker task")
+    args = parser.parse_args()
+
+    store = make_plan_store()
+    if not store.shared:
+        # A memory store lives in this process only: the plans would be gone when the script exits
+        parser.error(f"PLAN_STORE_BACKEND is '{PLAN_STORE_BACKEND}'; set it to 'redis' or 'postgres' so the imported "
+                     "plans are stored where the API reads them")
+
+    catalog = catalog_registry.get()
+    plan_manager = PlanManager(store, catalog_registry.get, program_registry.get_by_db_ids)
+    importer = TranscriptImporter(
+        catalog,
+        [(entry.db_id, entry.program) for entry in program_registry.entries()],
+        plan_manager.import_plan,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    with open(args.path, newline="") as f:
+        report = importer.run(read_transcripts(f, args.format or detect_format(args.path)))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
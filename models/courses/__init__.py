@@ -1,4 +1,5 @@
 from .course import Course
 from .catalog import Catalog
 from .filter import Filter
-from .query import Query
\ No newline at end of file
+from .query import Query
+from .registry import CatalogRegistry, catalog_registry
\ No newline at end of file
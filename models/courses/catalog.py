@@ -1,19 +1,33 @@
 from collections import defaultdict
 from typing import List, Optional, Dict, Any
+from sqlalchemy import Text, and_, case, cast, func, select
 from .course import Course
+from .columns import CourseColumns, CourseList
+from .details import DatabaseDescriptions
+from .snapshot import CatalogSnapshot
 from db.database import SessionLocal
 from db.models.course import Course as ORMCourse
+from config.config import CATALOG_LOAD_BATCH_SIZE
 
 class Catalog:
     """
     Data structure for course storage and fast indexed access.
     """
 
-    def __init__(self):
-        session = SessionLocal()
-        orm_courses = session.query(ORMCourse).all()
-        self.courses: List[Course] = [Course.from_orm(oc) for oc in orm_courses]
-        session.close()
+    def __init__(self, courses: Optional[List[Course]] = None, version: Optional[str] = None,
+                 snapshot: Optional[CatalogSnapshot] = None):
+        """
+        Args:
+            courses: Preloaded courses; loaded from the snapshot, else the database, when omitted
+            version: Identifier of the data the courses were loaded from (e.g. a table fingerprint)
+            snapshot: Snapshot file the courses are read from; its columns and requisite groups are used as saved
+        """
+        if courses is None:
+            courses = snapshot.courses() if snapshot is not None else Catalog.load_courses()
+        # Carries the columnar view used for vectorized filters over the whole catalog
+        self.courses: List[Course] = CourseList(courses, snapshot.columns(courses) if snapshot is not None else None)
+        self.version = version
+        self.snapshot = snapshot
 
         # Core direct lookups
         self.by_course_code: Dict[str, Course] = {}
@@ -29,6 +43,62 @@ class Catalog:
         self.by_axle: Dict[str, List[Course]] = defaultdict(list)
 
         self._build_indexes()
+        self._freeze_indexes()
+        # Built with the other indexes, off the request path when snapshots load in the background
+        self.courses.columns
+
+    def __getstate__(self):
+        # The shared dependency graph (see catalog_graph) is rebuilt where the catalog is unpickled
+        state = self.__dict__.copy()
+        state.pop('_graph', None)
+        return state
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> 'Catalog':
+        """Opens a snapshot file written by snapshot.write_snapshot, without a database."""
+        snapshot = CatalogSnapshot(path)
+        return cls(version=snapshot.version, snapshot=snapshot)
+
+    # Course rows as plain tuples in Course.from_row order. Postgres encodes the requisites, so they are never
+    # decoded here; descriptions are read from the table on first access, not held by every snapshot.
+    COURSE_ROWS = select(
+        ORMCourse.subject_name, ORMCourse.title, ORMCourse.course_code, ORMCourse.subject_code,
+        ORMCourse.course_number, ORMCourse.level, ORMCourse.axle, ORMCourse.credits,
+        case(
+            (and_(ORMCourse.prerequisites.is_(None), ORMCourse.corequisites.is_(None)), None),
+            else_=cast(func.jsonb_build_array(ORMCourse.prerequisites, ORMCourse.corequisites), Text),
+        ).label("requisites"),
+    ).order_by(ORMCourse.id)
+
+    @staticmethod
+    def load_courses(session=None) -> List[Course]:
+        """
+        Streams the course rows from a server-side cursor in CATALOG_LOAD_BATCH_SIZE batches and builds
+        each Course straight from its row, without ORM entities or the identity map.
+        """
+        owned = session is None
+        if owned:
+            session = SessionLocal()
+        try:
+            rows = session.execute(Catalog.COURSE_ROWS, execution_options={"yield_per": CATALOG_LOAD_BATCH_SIZE})
+            # Descriptions come from the same database as the rows, not necessarily SessionLocal's
+            descriptions = DatabaseDescriptions(None if owned else session.get_bind())
+            return [Course.from_row(row, descriptions) for row in rows]
+        finally:
+            if owned:
+                session.close()
+
+    def _freeze_indexes(self):
+        # Catalogs are shared between requests, so drop the defaultdict factories:
+        # a lookup for a missing key must never insert into a shared index.
+        self.by_subject_number = {
+            subj: {lvl: dict(nums) for lvl, nums in levels.items()}
+            for subj, levels in self.by_subject_number.items()
+        }
+        self.by_subject = dict(self.by_subject)
+        self.by_level = dict(self.by_level)
+        self.by_credits = dict(self.by_credits)
+        self.by_axle = dict(self.by_axle)
 
     def _build_indexes(self):
         for course in self.courses:
@@ -60,11 +130,14 @@ class Catalog:
                 except (ValueError, TypeError):
                     credits = course.credits
                 self.by_credits[credits].append(course)
-            if course.axle:
-                axles = course.axle if isinstance(course.axle, list) else [course.axle]
-                for axle in axles:
-                    if axle:
-                        self.by_axle[axle].append(course)
+            for axle in course.get_axle_requirements():
+                if axle:
+                    self.by_axle[axle].append(course)
+
+    @property
+    def columns(self) -> CourseColumns:
+        """Column-wise copy of the courses for vectorized filtering."""
+        return self.courses.columns
 
     # === Access Methods ===
 
@@ -0,0 +1,209 @@
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+from .course import Course
+
+MISSING = -1
+_NUMBER_DIGITS = re.compile(r"\d+")
+
+
+class CourseColumns:
+    """
+    Column-wise copy of a course list for vectorized filtering.
+    subject and course_number strings are stored as ids into a vocabulary, level and credits as integers,
+    the numeric part of the course number ("2294W" -> 2294) for ranges, and axle tags as a CSR matrix:
+    the tag ids of row i are tag_ids[tag_starts[i]:tag_starts[i + 1]]. Missing values are MISSING.
+    Predicates return boolean masks over the rows, which combine with & and | and turn back into
+    courses with select(). Built once per catalog; read-only afterwards.
+    """
+
+    # Per-row and CSR arrays, as saved and restored
+    ARRAYS = ("subject_id", "number_id", "number", "level", "credits", "tag_ids", "tag_starts", "tag_rows")
+    # Columns with posting lists
+    INDEXED = ("subject", "level", "credits", "tag")
+
+    def __init__(self, courses: Sequence[Course]):
+        self.courses = courses
+        self.size = len(courses)
+        self.subjects: Dict[str, int] = {}
+        self.numbers: Dict[str, int] = {}
+        self.tags: Dict[str, int] = {}
+
+        subject_ids, number_ids, numeric, levels, credits = [], [], [], [], []
+        tag_ids: List[int] = []
+        tag_starts = [0]
+        for course in courses:
+            subject_ids.append(self._intern(self.subjects, course.subject_code))
+            number_ids.append(self._intern(self.numbers, course.course_number))
+            digits = _NUMBER_DIGITS.search(course.course_number) if isinstance(course.course_number, str) else None
+            numeric.append(int(digits.group()) if digits else MISSING)
+            levels.append(course.level if isinstance(course.level, int) else MISSING)
+            credits.append(course.credits if isinstance(course.credits, int) else MISSING)
+            for tag in dict.fromkeys(course.get_axle_requirements()):
+                if isinstance(tag, str) and tag:
+                    tag_ids.append(self._intern(self.tags, tag))
+            tag_starts.append(len(tag_ids))
+
+        self.subject_id = np.array(subject_ids, dtype=np.int32)
+        self.number_id = np.array(number_ids, dtype=np.int32)
+        self.number = np.array(numeric, dtype=np.int32)
+        self.level = np.array(levels, dtype=np.int32)
+        self.credits = np.array(credits, dtype=np.int32)
+        self.tag_ids = np.array(tag_ids, dtype=np.int32)
+        self.tag_starts = np.array(tag_starts, dtype=np.int64)
+        # Row of every entry in tag_ids, so a tag predicate is one pass over the entries
+        self.tag_rows = np.repeat(np.arange(self.size, dtype=np.int64), np.diff(self.tag_starts))
+        # column -> (row order that sorts it, sorted values), built on first posting-list lookup
+        self._sorted_columns: Dict[str, tuple] = {}
+
+    @classmethod
+    def restore(cls, courses: Sequence[Course], vocabularies: Dict[str, List[str]], arrays: Dict[str, np.ndarray],
+                sorted_columns: Optional[Dict[str, tuple]] = None) -> 'CourseColumns':
+        """
+        Columns of courses from arrays saved earlier (e.g. views into a catalog snapshot file), without
+        re-reading the courses. vocabularies lists the subjects, numbers and tags in id order.
+        """
+        columns = cls.__new__(cls)
+        columns.courses = courses
+        columns.size = len(courses)
+        for name in ("subjects", "numbers", "tags"):
+            setattr(columns, name, {value: i for i, value in enumerate(vocabularies[name])})
+        for name in cls.ARRAYS:
+            setattr(columns, name, arrays[name])
+        columns._sorted_columns = dict(sorted_columns or {})
+        return columns
+
+    @staticmethod
+    def _intern(vocabulary: Dict[str, int], value) -> int:
+        if not isinstance(value, str) or not value:
+            return MISSING
+        return vocabulary.setdefault(value, len(vocabulary))
+
+    @staticmethod
+    def ids(vocabulary: Dict[str, int], values: Iterable[str]) -> np.ndarray:
+        return np.array([vocabulary[value] for value in values if value in vocabulary], dtype=np.int32)
+
+    # === Predicates ===
+
+    def all(self) -> np.ndarray:
+        return np.ones(self.size, dtype=bool)
+
+    def subject_mask(self, subjects: Union[str, Iterable[str]]) -> np.ndarray:
+        if isinstance(subjects, str):
+            subjects = [subjects]
+        return np.isin(self.subject_id, self.ids(self.subjects, subjects))
+
+    def number_mask(self, numbers: Iterable[str]) -> np.ndarray:
+        """Courses whose course_number is one of the given strings."""
+        return np.isin(self.number_id, self.ids(self.numbers, numbers))
+
+    def level_mask(self, level: int) -> np.ndarray:
+        return self.level == level
+
+    def level_range_mask(self, min_level: Optional[int] = None, max_level: Optional[int] = None) -> np.ndarray:
+        """Courses with a level within the bounds; a bound of None is open."""
+        mask = self.level != MISSING
+        if min_level is not None:
+            mask &= self.level >= min_level
+        if max_level is not None:
+            mask &= self.level <= max_level
+        return mask
+
+    def credits_mask(self, credits: Union[int, Iterable[int]]) -> np.ndarray:
+        if isinstance(credits, int):
+            credits = [credits]
+        return np.isin(self.credits, np.array(list(credits), dtype=np.int64))
+
+    def tag_mask(self, tags: Union[str, Iterable[str]], match_all: bool = False) -> np.ndarray:
+        """Courses with any (or, with match_all, every) of the axle tags."""
+        if isinstance(tags, str):
+            tags = [tags]
+        wanted = set(tags)
+        ids = self.ids(self.tags, wanted)
+        if match_all and len(ids) < len(wanted):
+            return np.zeros(self.size, dtype=bool)
+        hits = np.isin(self.tag_ids, ids)
+        if match_all:
+            return np.bincount(self.tag_rows[hits], minlength=self.size) >= len(ids)
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.tag_rows[hits]] = True
+        return mask
+
+    def has_number_mask(self) -> np.ndarray:
+        return self.number_id != MISSING
+
+    # === Posting lists ===
+
+    def postings(self, column: str, keys: Iterable) -> np.ndarray:
+        """
+        Ascending rows whose value in column ("subject", "level", "credits" or "tag") is any of keys,
+        read from a sorted copy of the column instead of scanning it.
+        """
+        if column == "subject":
+            keys = self.ids(self.subjects, keys)
+        elif column == "tag":
+            keys = self.ids(self.tags, keys)
+        order, values = self._sorted(column)
+        keys = np.unique(np.asarray(list(keys), dtype=np.int64))
+        lows = np.searchsorted(values, keys, side="left")
+        highs = np.searchsorted(values, keys, side="right")
+        runs = [order[low:high] for low, high in zip(lows.tolist(), highs.tolist()) if high > low]
+        if not runs:
+            return np.empty(0, dtype=np.int64)
+        if column == "tag":
+            runs = [self.tag_rows[run] for run in runs]
+        # Each run is ascending (the sort is stable); several keys need a merge
+        return runs[0] if len(runs) == 1 else np.unique(np.concatenate(runs))
+
+    def sorted_column(self, column: str):
+        """(row order that sorts the column, sorted values) of one of INDEXED."""
+        return self._sorted(column)
+
+    def _sorted(self, column: str):
+        cached = self._sorted_columns.get(column)
+        if cached is None:
+            values = {"subject": self.subject_id, "level": self.level, "credits": self.credits, "tag": self.tag_ids}[column]
+            order = np.argsort(values, kind="stable")
+            cached = self._sorted_columns[column] = (order, values[order])
+        return cached
+
+    # === Results ===
+
+    def select(self, mask: np.ndarray) -> List[Course]:
+        return self.take(np.flatnonzero(mask))
+
+    def take(self, rows: np.ndarray) -> List[Course]:
+        return list(map(self.courses.__getitem__, rows.tolist()))
+
+    def count(self, mask: np.ndarray) -> int:
+        return int(np.count_nonzero(mask))
+
+
+class CourseList(list):
+    """
+    The course list of a Catalog, carrying its CourseColumns (built on first use) so code that is
+    handed the whole catalog list can filter it vectorized; copies and slices are plain lists.
+    """
+
+    _columns: Optional[CourseColumns] = None
+
+    def __init__(self, courses: Iterable[Course] = (), columns: Optional[CourseColumns] = None):
+        super().__init__(courses)
+        if columns is not None:
+            self._columns = columns
+
+    @property
+    def columns(self) -> CourseColumns:
+        columns = self._columns
+        if columns is None or columns.size != len(self):
+            columns = self._columns = CourseColumns(self)
+        return columns
+
+    def __reduce_ex__(self, protocol):
+        # Columns are rebuilt on demand rather than pickled
+        return CourseList, (list(self),)
+
+
+def columns_of(courses: Sequence[Course]) -> Optional[CourseColumns]:
+    """The columnar view of a catalog course list, or None for any other list."""
+    return courses.columns if isinstance(courses, CourseList) else None
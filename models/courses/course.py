@@ -1,44 +1,98 @@
+import json
+import sys
 from collections import defaultdict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from core.exceptions import InvalidCourseError, InvalidCreditsError, InvalidLevelError
 
+try:
+    # Decodes requisites faster; encoding stays with json, as orjson's bytes keep their whole write buffer
+    import orjson
+except ImportError:
+    orjson = None
+
+# One shared tuple per distinct axle tag combination; a catalog has a few dozen
+_axles: Dict[tuple, tuple] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_axle(axle):
+    if isinstance(axle, (list, tuple)):
+        tags = tuple(_intern(tag) for tag in axle)
+        return _axles.setdefault(tags, tags)
+    return _intern(axle)
+
+
+def _encode_requisites(prerequisites, corequisites) -> Optional[bytes]:
+    if prerequisites is None and corequisites is None:
+        return None
+    return json.dumps([prerequisites, corequisites], separators=(",", ":")).encode()
+
+
+def _validate(course_code, title, credits, level) -> None:
+    if not isinstance(course_code, str) or not course_code.strip():
+        raise InvalidCourseError("course_code must be a non-empty string")
+    if not isinstance(title, str) or not title.strip():
+        raise InvalidCourseError("title must be a non-empty string")
+    if credits is not None and (not isinstance(credits, int) or credits < 0):
+        raise InvalidCreditsError("credits must be a non-negative integer")
+    if level is not None and (not isinstance(level, int) or level < 0):
+        raise InvalidLevelError("level must be a non-negative integer")
+
+
+def _decode_requisites(encoded: Optional[bytes]):
+    if encoded is None:
+        return None, None
+    return orjson.loads(encoded) if orjson is not None else json.loads(encoded)
+
+
 class Course:
     """
     Represents a course with all its attributes.
-    """
-
-    def __init__(self, course_data: Dict[str, Any]):
-        self.subject_name = course_data.get('subject_name')
-        self.title = course_data.get('title')
 
-        self.course_code = course_data.get('course_code')
-        self.subject_code = course_data.get('subject_code')
-        self.course_number = course_data.get('course_number')
-        self.level = course_data.get('level')
+    Courses are immutable and slotted, as every catalog snapshot holds thousands of them.
+    Subject codes, subject names and axle tags are interned and identical axle lists shared.
+    Requisites are kept as compact JSON and decoded on access, so each read returns fresh lists.
+    The description is either the text or a DescriptionSource (see details.py) that loads it on first access.
+    """
 
-        self.axle = course_data.get('axle')
-        self.credits = course_data.get('credits')
+    __slots__ = ('subject_name', 'title', 'course_code', 'subject_code', 'course_number', 'level',
+                 'axle', 'credits', '_requisites', '_description')
 
-        self.prerequisites = course_data.get('prerequisites')
-        self.corequisites = course_data.get('corequisites')
-        # Add support for alternate field names
-        self.prereqs = course_data.get('prereqs')
-        self.coreqs = course_data.get('coreqs')
+    def __init__(self, course_data: Dict[str, Any], description_source=None):
+        course_code = course_data.get('course_code')
+        title = course_data.get('title')
+        credits = course_data.get('credits')
+        level = course_data.get('level')
 
-        self.description = course_data.get('description')
+        _validate(course_code, title, credits, level)
 
-        # Validation
-        if not isinstance(self.course_code, str) or not self.course_code.strip():
-            raise InvalidCourseError("course_code must be a non-empty string")
-        if not isinstance(self.title, str) or not self.title.strip():
-            raise InvalidCourseError("title must be a non-empty string")
-        if self.credits is not None and (not isinstance(self.credits, int) or self.credits < 0):
-            raise InvalidCreditsError("credits must be a non-negative integer")
-        if self.level is not None and (not isinstance(self.level, int) or self.level < 0):
-            raise InvalidLevelError("level must be a non-negative integer")
+        init = object.__setattr__
+        init(self, 'subject_name', _intern(course_data.get('subject_name')))
+        init(self, 'title', title)
+        init(self, 'course_code', course_code)
+        init(self, 'subject_code', _intern(course_data.get('subject_code')))
+        init(self, 'course_number', course_data.get('course_number'))
+        init(self, 'level', level)
+        init(self, 'axle', _intern_axle(course_data.get('axle')))
+        init(self, 'credits', credits)
+        # 'prereqs'/'coreqs' are alternate field names; when non-empty they win, as in DependencyGraph
+        init(self, '_requisites', _encode_requisites(
+            course_data.get('prereqs') or course_data.get('prerequisites'),
+            course_data.get('coreqs') or course_data.get('corequisites'),
+        ))
+        description = course_data.get('description')
+        init(self, '_description', description_source if description is None and description_source is not None else description)
 
     @classmethod
-    def from_orm(cls, orm_course):
+    def from_orm(cls, orm_course, description_source=None):
+        """
+        Args:
+            orm_course: Course row
+            description_source: Where to read the description when the row was loaded without it
+        """
         data = {
             'subject_name': orm_course.subject_name,
             'title': orm_course.title,
@@ -50,18 +104,72 @@ class Course:
             'credits': orm_course.credits,
             'prerequisites': orm_course.prerequisites,
             'corequisites': orm_course.corequisites,
-            'description': orm_course.description
         }
-        # Validation
-        if not isinstance(data['course_code'], str) or not data['course_code'].strip():
-            raise InvalidCourseError("course_code must be a non-empty string")
-        if not isinstance(data['title'], str) or not data['title'].strip():
-            raise InvalidCourseError("title must be a non-empty string")
-        if data['credits'] is not None and (not isinstance(data['credits'], int) or data['credits'] < 0):
-            raise InvalidCreditsError("credits must be a non-negative integer")
-        if data['level'] is not None and (not isinstance(data['level'], int) or data['level'] < 0):
-            raise InvalidLevelError("level must be a non-negative integer")
-        return cls(data)
+        if description_source is None:
+            data['description'] = orm_course.description
+        # Validation happens once, in __init__
+        return cls(data, description_source)
+
+    @classmethod
+    def from_row(cls, row: Sequence, description_source=None) -> 'Course':
+        """
+        A course from a database row of plain values in from_encoded order, requisites as JSON text of the
+        [prerequisites, corequisites] pair or None (see Catalog.COURSE_ROWS); validated, without a dict in between.
+        """
+        subject_name, title, course_code, subject_code, course_number, level, axle, credits, requisites = row
+        _validate(course_code, title, credits, level)
+        return cls.from_encoded(subject_name, title, course_code, subject_code, course_number, level, axle, credits,
+                                requisites.encode() if requisites is not None else None, description_source)
+
+    @property
+    def prerequisites(self):
+        return _decode_requisites(self._requisites)[0]
+
+    @property
+    def corequisites(self):
+        return _decode_requisites(self._requisites)[1]
+
+    def encoded_requisites(self) -> Optional[bytes]:
+        """The requisites as stored: compact JSON of [prerequisites, corequisites], or None for neither."""
+        return self._requisites
+
+    @property
+    def description(self) -> Optional[str]:
+        description = self._description
+        if description is None or isinstance(description, str):
+            return description
+        return description.get(self.course_code)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Course is immutable; cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Course is immutable; cannot delete '{name}'")
+
+    @classmethod
+    def from_encoded(cls, subject_name, title, course_code, subject_code, course_number, level, axle, credits,
+                     requisites: Optional[bytes], description) -> 'Course':
+        """
+        A course from values already validated and encoded, in slot order, e.g. unpickled or read
+        from a catalog snapshot. requisites is the encoded [prerequisites, corequisites] pair or None;
+        description is the text, None or a DescriptionSource.
+        """
+        course = object.__new__(cls)
+        init = object.__setattr__
+        init(course, 'subject_name', _intern(subject_name))
+        init(course, 'title', title)
+        init(course, 'course_code', course_code)
+        init(course, 'subject_code', _intern(subject_code))
+        init(course, 'course_number', course_number)
+        init(course, 'level', level)
+        init(course, 'axle', _intern_axle(axle))
+        init(course, 'credits', credits)
+        init(course, '_requisites', requisites)
+        init(course, '_description', description)
+        return course
+
+    def __reduce__(self):
+        return Course.from_encoded, tuple(object.__getattribute__(self, slot) for slot in Course.__slots__)
 
     def __str__(self):
         return f"{self.course_code}: {self.title}"
@@ -76,10 +184,12 @@ class Course:
         return (self.subject_code, self.course_number)
     
     def has_prerequisites(self):
-        return self.prerequisites is not None and len(self.prerequisites) > 0
+        prerequisites = self.prerequisites
+        return prerequisites is not None and len(prerequisites) > 0
     
     def has_corequisites(self):
-        return self.corequisites is not None and len(self.corequisites) > 0
+        corequisites = self.corequisites
+        return corequisites is not None and len(corequisites) > 0
     
     def get_credit_hours(self):
         try:
@@ -90,13 +200,15 @@ class Course:
             return 0
         
     def get_axle_requirements(self):
+        """The axle tags as a sequence; the shared tuple, not a copy."""
         if not self.axle:
-            return []
-        if isinstance(self.axle, list):
+            return ()
+        if isinstance(self.axle, tuple):
             return self.axle
-        return [self.axle]
+        return (self.axle,)
     
     def to_dict(self):
+        prerequisites, corequisites = _decode_requisites(self._requisites)
         return {
             'subject_name': self.subject_name,
             'title': self.title,
@@ -104,9 +216,10 @@ class Course:
             'subject_code': self.subject_code,
             'course_number': self.course_number,
             'level': self.level,
-            'axle': self.axle,
+            'axle': list(self.axle) if isinstance(self.axle, tuple) else self.axle,
             'credits': self.credits,
-            'prerequisites': self.prerequisites,
-            'corequisites': self.corequisites,
+            'prerequisites': prerequisites,
+            'corequisites': corequisites,
             'description': self.description
-        }
\ No newline at end of file
+        }
+
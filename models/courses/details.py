@@ -0,0 +1,51 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from db.database import SessionLocal
+from db.models.course import Course as ORMCourse
+
+
+class DescriptionSource(ABC):
+    """
+    Side store for course descriptions, which are long, rarely read and kept out of Course objects.
+    A Course loaded without its description holds the source and asks it on first access.
+    """
+
+    @abstractmethod
+    def get(self, course_code: str) -> Optional[str]:
+        """The description of the course, or None if it has none."""
+
+
+class DatabaseDescriptions(DescriptionSource):
+    """
+    Descriptions of the courses table, read in one query when the first one is asked for.
+    bind is the engine or connection the courses were read from; None reads through SessionLocal.
+    Pickles without the loaded text or the bind (e.g. into worker processes), which reload it through
+    SessionLocal only if they need it.
+    """
+
+    def __init__(self, bind=None):
+        self.bind = bind
+        self._lock = threading.Lock()
+        self._descriptions: Optional[Dict[str, Optional[str]]] = None
+
+    def get(self, course_code: str) -> Optional[str]:
+        descriptions = self._descriptions
+        if descriptions is None:
+            with self._lock:
+                if self._descriptions is None:
+                    self._descriptions = self.load()
+                descriptions = self._descriptions
+        return descriptions.get(course_code)
+
+    def load(self) -> Dict[str, Optional[str]]:
+        session = Session(bind=self.bind) if self.bind is not None else SessionLocal()
+        try:
+            rows = session.query(ORMCourse.course_code, ORMCourse.description).all()
+            return {code: description for code, description in rows}
+        finally:
+            session.close()
+
+    def __reduce__(self):
+        return DatabaseDescriptions, ()
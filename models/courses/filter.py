@@ -1,11 +1,13 @@
 from typing import List, Optional, Union, Dict, Set
 from .course import Course
 from .catalog import Catalog
+from .columns import columns_of
 from core.exceptions import InvalidCourseError
 
 class Filter:
     """
     Provides flexible filtering over a catalog of courses.
+    Filters over the whole catalog evaluate as masks on its CourseColumns; other course lists are scanned.
     """
 
     def __init__(self, catalog: Catalog):
@@ -29,6 +31,9 @@ class Filter:
             courses = self.catalog.courses
         if isinstance(subjects, str):
             subjects = [subjects]
+        columns = columns_of(courses)
+        if columns is not None:
+            return columns.select(columns.subject_mask(subjects))
         return [c for c in courses if c.subject_code in subjects]
 
     def get_courses_by_axle(self, axles: Union[str, List[str]], match_all: bool = False, courses: Optional[List[Course]] = None) -> List[Course]:
@@ -36,6 +41,9 @@ class Filter:
             courses = self.catalog.courses
         if isinstance(axles, str):
             axles = [axles]
+        columns = columns_of(courses)
+        if columns is not None:
+            return columns.select(columns.tag_mask(axles, match_all))
         if match_all:
             return [c for c in courses if all(ax in (c.axle or []) for ax in axles)]
         else:
@@ -44,6 +52,9 @@ class Filter:
     def get_courses_by_level(self, level: int, courses: Optional[List[Course]] = None) -> List[Course]:
         if courses is None:
             courses = self.catalog.courses
+        columns = columns_of(courses)
+        if columns is not None:
+            return columns.select(columns.level_mask(level))
         return [c for c in courses if c.level == level]
 
     def get_courses_by_level_range(self, min_level: Optional[int] = None, max_level: Optional[int] = None, courses: Optional[List[Course]] = None) -> List[Course]:
@@ -51,6 +62,9 @@ class Filter:
             courses = self.catalog.courses
         if min_level is None and max_level is None:
             return []
+        columns = columns_of(courses)
+        if columns is not None:
+            return columns.select(columns.level_range_mask(min_level, max_level))
         result = []
         for course in courses:
             if course.level is None:
@@ -68,6 +82,9 @@ class Filter:
             courses = self.catalog.courses
         if isinstance(credits, int):
             credits = [credits]
+        columns = columns_of(courses)
+        if columns is not None:
+            return columns.select(columns.credits_mask(credits))
 
         target = set(credits)
         result = []
@@ -96,6 +113,9 @@ class Filter:
     def exclude_course_numbers(self, numbers: List[str], courses: Optional[List[Course]] = None) -> List[Course]:
         if courses is None:
             courses = self.catalog.courses
+        columns = columns_of(courses)
+        if columns is not None:
+            return columns.select(~columns.number_mask(numbers))
         return [c for c in courses if c.course_number not in numbers]
 
     # === Utilities ===
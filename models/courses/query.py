@@ -1,49 +1,195 @@
-from typing import List, Optional, Union
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Union
+import numpy as np
 from .course import Course
 from .catalog import Catalog
+from .columns import CourseColumns
 from .filter import Filter
 
+
+class Predicate(ABC):
+    """
+    One Query step. estimate() is an upper bound on the matching courses read from the Catalog indexes;
+    rows() lists the matching rows of the catalog columns, test() checks given rows.
+    """
+
+    def estimate(self, catalog: Catalog) -> int:
+        return len(catalog.courses)
+
+    def rows(self, columns: CourseColumns) -> np.ndarray:
+        return np.flatnonzero(self.test(columns, np.arange(columns.size)))
+
+    @abstractmethod
+    def test(self, columns: CourseColumns, rows: np.ndarray) -> np.ndarray:
+        """Boolean mask of the given rows that match."""
+
+
+class IndexedPredicate(Predicate):
+    """Value of one indexed column in a set of keys; the catalog index is keyed the same way."""
+
+    column = ""
+
+    def __init__(self, keys: Iterable):
+        self.keys = list(dict.fromkeys(keys))
+
+    @abstractmethod
+    def index(self, catalog: Catalog) -> dict:
+        """The catalog index on the column: key -> list of courses."""
+
+    def estimate(self, catalog: Catalog) -> int:
+        index = self.index(catalog)
+        return sum(len(index.get(key, ())) for key in self.keys)
+
+    def rows(self, columns: CourseColumns) -> np.ndarray:
+        return columns.postings(self.column, self.keys)
+
+
+class SubjectPredicate(IndexedPredicate):
+    column = "subject"
+
+    def index(self, catalog):
+        return catalog.by_subject
+
+    def test(self, columns, rows):
+        return np.isin(columns.subject_id[rows], columns.ids(columns.subjects, self.keys))
+
+
+class LevelPredicate(IndexedPredicate):
+    column = "level"
+
+    def index(self, catalog):
+        return catalog.by_level
+
+    def test(self, columns, rows):
+        return np.isin(columns.level[rows], self.keys)
+
+
+class LevelRangePredicate(LevelPredicate):
+    """A level range is the set of catalog levels inside it."""
+
+    def __init__(self, catalog: Catalog, min_level: Optional[int], max_level: Optional[int]):
+        super().__init__(level for level in catalog.get_all_levels()
+                         if (min_level is None or level >= min_level) and (max_level is None or level <= max_level))
+
+
+class CreditsPredicate(IndexedPredicate):
+    column = "credits"
+
+    def index(self, catalog):
+        return catalog.by_credits
+
+    def test(self, columns, rows):
+        return np.isin(columns.credits[rows], self.keys)
+
+
+class AxlePredicate(IndexedPredicate):
+    column = "tag"
+
+    def __init__(self, keys: Iterable[str], match_all: bool = False):
+        super().__init__(keys)
+        self.match_all = match_all
+
+    def index(self, catalog):
+        return catalog.by_axle
+
+    def estimate(self, catalog):
+        if not self.match_all:
+            return super().estimate(catalog)
+        return min((len(catalog.by_axle.get(key, ())) for key in self.keys), default=len(catalog.courses))
+
+    def rows(self, columns):
+        if not self.match_all:
+            return super().rows(columns)
+        if not self.keys:
+            return np.arange(columns.size)
+        # Intersect the posting lists, shortest first
+        postings = sorted((columns.postings("tag", [key]) for key in self.keys), key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def test(self, columns, rows):
+        return columns.tag_mask(self.keys, self.match_all)[rows]
+
+
+class ExcludeNumbersPredicate(Predicate):
+    def __init__(self, numbers: Iterable[str]):
+        self.numbers = list(numbers)
+
+    def test(self, columns, rows):
+        return ~np.isin(columns.number_id[rows], columns.ids(columns.numbers, self.numbers))
+
+
 class Query:
     """
     Chains filter operations to enable narrowing of course lists based on criteria.
+
+    Steps are collected, not applied. results() and count() start from the step whose Catalog index
+    lists the fewest courses (e.g. one subject before a common level), take its rows from the columnar
+    posting lists, and narrow them with the remaining steps from most to least selective: by intersecting
+    posting lists while they are shorter than the rows left, otherwise by checking those rows' columns.
+    Course objects are only built by results(); count() builds none.
     """
 
     def __init__(self, catalog: Catalog):
         self.catalog = catalog
         self.filter = Filter(catalog)
-        self.courses: List[Course] = catalog.courses.copy()
+        self.columns = catalog.columns
+        self.predicates: List[Predicate] = []
 
     def reset(self) -> 'Query':
-        self.courses = self.catalog.courses.copy()
+        self.predicates = []
         return self
-    
-    def by_subject(self, subjects: Union[str, List[str]]) -> 'Query':
-        self.courses = self.filter.get_courses_by_subject(subjects, self.courses)
+
+    def where(self, predicate: Predicate) -> 'Query':
+        self.predicates.append(predicate)
         return self
-    
+
+    def by_subject(self, subjects: Union[str, List[str]]) -> 'Query':
+        return self.where(SubjectPredicate([subjects] if isinstance(subjects, str) else subjects))
+
     def by_axle(self, axles: Union[str, List[str]], match_all: bool = False) -> 'Query':
-        self.courses = self.filter.get_courses_by_axle(axles, match_all, self.courses)
-        return self
-    
+        return self.where(AxlePredicate([axles] if isinstance(axles, str) else axles, match_all))
+
     def by_level(self, level: int) -> 'Query':
-        self.courses = self.filter.get_courses_by_level(level, self.courses)
-        return self
-    
+        return self.where(LevelPredicate([level]))
+
     def by_level_range(self, min_level: Optional[int] = None, max_level: Optional[int] = None) -> 'Query':
-        self.courses = self.filter.get_courses_by_level_range(min_level, max_level, self.courses)
-        return self
-    
+        if min_level is None and max_level is None:
+            # As Filter.get_courses_by_level_range: no bounds selects nothing
+            return self.where(LevelPredicate([]))
+        return self.where(LevelRangePredicate(self.catalog, min_level, max_level))
+
     def by_credits(self, credits: Union[int, List[int]]) -> 'Query':
-        self.courses = self.filter.get_courses_by_credits(credits, self.courses)
-        return self
+        return self.where(CreditsPredicate([credits] if isinstance(credits, int) else credits))
 
     def exclude_numbers(self, numbers: List[str]) -> 'Query':
-        self.courses = self.filter.exclude_course_numbers(numbers, self.courses)
-        return self
+        return self.where(ExcludeNumbersPredicate(numbers))
+
+    # === Execution ===
+
+    def plan(self) -> List[Predicate]:
+        """The steps in execution order, most selective first; the first one drives."""
+        estimates = [(predicate.estimate(self.catalog), i, predicate) for i, predicate in enumerate(self.predicates)]
+        return [predicate for _, _, predicate in sorted(estimates, key=lambda entry: entry[:2])]
+
+    def _rows(self) -> np.ndarray:
+        plan = self.plan()
+        if not plan:
+            return np.arange(self.columns.size)
+        rows = plan[0].rows(self.columns)
+        for predicate in plan[1:]:
+            if not len(rows):
+                break
+            if isinstance(predicate, IndexedPredicate) and predicate.estimate(self.catalog) < len(rows):
+                rows = np.intersect1d(rows, predicate.rows(self.columns), assume_unique=True)
+            else:
+                rows = rows[predicate.test(self.columns, rows)]
+        return rows
 
     def results(self) -> List[Course]:
-        return self.courses.copy()
+        return self.columns.take(self._rows())
 
     def count(self) -> int:
-        return len(self.courses)
-    
+        return len(self._rows())
@@ -0,0 +1,135 @@
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional
+from sqlalchemy import text
+from .catalog import Catalog
+from .snapshot import read_snapshot_version
+from db.database import SessionLocal
+from config.config import CATALOG_REFRESH_INTERVAL, CATALOG_SNAPSHOT_PATH
+from core.refresh import BackgroundRefresher
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Cheap fingerprint of the courses table: changes whenever a row is inserted, updated or deleted.
+COURSE_VERSION_QUERY = text(
+    "SELECT count(*), coalesce(md5(string_agg(md5(c::text), '' ORDER BY c.id)), '') FROM courses c"
+)
+
+def probe_course_version() -> str:
+    session = SessionLocal()
+    try:
+        count, digest = session.execute(COURSE_VERSION_QUERY).one()
+        return f"{count}:{digest}"
+    finally:
+        session.close()
+
+def load_catalog(version: Optional[str]) -> Catalog:
+    return Catalog(version=version)
+
+def probe_snapshot_version() -> str:
+    # Rebuilding the file with other data changes the version in its header
+    return read_snapshot_version(CATALOG_SNAPSHOT_PATH)
+
+def load_snapshot_catalog(version: Optional[str]) -> Catalog:
+    return Catalog.from_snapshot(CATALOG_SNAPSHOT_PATH)
+
+
+class CatalogRegistry:
+    """
+    Process-wide holder of the shared catalog snapshot.
+    The snapshot is loaded once, shared by every request and planner, and replaced atomically
+    by a background refresher when the courses table changes. Snapshots are never mutated in place.
+    """
+
+    def __init__(self, loader: Callable[[Optional[str]], Catalog] = load_catalog,
+                 version_probe: Callable[[], str] = probe_course_version,
+                 refresh_interval: float = CATALOG_REFRESH_INTERVAL):
+        self._loader = loader
+        self._probe = version_probe
+        self._lock = threading.Lock()
+        self._catalog: Optional[Catalog] = None
+        self._refresher = BackgroundRefresher(self.refresh, refresh_interval, name="catalog-refresher")
+        self._listeners: List[Callable[[Catalog], None]] = []
+        self.hits = 0
+        self.reloads = 0
+        self.probe_failures = 0
+        self.last_reload_seconds: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        catalog = self._catalog
+        return catalog.version if catalog is not None else None
+
+    def get(self) -> Catalog:
+        catalog = self._catalog
+        if catalog is not None:
+            self.hits += 1
+            return catalog
+        with self._lock:
+            if self._catalog is None:
+                self._load(self._probe_version())
+        self._refresher.start()
+        return self._catalog
+
+    def add_listener(self, callback: Callable[[Catalog], None]) -> None:
+        """Call callback with the new snapshot whenever a reload replaces an existing one."""
+        self._listeners.append(callback)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the snapshot if the courses table changed. Returns True if a new snapshot was installed."""
+        version = self._probe_version()
+        if not force and self._catalog is not None and (version is None or version == self._catalog.version):
+            return False
+        with self._lock:
+            if not force and self._catalog is not None and version == self._catalog.version:
+                return False
+            self._load(version)
+        return True
+
+    def _probe_version(self) -> Optional[str]:
+        try:
+            return self._probe()
+        except Exception as e:
+            self.probe_failures += 1
+            logger.error(f"Catalog version probe failed: {e}")
+            return None
+
+    def _load(self, version: Optional[str]) -> None:
+        # Build the new snapshot completely before swapping the reference,
+        # so readers always see either the old or the new catalog, never a partial one.
+        started = time.perf_counter()
+        catalog = self._loader(version)
+        self.last_reload_seconds = time.perf_counter() - started
+        self.loaded_at = time.time()
+        replaced = self._catalog is not None
+        self._catalog = catalog
+        self.reloads += 1
+        logger.info(f"Loaded catalog snapshot version={version} courses={len(catalog.courses)} in {self.last_reload_seconds:.3f}s")
+        if replaced:
+            for callback in self._listeners:
+                try:
+                    callback(catalog)
+                except Exception as e:
+                    logger.error(f"Catalog reload listener failed: {e}", exc_info=True)
+
+    def stop(self) -> None:
+        self._refresher.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        catalog = self._catalog
+        return {
+            "version": catalog.version if catalog is not None else None,
+            "courses": len(catalog.courses) if catalog is not None else 0,
+            "hits": self.hits,
+            "reloads": self.reloads,
+            "probe_failures": self.probe_failures,
+            "last_reload_seconds": self.last_reload_seconds,
+            "loaded_at": self.loaded_at,
+            "refresher_running": self._refresher.is_running(),
+        }
+
+
+catalog_registry = (CatalogRegistry(load_snapshot_catalog, probe_snapshot_version) if CATALOG_SNAPSHOT_PATH
+                    else CatalogRegistry())
@@ -0,0 +1,270 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from core.exceptions import InvalidSnapshotError
+from models.graph.logic import and_of_ors
+from .course import Course
+from .columns import CourseColumns, MISSING
+from .details import DescriptionSource
+
+MAGIC = b"CATSNAP\0"
+FORMAT_VERSION = 1
+# MAGIC, format version, header length; the JSON header follows, then the sections
+_PREFIX = struct.Struct("<8sII")
+# Sections start on multiples of this, so every array can be viewed in place
+_ALIGN = 8
+
+# axle_kind values: how the axle was given, so it reads back the same
+_AXLE_NONE, _AXLE_STRING, _AXLE_LIST = 0, 1, 2
+
+
+class StringTable:
+    """Distinct strings, stored NUL-separated and addressed by id; a missing value is MISSING."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def add(self, value) -> int:
+        if not isinstance(value, str):
+            return MISSING
+        if "\0" in value:
+            raise InvalidSnapshotError(f"Cannot store a string containing NUL: {value[:40]!r}")
+        return self.ids.setdefault(value, len(self.ids))
+
+    def encode(self) -> bytes:
+        return "\0".join(self.ids).encode()
+
+
+def _starts(lengths: Sequence[int]) -> np.ndarray:
+    starts = np.zeros(len(lengths) + 1, dtype="<i8")
+    starts[1:] = np.cumsum(lengths)
+    return starts
+
+
+def _csr(rows: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(starts, items): the items of row i are items[starts[i]:starts[i + 1]]."""
+    starts = _starts([len(row) for row in rows])
+    items = np.fromiter((item for row in rows for item in row), dtype="<i4", count=int(starts[-1]))
+    return starts, items
+
+
+def _blobs(values: Sequence[Optional[bytes]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(starts, bytes) of variable-length values; a missing value is empty."""
+    starts = _starts([len(value or b"") for value in values])
+    return starts, np.frombuffer(b"".join(value or b"" for value in values), dtype="u1")
+
+
+def write_snapshot(courses: Sequence[Course], path: str, version: Optional[str] = None) -> None:
+    """
+    Compiles courses into a snapshot file at path, replacing any existing one atomically.
+
+    Layout: a string table; per-course string ids; the CourseColumns arrays and their sorted posting
+    orders; axle tags, requisite JSON and descriptions as CSR arrays (starts + items); and the requisites
+    split into AND-of-OR groups of string ids, as DependencyGraph reads them.
+    """
+    columns = CourseColumns(courses)
+    strings = StringTable()
+    sections: Dict[str, np.ndarray] = {}
+
+    for name in ("code", "title", "subject_name"):
+        field = "course_code" if name == "code" else name
+        sections[name] = np.array([strings.add(getattr(course, field)) for course in courses], dtype="<i4")
+    for name in ("subjects", "numbers", "tags"):
+        sections[name] = np.array([strings.add(value) for value in getattr(columns, name)], dtype="<i4")
+    for name in CourseColumns.ARRAYS:
+        array = getattr(columns, name)
+        sections[name] = array.astype(array.dtype.newbyteorder("<"), copy=False)
+    for column in CourseColumns.INDEXED:
+        order, values = columns.sorted_column(column)
+        sections[f"order_{column}"] = order.astype("<i8", copy=False)
+        sections[f"sorted_{column}"] = values.astype(values.dtype.newbyteorder("<"), copy=False)
+
+    kinds, axles = [], []
+    for course in courses:
+        axle = course.axle
+        if axle is None:
+            kinds.append(_AXLE_NONE)
+            axles.append(())
+        elif isinstance(axle, (list, tuple)):
+            kinds.append(_AXLE_LIST)
+            axles.append([strings.add(tag) for tag in axle])
+        else:
+            kinds.append(_AXLE_STRING)
+            axles.append([strings.add(axle)])
+    sections["axle_kind"] = np.array(kinds, dtype="u1")
+    sections["axle_starts"], sections["axle_items"] = _csr(axles)
+
+    sections["requisite_starts"], sections["requisite_bytes"] = _blobs([course.encoded_requisites() for course in courses])
+    descriptions = [course.description for course in courses]
+    sections["description_present"] = np.array([description is not None for description in descriptions], dtype="u1")
+    sections["description_starts"], sections["description_bytes"] = _blobs(
+        [description.encode() if description is not None else None for description in descriptions])
+
+    for kind in ("prereq", "coreq"):
+        groups_of = [and_of_ors(course.prerequisites if kind == "prereq" else course.corequisites) for course in courses]
+        sections[f"{kind}_group_starts"] = _starts([len(groups) for groups in groups_of])
+        groups = [[strings.add(member) for member in group] for course_groups in groups_of for group in course_groups]
+        sections[f"{kind}_member_starts"], sections[f"{kind}_members"] = _csr(groups)
+
+    sections["strings"] = np.frombuffer(strings.encode(), dtype="u1")
+
+    layout, offset = {}, 0
+    for name, array in sections.items():
+        layout[name] = [offset, array.dtype.str, len(array)]
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    header = json.dumps({"version": version, "courses": len(courses), "strings": len(strings.ids),
+                         "sections": layout}).encode()
+    data_start = -(-(_PREFIX.size + len(header)) // _ALIGN) * _ALIGN
+
+    temporary = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)) + header)
+            for name, array in sections.items():
+                f.seek(data_start + layout[name][0])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def _read_header(f) -> Tuple[dict, int]:
+    prefix = f.read(_PREFIX.size)
+    if len(prefix) < _PREFIX.size:
+        raise InvalidSnapshotError("Catalog snapshot is truncated")
+    magic, format_version, header_length = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise InvalidSnapshotError("Not a catalog snapshot file")
+    if format_version != FORMAT_VERSION:
+        raise InvalidSnapshotError(f"Catalog snapshot format {format_version} is not the supported format {FORMAT_VERSION}")
+    header = json.loads(f.read(header_length))
+    return header, -(-(_PREFIX.size + header_length) // _ALIGN) * _ALIGN
+
+
+def read_snapshot_version(path: str) -> Optional[str]:
+    """The data version recorded in a snapshot file, read from its header only."""
+    with open(path, "rb") as f:
+        return _read_header(f)[0]["version"]
+
+
+class CatalogSnapshot:
+    """
+    A snapshot file opened read-only and memory-mapped.
+    Arrays are numpy views into the mapping, so opening costs page faults rather than decoding rows,
+    and processes that open the same file share its pages. Strings are decoded once; descriptions
+    stay in the mapping until read. Pickles as its path and reopens on load (e.g. in worker processes).
+    """
+
+    def __init__(self, path: str):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            header, self._data_start = _read_header(f)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.version: Optional[str] = header["version"]
+        self.size: int = header["courses"]
+        self._layout: Dict[str, list] = header["sections"]
+        self.strings: List[str] = self._bytes("strings").decode().split("\0") if header["strings"] else []
+        self._rows: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def reopen(cls, path: str, version: Optional[str]) -> 'CatalogSnapshot':
+        snapshot = cls(path)
+        if snapshot.version != version:
+            raise InvalidSnapshotError(f"Catalog snapshot {path} changed from version {version} to {snapshot.version}")
+        return snapshot
+
+    def __reduce__(self):
+        return CatalogSnapshot.reopen, (self.path, self.version)
+
+    def array(self, name: str) -> np.ndarray:
+        offset, dtype, count = self._layout[name]
+        return np.frombuffer(self._map, dtype=dtype, count=count, offset=self._data_start + offset)
+
+    def _bytes(self, name: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        offset, _, count = self._layout[name]
+        base = self._data_start + offset
+        return self._map[base + start:base + (count if end is None else end)]
+
+    def _string_list(self, name: str) -> List[Optional[str]]:
+        strings = self.strings
+        return [strings[i] if i != MISSING else None for i in self.array(name).tolist()]
+
+    # === Catalog ===
+
+    def courses(self) -> List[Course]:
+        strings = self.strings
+        codes, titles, names = (self._string_list(name) for name in ("code", "title", "subject_name"))
+        subjects, numbers = self._string_list("subjects"), self._string_list("numbers")
+        subject_ids, number_ids = self.array("subject_id").tolist(), self.array("number_id").tolist()
+        levels, credits = self.array("level").tolist(), self.array("credits").tolist()
+        kinds = self.array("axle_kind").tolist()
+        axle_starts, axle_items = self.array("axle_starts").tolist(), self.array("axle_items").tolist()
+        requisite_starts = self.array("requisite_starts").tolist()
+        described = self.array("description_present").tolist()
+        descriptions = SnapshotDescriptions(self)
+
+        courses = []
+        for row in range(self.size):
+            kind = kinds[row]
+            if kind == _AXLE_NONE:
+                axle = None
+            else:
+                tags = [strings[i] if i != MISSING else None for i in axle_items[axle_starts[row]:axle_starts[row + 1]]]
+                axle = tags if kind == _AXLE_LIST else tags[0]
+            start, end = requisite_starts[row], requisite_starts[row + 1]
+            courses.append(Course.from_encoded(
+                names[row], titles[row], codes[row],
+                subjects[subject_ids[row]] if subject_ids[row] != MISSING else None,
+                numbers[number_ids[row]] if number_ids[row] != MISSING else None,
+                levels[row] if levels[row] != MISSING else None,
+                axle,
+                credits[row] if credits[row] != MISSING else None,
+                self._bytes("requisite_bytes", start, end) if end > start else None,
+                descriptions if described[row] else None,
+            ))
+        return courses
+
+    def columns(self, courses: Sequence[Course]) -> CourseColumns:
+        """The saved CourseColumns of courses (as returned by courses()), viewed in place."""
+        vocabularies = {name: self._string_list(name) for name in ("subjects", "numbers", "tags")}
+        arrays = {name: self.array(name) for name in CourseColumns.ARRAYS}
+        sorted_columns = {column: (self.array(f"order_{column}"), self.array(f"sorted_{column}"))
+                          for column in CourseColumns.INDEXED}
+        return CourseColumns.restore(courses, vocabularies, arrays, sorted_columns)
+
+    def requisite_groups(self) -> Dict[str, Tuple[List[List[str]], List[List[str]]]]:
+        """course code -> (prerequisite groups, corequisite groups), as DependencyGraph splits them."""
+        strings = self.strings
+        split = []
+        for kind in ("prereq", "coreq"):
+            group_starts = self.array(f"{kind}_group_starts").tolist()
+            member_starts = self.array(f"{kind}_member_starts").tolist()
+            members = [strings[i] if i != MISSING else None for i in self.array(f"{kind}_members").tolist()]
+            groups = [members[member_starts[g]:member_starts[g + 1]] for g in range(len(member_starts) - 1)]
+            split.append([groups[group_starts[row]:group_starts[row + 1]] for row in range(self.size)])
+        return {code: (prereqs, coreqs) for code, prereqs, coreqs in zip(self._string_list("code"), *split)}
+
+    def description(self, course_code: str) -> Optional[str]:
+        rows = self._rows
+        if rows is None:
+            rows = self._rows = {code: row for row, code in enumerate(self._string_list("code"))}
+        row = rows.get(course_code)
+        if row is None or not self.array("description_present")[row]:
+            return None
+        starts = self.array("description_starts")
+        return self._bytes("description_bytes", int(starts[row]), int(starts[row + 1])).decode()
+
+
+class SnapshotDescriptions(DescriptionSource):
+    """Descriptions read from the snapshot mapping when asked for."""
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+
+    def get(self, course_code: str) -> Optional[str]:
+        return self.snapshot.description(course_code)
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class CourseIndex:
+    """
+    Assigns every course code a dense integer id so that sets of courses can be held
+    as Python int bitsets (bit i set <=> course with id i is in the set).
+    """
+
+    def __init__(self, codes: Iterable[str] = ()):
+        self.codes: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for code in codes:
+            self.add(code)
+
+    def add(self, code: str) -> int:
+        course_id = self.ids.get(code)
+        if course_id is None:
+            course_id = len(self.codes)
+            self.ids[code] = course_id
+            self.codes.append(code)
+        return course_id
+
+    def get(self, code: str) -> Optional[int]:
+        return self.ids.get(code)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.ids
+
+    # === Conversions ===
+
+    def to_bitset(self, codes: Iterable[str]) -> int:
+        """Bitset of the given codes. Codes without an id cannot be referenced by any mask and are ignored."""
+        ids = self.ids
+        bits = 0
+        for code in codes:
+            course_id = ids.get(code)
+            if course_id is not None:
+                bits |= 1 << course_id
+        return bits
+
+    def from_bitset(self, bits: int) -> List[str]:
+        return [self.codes[i] for i in iter_bits(bits)]
+
+    def compile_groups(self, groups: List[List[str]]) -> Tuple[int, ...]:
+        """Compile AND-of-OR groups into one OR-mask per AND group."""
+        return tuple(self.to_bitset(group) for group in groups)
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def masks_satisfied(masks: Tuple[int, ...], bits: int) -> bool:
+    """True if every AND group has at least one course present in bits."""
+    for mask in masks:
+        if not mask & bits:
+            return False
+    return True
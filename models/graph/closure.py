@@ -0,0 +1,120 @@
+from typing import List, Optional, Sequence, Tuple
+from models.graph.bitset import iter_bits
+
+
+class TransitiveClosure:
+    """
+    Transitive prerequisite closure over a graph's CourseIndex, one int bitset per course id:
+    ancestors[i] is everything course i requires directly or indirectly, descendants[i] everything
+    it eventually unlocks. Every alternative of an OR group counts as a prerequisite.
+    Immutable; with_prerequisites() derives an updated closure without a full rebuild.
+    """
+
+    def __init__(self, direct: Sequence[int], order: Optional[Sequence[int]] = None,
+                 ancestors: Optional[List[int]] = None, descendants: Optional[List[int]] = None):
+        self.direct = tuple(direct)  # direct[i] = bitset of course i's direct prerequisites
+        self.order = tuple(order if order is not None else _topological_order(self.direct))
+        if ancestors is None:
+            ancestors = [0] * len(self.direct)
+            _propagate(self.direct, ancestors, self.order)
+        if descendants is None:
+            descendants = _invert(ancestors)
+        self.ancestors = tuple(ancestors)
+        self.descendants = tuple(descendants)
+
+    @classmethod
+    def from_graph(cls, graph) -> "TransitiveClosure":
+        return cls(direct_prerequisites(graph))
+
+    def __len__(self) -> int:
+        return len(self.direct)
+
+    def requires(self, course_id: int, prerequisite_id: int) -> bool:
+        return bool(self.ancestors[course_id] >> prerequisite_id & 1)
+
+    def with_prerequisites(self, course_id: int, bits: int) -> "TransitiveClosure":
+        """
+        Closure after course_id's direct prerequisites become bits. Only the course and the courses
+        it unlocks can gain or lose ancestors, so only their rows (and the matching descendant bits) are recomputed.
+        """
+        direct = list(self.direct)
+        direct[course_id] = bits
+        # The courses that reach course_id do so without using its own prerequisite edges, so this set is unchanged
+        affected = self.descendants[course_id] | 1 << course_id
+        affected_ids = [i for i in self.order if affected >> i & 1]
+
+        ancestors = list(self.ancestors)
+        touched = 0
+        for i in affected_ids:
+            touched |= ancestors[i]
+            ancestors[i] = 0
+        _propagate(direct, ancestors, affected_ids)
+
+        descendants = list(self.descendants)
+        keep = ~affected
+        for a in iter_bits(touched):
+            descendants[a] &= keep
+        for i in affected_ids:
+            bit = 1 << i
+            for a in iter_bits(ancestors[i]):
+                descendants[a] |= bit
+        return TransitiveClosure(direct, self.order, ancestors, descendants)
+
+    def with_changes(self, changes: Sequence[Tuple[int, int]]) -> "TransitiveClosure":
+        closure = self
+        for course_id, bits in changes:
+            closure = closure.with_prerequisites(course_id, bits)
+        return closure
+
+
+def direct_prerequisites(graph) -> List[int]:
+    """Bitset of each course id's direct prerequisites, from the graph's compiled prerequisite masks."""
+    direct = [0] * len(graph.index)
+    for code, logic in graph.prereq_logic.items():
+        bits = 0
+        for mask in logic.masks or ():
+            bits |= mask
+        direct[graph.index.get(code)] = bits
+    return direct
+
+
+def _topological_order(direct: Sequence[int]) -> List[int]:
+    """Prerequisites before the courses that need them; courses on requisite cycles come last."""
+    remaining = [bin(bits).count("1") for bits in direct]
+    dependents: List[List[int]] = [[] for _ in direct]
+    for i, bits in enumerate(direct):
+        for j in iter_bits(bits):
+            dependents[j].append(i)
+    order = [i for i, count in enumerate(remaining) if count == 0]
+    for i in order:
+        for d in dependents[i]:
+            remaining[d] -= 1
+            if remaining[d] == 0:
+                order.append(d)
+    if len(order) < len(direct):
+        placed = set(order)
+        order.extend(i for i in range(len(direct)) if i not in placed)
+    return order
+
+
+def _propagate(direct: Sequence[int], ancestors: List[int], ids: Sequence[int]) -> None:
+    """Grow ancestors[i] for i in ids to a fixed point. One pass suffices in topological order; cycles take a few more."""
+    changed = True
+    while changed:
+        changed = False
+        for i in ids:
+            bits = direct[i]
+            for j in iter_bits(direct[i]):
+                bits |= ancestors[j]
+            if bits != ancestors[i]:
+                ancestors[i] = bits
+                changed = True
+
+
+def _invert(ancestors: Sequence[int]) -> List[int]:
+    descendants = [0] * len(ancestors)
+    for i, bits in enumerate(ancestors):
+        bit = 1 << i
+        for a in iter_bits(bits):
+            descendants[a] |= bit
+    return descendants
@@ -0,0 +1,256 @@
+from typing import Collection, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from models.courses.columns import columns_of
+from models.graph.dependency_graph import DependencyGraph
+from models.requirements.requirement_types.requirement import Requirement
+from models.requirements.requirement_types.evaluation import CodeSetPlan, CompoundPlan, EvaluationPlan, FilterPlan
+from core.exceptions import EnrollmentError
+
+UNREACHABLE = float("inf")
+
+
+class CriticalPath:
+    """
+    Minimum number of semesters to finish a set of target courses.
+    layers[i] holds the courses that can be taken at the earliest in the (i + 1)th remaining semester;
+    critical_path is one longest prerequisite chain, longest_chain every course on some longest chain.
+    heights[code] is the number of semesters from a course's term to the last one its dependents need,
+    the usual list-scheduling priority.
+    """
+
+    def __init__(self, semesters: int, critical_path: List[str], longest_chain: List[str],
+                 layers: List[List[str]], unreachable: List[str], heights: Optional[Dict[str, int]] = None):
+        self.semesters = semesters
+        self.critical_path = critical_path
+        self.longest_chain = longest_chain
+        self.layers = layers
+        self.unreachable = unreachable
+        self.heights = heights or {}
+
+    def to_dict(self) -> dict:
+        return {
+            "semesters": self.semesters,
+            "critical_path": self.critical_path,
+            "longest_chain": self.longest_chain,
+            "layers": self.layers,
+            "unreachable": self.unreachable,
+        }
+
+    def __repr__(self):
+        return f"<CriticalPath semesters={self.semesters} path={self.critical_path}>"
+
+
+class CriticalPathSolver:
+    """
+    Earliest semester of each course given the completed courses, on the prerequisite DAG:
+    completed courses are at depth 0, a course is one semester after the cheapest option of each
+    prerequisite AND group, and no earlier than the cheapest option of each corequisite group.
+    Mutual corequisites are solved as one node. Depths are memoized, so a solve visits each
+    course and requisite edge at most once. Create one per completed-course set.
+    A depth found while a prerequisite cycle is still open treats the open courses as unreachable,
+    which only holds for the course the cycle started from, so only that one is memoized.
+    """
+
+    def __init__(self, graph: DependencyGraph, completed_codes: Iterable[str]):
+        self.graph = graph
+        self.completed: Set[str] = set(completed_codes)
+        self._depth: Dict[str, float] = {}
+        # Options that set a course's depth: (prerequisite options, corequisite options)
+        self._binding: Dict[str, Tuple[List[str], List[str]]] = {}
+        # Cheapest option chosen for every requisite group, i.e. the courses a course actually needs
+        self._chosen: Dict[str, List[str]] = {}
+        # Courses being solved -> their nesting level, and the lowest level a solve ran into
+        self._visiting: Dict[str, int] = {}
+        self._low = UNREACHABLE
+
+    # === Course depths ===
+
+    def depth(self, code: str) -> float:
+        """Earliest remaining semester (1-based) in which the course can be taken; 0 if completed, inf if impossible."""
+        depth = self._depth.get(code)
+        if depth is not None:
+            return depth
+        if code in self.completed:
+            return 0
+        if code not in self.graph.nodes:
+            return UNREACHABLE
+        level = self._visiting.get(code)
+        if level is not None:
+            # On a prerequisite cycle: no way through here, but callers above level depend on that
+            self._low = min(self._low, level)
+            return UNREACHABLE
+        members = [c for c in self.graph.mutual_corequisite_groups().get(code, (code,)) if c not in self.completed]
+        level, outer_low = len(self._visiting), self._low
+        self._visiting.update((member, level) for member in members)
+        self._low = UNREACHABLE
+        try:
+            depth, prereq_binding, coreq_binding, chosen = self._solve_node(members)
+        finally:
+            for member in members:
+                del self._visiting[member]
+            low, self._low = self._low, outer_low
+        if low < level:
+            # Found assuming a course still being solved is unreachable; recomputed once that one is done
+            self._low = min(self._low, low)
+            return depth
+        for member in members:
+            self._depth[member] = depth
+            self._binding[member] = (prereq_binding, coreq_binding)
+            self._chosen[member] = chosen
+        return depth
+
+    def _solve_node(self, members: List[str]):
+        in_node = set(members)
+        depth: float = 1
+        prereq_needs: List[Tuple[float, str]] = []
+        coreq_needs: List[Tuple[float, str]] = []
+        for member in members:
+            prereq_logic = self.graph.get_prerequisite_logic(member)
+            for group in prereq_logic.groups if prereq_logic else ():
+                option = self._cheapest(group)
+                if option is None:
+                    return UNREACHABLE, [], [], []
+                prereq_needs.append((self.depth(option) + 1, option))
+            coreq_logic = self.graph.get_corequisite_logic(member)
+            for group in coreq_logic.groups if coreq_logic else ():
+                if in_node.intersection(group):
+                    continue
+                option = self._cheapest(group)
+                if option is None:
+                    return UNREACHABLE, [], [], []
+                coreq_needs.append((self.depth(option), option))
+        for need, _ in prereq_needs + coreq_needs:
+            depth = max(depth, need)
+        chosen = [option for _, option in prereq_needs + coreq_needs if option not in self.completed]
+        prereq_binding = [option for need, option in prereq_needs if need == depth]
+        coreq_binding = [option for need, option in coreq_needs if need == depth]
+        return depth, prereq_binding, coreq_binding, chosen
+
+    def _cheapest(self, group: Sequence[str]) -> Optional[str]:
+        """The OR option that can be completed soonest; ties keep the listed order."""
+        best, best_depth = None, UNREACHABLE
+        for option in group:
+            depth = self.depth(option)
+            if depth < best_depth:
+                best, best_depth = option, depth
+                if depth == 0:
+                    break
+        return best
+
+    # === Requirements ===
+
+    def chosen(self, code: str) -> List[str]:
+        """The option picked from each of the course's requisite groups that is not completed yet."""
+        self.depth(code)
+        return list(self._chosen.get(code, ()))
+
+    def requirement_targets(self, requirements: Iterable[Requirement], catalog_courses: Sequence,
+                            exclude: Collection[str] = (), counted: Collection[str] = (),
+                            additional: bool = False) -> List[str]:
+        """
+        Courses to take for the requirements, choosing the cheapest way to meet each.
+        Credit totals are not counted; requirements no catalog course can meet are skipped.
+        Courses in exclude are never picked where another course would do (filters and choose-N lists);
+        courses in counted already count toward the requirements. With additional, choose-N lists
+        that are already met still pick one more course, for categories that are short of credits.
+        """
+        targets: List[str] = []
+        for requirement in requirements:
+            for code in self._plan_targets(requirement.evaluation_plan(), catalog_courses, exclude, counted, additional) or ():
+                if code not in targets:
+                    targets.append(code)
+        return targets
+
+    def _plan_targets(self, plan: EvaluationPlan, catalog_courses: Sequence, exclude: Collection[str] = (),
+                      counted: Collection[str] = (), additional: bool = False) -> Optional[List[str]]:
+        if isinstance(plan, CodeSetPlan):
+            codes = sorted(plan.codes)
+            if plan.min_required is None:
+                return codes
+            remaining = plan.min_required - sum(1 for code in codes if code in counted)
+            if additional:
+                remaining = max(remaining, 1)
+            candidates = [code for code in codes if code not in exclude and code not in counted]
+            return sorted(candidates, key=self.depth)[:max(remaining, 0)]
+        if isinstance(plan, FilterPlan):
+            best, best_depth = None, UNREACHABLE
+            columns = columns_of(catalog_courses)
+            matching = columns.select(plan.mask(columns)) if columns is not None else catalog_courses
+            for course in matching:
+                code = course.get_course_code()
+                if code in exclude:
+                    continue
+                try:
+                    if not code or (columns is None and not plan.matches(course)):
+                        continue
+                except EnrollmentError:
+                    continue
+                depth = self.depth(code)
+                if best is None or depth < best_depth:
+                    best, best_depth = [code], depth
+                    if depth == 0:
+                        break
+            return best
+        if isinstance(plan, CompoundPlan):
+            options = [self._plan_targets(option, catalog_courses, exclude, counted, additional) for option in plan.options]
+            if plan.op == "AND":
+                return None if None in options else [code for option in options for code in option]
+            return min((option for option in options if option is not None), key=self._finish, default=None)
+        return None
+
+    def _finish(self, codes: Sequence[str]) -> float:
+        return max((self.depth(code) for code in codes), default=0)
+
+    # === Solving ===
+
+    def solve(self, targets: Iterable[str]) -> CriticalPath:
+        targets = [code for code in targets if code not in self.completed]
+        reachable = [code for code in targets if self.depth(code) != UNREACHABLE]
+        unreachable = [code for code in targets if self.depth(code) == UNREACHABLE]
+        semesters = int(max((self.depth(code) for code in reachable), default=0))
+
+        # Every course needed for the targets, through the chosen prerequisite options, layered by depth
+        needed: List[str] = []
+        seen: Set[str] = set()
+        stack = list(reversed(reachable))
+        while stack:
+            code = stack.pop()
+            if code in seen or code in self.completed:
+                continue
+            seen.add(code)
+            needed.append(code)
+            # Mutual corequisites are taken together
+            stack.extend(self.graph.mutual_corequisite_groups().get(code, ()))
+            stack.extend(reversed(self._chosen.get(code, [])))
+        layers: List[List[str]] = [[] for _ in range(semesters)]
+        for code in needed:
+            layers[int(self.depth(code)) - 1].append(code)
+        heights = {code: 1 for code in needed}
+        for code in sorted(needed, key=self.depth, reverse=True):
+            for option in self._chosen.get(code, ()):
+                if option in heights:
+                    step = 1 if self.depth(option) < self.depth(code) else 0
+                    heights[option] = max(heights[option], heights[code] + step)
+
+        critical_path: List[str] = []
+        longest: List[str] = []
+        ends = [code for code in reachable if self.depth(code) == semesters]
+        if ends:
+            code: Optional[str] = ends[0]
+            while code is not None:
+                critical_path.append(code)
+                prereqs, coreqs = self._binding.get(code, ([], []))
+                # Follow prerequisites to earlier semesters; a corequisite-bound course continues in the same one
+                code = next((c for c in prereqs + coreqs if c not in self.completed and c not in critical_path), None)
+            critical_path.reverse()
+            stack = list(ends)
+            seen = set()
+            while stack:
+                code = stack.pop()
+                if code in seen or code in self.completed:
+                    continue
+                seen.add(code)
+                longest.append(code)
+                prereqs, coreqs = self._binding.get(code, ([], []))
+                stack.extend(prereqs + coreqs)
+            longest.sort(key=lambda c: (self.depth(c), c))
+        return CriticalPath(semesters, critical_path, longest, layers, unreachable, heights)
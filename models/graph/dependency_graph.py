@@ -1,41 +1,50 @@
+import threading
+import weakref
+from types import MappingProxyType
 from typing import Dict, Set, List, Optional, Tuple, cast
 from models.courses.course import Course
 from models.requirements.program import Program
 from models.requirements.requirement_types.requirement import Requirement
 from models.requirements.requirement_types.course_list import CourseListRequirement
 from models.requirements.requirement_types.course_options import CourseOptionsRequirement
-from models.graph.logic import PrerequisiteLogic, CorequisiteLogic
-import redis
-from config.config import REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD
+from models.graph.logic import PrerequisiteLogic, CorequisiteLogic, and_of_ors
+from models.graph.bitset import CourseIndex, masks_satisfied
+from core.cache import graph_cache
 from core.exceptions import ResourceNotFoundError
 
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD)
-
-def _graph_cache_key(course_code, traversal):
-    return f"graph:{course_code}|traversal:{traversal}"
-
-def invalidate_graph_cache():
-    for pattern in ["graph:*"]:
-        keys = redis_client.keys(pattern)
-        if isinstance(keys, (list, tuple, set)) and keys:
-            redis_client.delete(*keys)
-
 class DependencyGraph:
     """
     Represents the structure of course relationships (prerequisites, corequisites, dependents) for all courses in the catalog.
     Provides fast access to course relationship data for use by other logic modules.
+    The graph is frozen once built; use catalog_graph() to share one graph per catalog snapshot.
     """
     
     # === INITIALIZATION & CONSTRUCTION ===
     
-    def __init__(self, catalog):
+    # A graph whose closure differs from its predecessor's in at most this many courses updates that closure instead of rebuilding it
+    INCREMENTAL_CLOSURE_LIMIT = 64
+
+    def __init__(self, catalog, previous: Optional["DependencyGraph"] = None):
         self.nodes: Dict[str, Course] = {}
         self.adjacency: Dict[str, Set[str]] = {}  # course_code -> set of dependent course codes
         self.reverse_adjacency: Dict[str, Set[str]] = {}  # course_code -> set of prerequisite course codes
         self.prereq_logic: Dict[str, PrerequisiteLogic] = {}
         self.coreq_logic: Dict[str, CorequisiteLogic] = {}
+        # Dense ids for every course (catalog courses first, then codes only referenced by requisites)
+        self.index = CourseIndex()
+        self.catalog_bits = 0  # bitset of all catalog courses
+        self._unconditional_bits = 0  # catalog courses without prerequisites
+        self._compiled_prereqs: List[Tuple[int, Tuple[int, ...]]] = []  # (course id, masks) for courses with prerequisites
+        self._requisite_matrix = None
+        self._closure = None
+        self._mutual_groups = None
+        self._previous = weakref.ref(previous) if previous is not None else None
+        self._matrix_lock = threading.Lock()
         self.catalog = catalog
+        # Catalog snapshot version; part of every cache key so graphs of different snapshots never share entries
+        self.version = getattr(catalog, 'version', None)
         self._build_graph(catalog)
+        self._freeze()
 
     def _extract_requisites(self, course_code):
         """
@@ -53,24 +62,6 @@ class DependencyGraph:
         if not course:
             raise ResourceNotFoundError(f"Course '{course_code}' not found in catalog.")
 
-        def extract_requisites_and_of_ors(reqs):
-            if not reqs:
-                return []
-            if isinstance(reqs, str):
-                return [[reqs]]
-            if isinstance(reqs, list):
-                if all(isinstance(x, str) for x in reqs):
-                    return [reqs]
-                result = []
-                for item in reqs:
-                    group = extract_requisites_and_of_ors(item)
-                    if len(group) == 1 and isinstance(group[0], list):
-                        result.append(group[0])
-                    else:
-                        result.extend(group)
-                return result
-            return []
-
         def pick_first_nonempty(*args):
             for arg in args:
                 if arg:
@@ -80,8 +71,8 @@ class DependencyGraph:
         raw_prereqs = pick_first_nonempty(getattr(course, 'prereqs', None), getattr(course, 'prerequisites', None))
         raw_coreqs = pick_first_nonempty(getattr(course, 'coreqs', None), getattr(course, 'corequisites', None))
 
-        prereq_edges = extract_requisites_and_of_ors(raw_prereqs)
-        coreq_edges = extract_requisites_and_of_ors(raw_coreqs)
+        prereq_edges = and_of_ors(raw_prereqs)
+        coreq_edges = and_of_ors(raw_coreqs)
         if course_code == 'MATH 2600':
             pass  # Debug print removed
         return {
@@ -90,6 +81,10 @@ class DependencyGraph:
         }
 
     def _build_graph(self, catalog):
+        requisites = {}
+        # A catalog opened from a snapshot file carries its requisites already split into groups
+        snapshot = getattr(catalog, 'snapshot', None)
+        snapshot_groups = snapshot.requisite_groups() if snapshot is not None else None
         for course in catalog.courses:
             code = getattr(course, 'course_code', None)
             if not code or not isinstance(code, str):
@@ -97,12 +92,29 @@ class DependencyGraph:
             self.nodes[code] = course
             self.adjacency[code] = set()
             self.reverse_adjacency[code] = set()
-
+            self.catalog_bits |= 1 << self.index.add(code)
+            if snapshot_groups is not None:
+                requisites[code] = snapshot_groups[code]
+                continue
             edges = self._extract_requisites(code)
-            prereq_groups = edges.get('prereq_edges', [])
-            coreq_groups = edges.get('coreq_edges', [])
-            self.prereq_logic[code] = PrerequisiteLogic(prereq_groups)
-            self.coreq_logic[code] = CorequisiteLogic(coreq_groups)
+            requisites[code] = (edges.get('prereq_edges', []), edges.get('coreq_edges', []))
+
+        # Every referenced code needs an id before groups can be compiled to masks
+        for prereq_groups, coreq_groups in requisites.values():
+            for group in prereq_groups + coreq_groups:
+                for other in group:
+                    if other and isinstance(other, str):
+                        self.index.add(other)
+
+        for code, (prereq_groups, coreq_groups) in requisites.items():
+            course_id = self.index.get(code)
+            prereq_masks = self.index.compile_groups(prereq_groups)
+            self.prereq_logic[code] = PrerequisiteLogic(prereq_groups, prereq_masks)
+            self.coreq_logic[code] = CorequisiteLogic(coreq_groups, self.index.compile_groups(coreq_groups))
+            if prereq_masks:
+                self._compiled_prereqs.append((course_id, prereq_masks))
+            else:
+                self._unconditional_bits |= 1 << course_id
 
             for group in prereq_groups:
                 for prereq in group:
@@ -115,6 +127,15 @@ class DependencyGraph:
                     if coreq and isinstance(coreq, str):
                         self.adjacency.setdefault(coreq, set()).add(code)
 
+    def _freeze(self):
+        """Make the graph read-only so one instance can be shared by every planner and thread."""
+        self.nodes = MappingProxyType(self.nodes)
+        self.adjacency = MappingProxyType({code: frozenset(codes) for code, codes in self.adjacency.items()})
+        self.reverse_adjacency = MappingProxyType({code: frozenset(codes) for code, codes in self.reverse_adjacency.items()})
+        self.prereq_logic = MappingProxyType(self.prereq_logic)
+        self.coreq_logic = MappingProxyType(self.coreq_logic)
+        self._compiled_prereqs = tuple(self._compiled_prereqs)
+
     # === LOGIC INTEGRATION ===
     
     def get_prerequisite_logic(self, course_code: str) -> Optional[PrerequisiteLogic]:
@@ -127,49 +148,127 @@ class DependencyGraph:
             return None
         return self.coreq_logic.get(course_code)
 
+    # === BITSET EVALUATION ===
+
+    def to_bitset(self, course_codes) -> int:
+        return self.index.to_bitset(course_codes)
+
+    def from_bitset(self, bits: int) -> List[str]:
+        return self.index.from_bitset(bits)
+
+    def prerequisites_satisfied(self, course_code: str, completed_bits: int) -> bool:
+        logic = self.prereq_logic.get(course_code)
+        return logic is None or masks_satisfied(logic.masks, completed_bits)
+
+    def prerequisites_satisfied_bitset(self, completed_bits: int) -> int:
+        """Bitset of every catalog course whose prerequisites are satisfied by completed_bits."""
+        bits = self._unconditional_bits
+        for course_id, masks in self._compiled_prereqs:
+            for mask in masks:
+                if not mask & completed_bits:
+                    break
+            else:
+                bits |= 1 << course_id
+        return bits
+
+    def requisite_matrix(self):
+        """CSR form of all requisite groups for whole-catalog vectorized evaluation, built on first use."""
+        if self._requisite_matrix is None:
+            from models.graph.requisite_matrix import RequisiteMatrix
+            with self._matrix_lock:
+                if self._requisite_matrix is None:
+                    self._requisite_matrix = RequisiteMatrix(self)
+        return self._requisite_matrix
+
+    def mutual_corequisite_groups(self):
+        """Members of every mutual-corequisite group with more than one course, keyed by each member's code."""
+        if self._mutual_groups is None:
+            matrix = self.requisite_matrix()
+            groups: Dict[int, List[str]] = {}
+            for course_id, (root, size) in enumerate(zip(matrix.mutual_group.tolist(), matrix.mutual_group_size.tolist())):
+                if size > 1:
+                    groups.setdefault(root, []).append(self.index.codes[course_id])
+            self._mutual_groups = MappingProxyType({code: tuple(members) for members in groups.values() for code in members})
+        return self._mutual_groups
+
+    # === TRANSITIVE CLOSURE ===
+
+    def closure(self):
+        """Transitive prerequisite closure, built on first use (or derived from the previous snapshot's)."""
+        if self._closure is None:
+            with self._matrix_lock:
+                if self._closure is None:
+                    self._closure = self._build_closure()
+        return self._closure
+
+    def _build_closure(self):
+        from models.graph.closure import TransitiveClosure, direct_prerequisites
+        direct = direct_prerequisites(self)
+        previous = self._previous() if self._previous is not None else None
+        self._previous = None
+        base = previous._closure if previous is not None else None
+        if base is not None and previous.index.codes == self.index.codes:
+            changes = [(i, bits) for i, (bits, old) in enumerate(zip(direct, base.direct)) if bits != old]
+            if len(changes) <= self.INCREMENTAL_CLOSURE_LIMIT:
+                return base.with_changes(changes)
+        return TransitiveClosure(direct)
+
+    def get_all_prerequisites(self, course_code: str) -> List[str]:
+        """Every course the given course requires, directly or through other prerequisites."""
+        course_id = self.index.get(course_code)
+        if course_id is None:
+            return []
+        return self.index.from_bitset(self.closure().ancestors[course_id])
+
+    def get_all_dependents(self, course_code: str) -> List[str]:
+        """Every course the given course eventually unlocks."""
+        course_id = self.index.get(course_code)
+        if course_id is None:
+            return []
+        return self.index.from_bitset(self.closure().descendants[course_id])
+
+    def requires(self, course_code: str, prerequisite_code: str) -> bool:
+        """True if prerequisite_code is a direct or indirect prerequisite of course_code."""
+        course_id = self.index.get(course_code)
+        prerequisite_id = self.index.get(prerequisite_code)
+        if course_id is None or prerequisite_id is None:
+            return False
+        return self.closure().requires(course_id, prerequisite_id)
+
     # === BASIC NAVIGATION ===
     
     def get_prerequisites(self, course_code: str) -> List[str]:
-        key = _graph_cache_key(course_code, 'prerequisites')
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            import json
-            return json.loads(cached.decode())
+        key = graph_cache.key(self.version, course_code, 'prerequisites')
+        cached = graph_cache.get(key)
+        if cached is not None:
+            return list(cached)
         if not course_code or not isinstance(course_code, str):
             return []
         result = list(self.reverse_adjacency.get(course_code, set()))
-        import json
-        redis_client.set(key, json.dumps(result))
-        invalidate_graph_cache()
+        graph_cache.set(key, result)
         return result
 
     def get_corequisites(self, course_code: str) -> List[str]:
-        key = _graph_cache_key(course_code, 'corequisites')
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            import json
-            return json.loads(cached.decode())
+        key = graph_cache.key(self.version, course_code, 'corequisites')
+        cached = graph_cache.get(key)
+        if cached is not None:
+            return list(cached)
         if not course_code or not isinstance(course_code, str):
             return []
         logic = self.coreq_logic.get(course_code)
         result = list(logic.get_all_courses()) if logic else []
-        import json
-        redis_client.set(key, json.dumps(result))
-        invalidate_graph_cache()
+        graph_cache.set(key, result)
         return result
 
     def get_dependents(self, course_code: str) -> List[str]:
-        key = _graph_cache_key(course_code, 'dependents')
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            import json
-            return json.loads(cached.decode())
+        key = graph_cache.key(self.version, course_code, 'dependents')
+        cached = graph_cache.get(key)
+        if cached is not None:
+            return list(cached)
         if not course_code or not isinstance(course_code, str):
             return []
         result = list(self.adjacency.get(course_code, set()))
-        import json
-        redis_client.set(key, json.dumps(result))
-        invalidate_graph_cache()
+        graph_cache.set(key, result)
         return result
 
     def get_edges(self, course_code: str) -> Dict[str, List[str]]:
@@ -187,4 +286,27 @@ class DependencyGraph:
         return sum(len(v) for v in self.adjacency.values())
 
     def get_node_count(self) -> int:
-        return len(self.nodes)
\ No newline at end of file
+        return len(self.nodes)
+
+
+_lock = threading.Lock()
+_latest: Optional["weakref.ReferenceType[DependencyGraph]"] = None
+
+def catalog_graph(catalog) -> DependencyGraph:
+    """
+    The dependency graph of a catalog snapshot, built once and shared by every planner.
+    The graph is kept on the catalog itself (the graph refers back to it), so both are freed together
+    once no planner holds the replaced snapshot.
+    """
+    graph = catalog.__dict__.get('_graph')
+    if graph is not None:
+        return graph
+    # Building is expensive, so concurrent first requests wait for one build instead of racing
+    global _latest
+    with _lock:
+        graph = catalog.__dict__.get('_graph')
+        if graph is None:
+            graph = DependencyGraph(catalog, previous=_latest() if _latest is not None else None)
+            catalog._graph = graph
+            _latest = weakref.ref(graph)
+        return graph
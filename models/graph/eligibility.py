@@ -1,97 +1,118 @@
-from typing import Set
+from typing import Iterable, Set
+import numpy as np
 from .dependency_graph import DependencyGraph
-import redis
-from config.config import REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD
-
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD)
-
-def _eligibility_cache_key(course_code, completed_courses, enrolled_courses):
-    # Sort sets to ensure consistent key
-    completed = ','.join(sorted(completed_courses))
-    enrolled = ','.join(sorted(enrolled_courses))
-    return f"eligibility:{course_code}|completed:{completed}|enrolled:{enrolled}"
+from core.cache import eligibility_cache, course_set_fingerprint
 
 class CourseEligibility:
     @staticmethod
     def is_course_eligible(course_code: str, completed_courses: Set[str], enrolled_courses: Set[str], graph: DependencyGraph) -> bool:
-        key = _eligibility_cache_key(course_code, completed_courses, enrolled_courses)
-        cached = redis_client.get(key)
+        key = eligibility_cache.key(graph.version, course_code, course_set_fingerprint(completed_courses), course_set_fingerprint(enrolled_courses))
+        cached = eligibility_cache.get(key)
         if cached is not None:
-            return cached == b'True'
+            return cached
         
-        # Treat enrolled_courses as the same as completed_courses
-        all_completed = set(completed_courses) | set(enrolled_courses)
-        if course_code in all_completed:
-            redis_client.set(key, 'False')
+        # Treat enrolled_courses as the same as completed_courses; both are evaluated as bitsets
+        completed_bits = graph.to_bitset(completed_courses)
+        all_completed = completed_bits | graph.to_bitset(enrolled_courses)
+        eligible = CourseEligibility.evaluate(course_code, completed_courses, enrolled_courses, completed_bits, all_completed, graph)
+        eligibility_cache.set(key, eligible)
+        return eligible
+
+    @staticmethod
+    def evaluate(course_code: str, completed_courses: Set[str], enrolled_courses: Set[str], completed_bits: int, all_completed: int, graph: DependencyGraph) -> bool:
+        """
+        Uncached is_course_eligible, for callers that already hold the completed bitset and
+        the completed-or-enrolled bitset (all_completed).
+        """
+        if course_code in completed_courses or course_code in enrolled_courses:
             return False
         
         # Check prerequisites first
-        prereq_logic = graph.get_prerequisite_logic(course_code)
-        prereqs_ok = prereq_logic.is_satisfied(all_completed) if prereq_logic else True
-        if not prereqs_ok:
-            redis_client.set(key, 'False')
+        if not graph.prerequisites_satisfied(course_code, all_completed):
             return False
         
         # Handle mutual corequisites
         group = CourseEligibility._find_mutual_coreq_group(course_code, completed_courses, graph)
         if len(group) > 1:
-            # For mutual corequisites, we need to check if any course in the group
-            # is already completed (which would make the whole group ineligible)
-            # or if the entire group can be taken together
-            if group.intersection(completed_courses):
-                # If any course in the group is already completed, not eligible
-                redis_client.set(key, 'False')
-                return False
-            # If none are completed, check if ALL courses in the group are eligible to be taken together
+            # The group is built without completed courses, so the entire group
+            # can be taken together only if every member has its prerequisites satisfied
             for group_course in group:
-                # Check prerequisites for each course in the group
-                prereq_logic = graph.get_prerequisite_logic(group_course)
-                if prereq_logic and not prereq_logic.is_satisfied(all_completed):
+                if not graph.prerequisites_satisfied(group_course, all_completed):
                     # If any course in the group has unsatisfied prerequisites, the whole group is ineligible
-                    redis_client.set(key, 'False')
                     return False
             # All courses in the group are eligible to be taken together
-            redis_client.set(key, 'True')
             return True
         
         # For regular corequisites, check if they can be satisfied
         coreq_logic = graph.get_corequisite_logic(course_code)
         if coreq_logic:
             # Check if corequisites are satisfied by completed courses
-            coreqs_ok = coreq_logic.is_satisfied(all_completed, all_completed)
+            coreqs_ok = coreq_logic.is_satisfied(all_completed, 0)
             if not coreqs_ok:
                 # If corequisites are not satisfied by completed courses,
                 # check if they can be satisfied by taking them together
-                coreq_courses = coreq_logic.get_all_courses()
                 # If any corequisite is already completed, we can take this course
-                if coreq_courses.intersection(completed_courses):
-                    redis_client.set(key, 'True')
+                if coreq_logic.course_bits & completed_bits:
                     return True
                 # If no corequisites are completed, check if they can be taken together
                 # For now, we'll be conservative and only allow if the corequisites
                 # are simple (single course) and not already completed
-                if len(coreq_courses) == 1:
-                    coreq_course = list(coreq_courses)[0]
-                    # Check if the corequisite course is eligible to be taken
-                    if coreq_course not in all_completed:
-                        # Check if the corequisite has its own prerequisites satisfied
-                        prereq_logic = graph.get_prerequisite_logic(coreq_course)
-                        if prereq_logic:
-                            coreq_prereqs_ok = prereq_logic.is_satisfied(all_completed)
-                            if not coreq_prereqs_ok:
-                                redis_client.set(key, 'False')
-                                return False
-                        redis_client.set(key, 'True')
-                        return True
+                coreq_courses = coreq_logic.get_all_courses()
+                if len(coreq_courses) == 1 and not coreq_logic.course_bits & all_completed:
+                    coreq_course = next(iter(coreq_courses))
+                    # Check if the corequisite has its own prerequisites satisfied
+                    return graph.prerequisites_satisfied(coreq_course, all_completed)
                 # For complex corequisite groups, be conservative and require them to be completed
-                redis_client.set(key, 'False')
                 return False
-            redis_client.set(key, 'True')
-            return True
-        
-        redis_client.set(key, 'True')
         return True
 
+    @staticmethod
+    def eligible_set(completed_courses: Iterable[str], enrolled_courses: Iterable[str], graph: DependencyGraph) -> Set[str]:
+        """
+        Every catalog course the student can take now, computed in one vectorized pass.
+        Gives the same answer as calling is_course_eligible for each catalog course.
+        """
+        matrix = graph.requisite_matrix()
+        index = graph.index
+        completed_ids = [i for i in (index.get(c) for c in completed_courses) if i is not None]
+        enrolled_ids = [i for i in (index.get(c) for c in enrolled_courses) if i is not None]
+        completed = matrix.mask(completed_ids)
+        present = completed.copy()
+        if enrolled_ids:
+            present[enrolled_ids] = True
+
+        prereqs_ok = matrix.prerequisites_satisfied(present)
+        base = prereqs_ok & ~present
+
+        # Regular corequisite rule: satisfied, any corequisite completed, or a single takeable corequisite
+        target = matrix.single_coreq_target
+        has_single = target >= 0
+        single_ok = np.zeros(matrix.size, dtype=bool)
+        single_ok[has_single] = ~present[target[has_single]] & prereqs_ok[target[has_single]]
+        coreq_ok = matrix.corequisites_satisfied(present) | matrix.any_corequisite_present(completed) | single_ok
+
+        # Mutual corequisite groups with no completed member are taken together as a whole
+        in_group = matrix.mutual_group_size > 1
+        group_touched = in_group & matrix.group_any(completed)
+        whole_group_ok = matrix.group_all(prereqs_ok)
+        eligible = base & np.where(in_group, whole_group_ok, coreq_ok)
+
+        ids = matrix.catalog_ids
+        result = set(index.codes[i] for i in ids[eligible[ids] & ~group_touched[ids]])
+
+        # Groups with a completed member split around it; resolve those few courses exactly
+        completed_codes = set(completed_courses)
+        for i in ids[base[ids] & group_touched[ids]]:
+            code = index.codes[i]
+            group = CourseEligibility._find_mutual_coreq_group(code, completed_codes, graph)
+            if len(group) > 1:
+                ok = all(prereqs_ok[index.get(member)] for member in group)
+            else:
+                ok = coreq_ok[i]
+            if ok:
+                result.add(code)
+        return result
+
     @staticmethod
     def _find_mutual_coreq_group(course_code: str, completed_courses: Set[str], graph: DependencyGraph) -> Set[str]:
         # Traverse through coreqs to find all mutually-locked courses (excluding completed)
@@ -1,15 +1,50 @@
-from typing import List, Set, Dict, Optional
+from typing import List, Set, Dict, Optional, Tuple, Union
+from models.graph.bitset import masks_satisfied
+
+
+def and_of_ors(reqs) -> List[list]:
+    """
+    Normalizes raw requisites to AND-of-ORs groups, e.g. [['MATH 2501'], ['MATH 2300', 'MATH 2310']].
+    Each inner list is an OR-group of courses; every group of the outer list is required.
+    A bare code is one group; a flat list of codes is one OR-group.
+    """
+    if not reqs:
+        return []
+    if isinstance(reqs, str):
+        return [[reqs]]
+    if isinstance(reqs, list):
+        if all(isinstance(x, str) for x in reqs):
+            return [reqs]
+        result = []
+        for item in reqs:
+            group = and_of_ors(item)
+            if len(group) == 1 and isinstance(group[0], list):
+                result.append(group[0])
+            else:
+                result.extend(group)
+        return result
+    return []
 
 class PrerequisiteLogic:
     """
     Handles prerequisite logic for a course, including AND/OR groupings and satisfaction checking.
     """
-    def __init__(self, groups: List[List[str]]):
-        """groups: AND-of-ORs structure, e.g. [['MATH 2501'], ['MATH 2300', 'MATH 2310']]"""
+    def __init__(self, groups: List[List[str]], masks: Optional[Tuple[int, ...]] = None):
+        """
+        groups: AND-of-ORs structure, e.g. [['MATH 2501'], ['MATH 2300', 'MATH 2310']]
+        masks: the same groups compiled to one bitset per AND group (see DependencyGraph.index)
+        """
         self.groups = groups
+        self.masks = masks
+        self.course_bits = 0
+        for mask in masks or ():
+            self.course_bits |= mask
 
     # --- Core Logic Evaluation ---
-    def is_satisfied(self, completed_courses: Set[str]) -> bool:
+    def is_satisfied(self, completed_courses: Union[Set[str], int]) -> bool:
+        # A bitset is evaluated against the compiled masks
+        if isinstance(completed_courses, int) and self.masks is not None:
+            return masks_satisfied(self.masks, completed_courses)
         # All AND groups must have at least one course satisfied
         for group in self.groups:
             if not any(course in completed_courses for course in group):
@@ -207,11 +242,18 @@ class CorequisiteLogic:
     """
     Handles corequisite logic for a course, including AND/OR groupings and satisfaction checking.
     """
-    def __init__(self, groups: List[List[str]]):
+    def __init__(self, groups: List[List[str]], masks: Optional[Tuple[int, ...]] = None):
         self.groups = groups
+        self.masks = masks
+        self.course_bits = 0
+        for mask in masks or ():
+            self.course_bits |= mask
 
     # --- Core Logic Evaluation ---
-    def is_satisfied(self, completed_courses: Set[str], enrolled_courses: Set[str]) -> bool:
+    def is_satisfied(self, completed_courses: Union[Set[str], int], enrolled_courses: Union[Set[str], int]) -> bool:
+        # Bitsets are evaluated against the compiled masks without building a union set
+        if isinstance(completed_courses, int) and isinstance(enrolled_courses, int) and self.masks is not None:
+            return masks_satisfied(self.masks, completed_courses | enrolled_courses)
         # All AND groups must have at least one course satisfied in completed or enrolled
         all_courses = completed_courses | enrolled_courses
         for group in self.groups:
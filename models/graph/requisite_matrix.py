@@ -0,0 +1,120 @@
+from typing import Iterable, List, Tuple
+import numpy as np
+
+
+class RequisiteMatrix:
+    """
+    CSR-encoded prerequisite and corequisite groups of every catalog course in a DependencyGraph,
+    plus precomputed mutual-corequisite group ids, for evaluating the whole catalog in one vectorized pass.
+    Built once per graph; read-only afterwards.
+    """
+
+    def __init__(self, graph):
+        index = graph.index
+        self.size = len(index)
+        self.catalog_ids = np.array([index.get(code) for code in graph.nodes], dtype=np.int64)
+
+        prereq_groups = [(index.get(code), logic.groups) for code, logic in graph.prereq_logic.items()]
+        coreq_groups = [(index.get(code), logic.groups) for code, logic in graph.coreq_logic.items()]
+        self.prereq_members, self.prereq_starts, self.prereq_owner = self._encode(prereq_groups, index)
+        self.coreq_members, self.coreq_starts, self.coreq_owner = self._encode(coreq_groups, index)
+
+        # Distinct corequisite courses per course, for the "any corequisite completed" rule
+        distinct = [(owner, [sorted({c for group in groups for c in group if c in index})]) for owner, groups in coreq_groups]
+        self.coreq_any_members, self.coreq_any_starts, self.coreq_any_owner = self._encode(distinct, index)
+
+        # Single-course corequisite rule: target id of courses whose corequisites name exactly one course
+        self.single_coreq_target = np.full(self.size, -1, dtype=np.int64)
+        for code, logic in graph.coreq_logic.items():
+            coreq_courses = logic.get_all_courses()
+            if len(coreq_courses) == 1:
+                target = index.get(next(iter(coreq_courses)))
+                if target is not None:
+                    self.single_coreq_target[index.get(code)] = target
+
+        # Mutual corequisite groups: connected components of the symmetric coreq relation
+        self.mutual_group = np.arange(self.size, dtype=np.int64)
+        self.mutual_group_size = np.ones(self.size, dtype=np.int64)
+        self._build_mutual_groups(graph)
+
+    @staticmethod
+    def _encode(owned_groups: Iterable[Tuple[int, List[List[str]]]], index) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        members: List[int] = []
+        starts: List[int] = []
+        owners: List[int] = []
+        for owner, groups in owned_groups:
+            for group in groups:
+                starts.append(len(members))
+                owners.append(owner)
+                members.extend(index.get(c) for c in group if index.get(c) is not None)
+        return (np.array(members, dtype=np.int64), np.array(starts, dtype=np.int64), np.array(owners, dtype=np.int64))
+
+    def _build_mutual_groups(self, graph) -> None:
+        index = graph.index
+        seen = set()
+        for code in graph.coreq_logic:
+            if code in seen:
+                continue
+            component = []
+            stack = [code]
+            while stack:
+                curr = stack.pop()
+                if curr in seen:
+                    continue
+                seen.add(curr)
+                component.append(index.get(curr))
+                for coreq in graph.coreq_logic[curr].get_all_courses():
+                    other = graph.coreq_logic.get(coreq)
+                    if other is not None and curr in other.get_all_courses() and coreq not in seen:
+                        stack.append(coreq)
+            if len(component) > 1:
+                root = min(component)
+                self.mutual_group[component] = root
+                self.mutual_group_size[component] = len(component)
+
+    # === Vectorized evaluation ===
+
+    @staticmethod
+    def _groups_satisfied(members: np.ndarray, starts: np.ndarray, present: np.ndarray) -> np.ndarray:
+        satisfied = np.zeros(len(starts), dtype=bool)
+        if len(members) == 0:
+            return satisfied
+        # Empty groups can never be satisfied; reduce only over groups that have members
+        ends = np.append(starts[1:], len(members))
+        nonempty = ends > starts
+        satisfied[nonempty] = np.logical_or.reduceat(present[members], starts[nonempty])
+        return satisfied
+
+    def _all_groups_satisfied(self, members, starts, owners, present) -> np.ndarray:
+        unsatisfied = ~self._groups_satisfied(members, starts, present)
+        return np.bincount(owners[unsatisfied], minlength=self.size) == 0
+
+    def prerequisites_satisfied(self, present: np.ndarray) -> np.ndarray:
+        """Boolean array over course ids: prerequisites satisfied by the courses marked present."""
+        return self._all_groups_satisfied(self.prereq_members, self.prereq_starts, self.prereq_owner, present)
+
+    def corequisites_satisfied(self, present: np.ndarray) -> np.ndarray:
+        return self._all_groups_satisfied(self.coreq_members, self.coreq_starts, self.coreq_owner, present)
+
+    def any_corequisite_present(self, present: np.ndarray) -> np.ndarray:
+        hits = self._groups_satisfied(self.coreq_any_members, self.coreq_any_starts, present)
+        result = np.zeros(self.size, dtype=bool)
+        result[self.coreq_any_owner[hits]] = True
+        return result
+
+    def group_all(self, values: np.ndarray) -> np.ndarray:
+        """For each course, whether values holds for every member of its mutual corequisite group."""
+        holds = np.bincount(self.mutual_group[~values], minlength=self.size) == 0
+        return holds[self.mutual_group]
+
+    def group_any(self, values: np.ndarray) -> np.ndarray:
+        """For each course, whether values holds for any member of its mutual corequisite group."""
+        hits = np.bincount(self.mutual_group[values], minlength=self.size) > 0
+        return hits[self.mutual_group]
+
+    def mask(self, ids: Iterable[int]) -> np.ndarray:
+        present = np.zeros(self.size, dtype=bool)
+        ids = list(ids)
+        if ids:
+            present[ids] = True
+        return present
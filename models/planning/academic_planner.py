@@ -2,16 +2,19 @@ from typing import Dict, List, Optional, Any, Tuple
 from models.courses.catalog import Catalog
 from models.courses.course import Course
 from models.requirements.program import Program
-from models.graph.dependency_graph import DependencyGraph
+from models.graph.dependency_graph import catalog_graph
 from models.planning.plan_config import PlanConfig
 from models.planning.semester import Semester
 from models.planning.student_state import StudentState
 from models.planning.semester_planner import SemesterPlanner
 from models.planning.requirement_assigner import RequirementAssigner
+from models.planning.schedule_generator import ScheduleGenerator
+from models.planning.auto_assigner import AutoAssigner
+from models.planning.progress_tracker import ProgressTracker
+from models.graph.critical_path import CriticalPathSolver
 from models.requirements.policy_engine import PolicyEngine
-from models.requirements.requirement_types.course_list import invalidate_requirement_cache
-from models.graph.dependency_graph import invalidate_graph_cache
 from core.exceptions import InvalidCourseError, InvalidAssignmentError, InvalidProgramError, InvalidCategoryError
+from config.config import RECOMMENDATION_PAGE_SIZE
 
 
 class AcademicPlanner:
@@ -31,12 +34,21 @@ class AcademicPlanner:
             policy_engine: Policy engine for overlap policies (optional)
         """
         self.catalog = catalog
-        self.graph = DependencyGraph(catalog)
+        self.graph = catalog_graph(catalog)
         self.plan_config = PlanConfig(programs, [], start_semester.season, start_semester.year, 4)
         self.student_state = StudentState(self.plan_config, start_semester)
         self.policy_engine = policy_engine or PolicyEngine()
-        self.assigner = RequirementAssigner(programs, self.policy_engine)
+        self.assigner = RequirementAssigner(programs, self.policy_engine, catalog)
         self.planner = SemesterPlanner(catalog, self.graph)
+        self._progress: Optional[ProgressTracker] = None
+    
+    @property
+    def progress(self) -> ProgressTracker:
+        """Incrementally maintained progress, built from the student state on first use."""
+        if self._progress is None:
+            self._progress = ProgressTracker(self.graph, self.plan_config.programs,
+                                             self.student_state.completed_courses, self.assigner.assignments)
+        return self._progress
     
     def add_completed_courses(self, course_assignments: Dict[str, List[Tuple[str, str]]]) -> None:
         """
@@ -53,21 +65,128 @@ class AcademicPlanner:
             assignments = [tuple(a) for a in assignments]
             course = self.catalog.get_by_course_code(course_code)
             if course:
-                if course not in self.student_state.completed_courses:
+                if self.progress.add(course):
                     self.student_state.completed_courses.append(course)
-                for program_name, category in assignments:
-                    if not isinstance(program_name, str) or not program_name.strip():
-                        raise InvalidProgramError(f"Invalid program name: {program_name}")
-                    if not isinstance(category, str) or not category.strip():
-                        raise InvalidCategoryError(f"Invalid category name: {category}")
-                    self.assigner.assign_course_to_requirement(course, category)
-                    print(f"Added {course_code} for {program_name} - {category}")
+                try:
+                    for program_name, category in assignments:
+                        if not isinstance(program_name, str) or not program_name.strip():
+                            raise InvalidProgramError(f"Invalid program name: {program_name}")
+                        if not isinstance(category, str) or not category.strip():
+                            raise InvalidCategoryError(f"Invalid category name: {category}")
+                        self.assigner.assign_course_to_requirement(course, category)
+                        print(f"Added {course_code} for {program_name} - {category}")
+                finally:
+                    # Keep the tracker in step with the assignments made, even when a later pair is rejected
+                    self.progress.sync(course_code)
             else:
                 print(f"Course '{course_code}' not found in catalog")
         print(f"Completed courses: {[c.get_course_code() for c in self.student_state.get_completed_courses()]}")
         print(f"Assignments: {self.assigner.get_assignment_summary()}")
-        invalidate_requirement_cache()
-        invalidate_graph_cache()
+    
+    def remove_completed_course(self, course_code: str) -> bool:
+        """
+        Remove a course from the completed courses along with its assignments.
+        
+        Returns:
+            True if the course was completed
+        """
+        if not self.progress.is_completed(course_code):
+            return False
+        self.student_state.completed_courses = [c for c in self.student_state.completed_courses if c.get_course_code() != course_code]
+        self.assigner.assignments.pop(course_code, None)
+        self.progress.remove(course_code)
+        return True
+    
+    def apply_course_operations(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply a batch of add/remove/reassign operations as one transaction.
+        Operations are staged in order, then the resulting assignments of every touched course are
+        checked once against the categories and overlap policies. Nothing changes unless all checks pass.
+        
+        Args:
+            operations: Dicts with "op" ("add", "remove" or "reassign"), "course_code" and, for add and
+                reassign, "assignments" as (program_name, category_name) pairs. Add appends pairs, reassign replaces them.
+        Returns:
+            Dictionary with the added and removed courses, the before/after assignments of every course
+            whose assignments changed, and the policy validation of the touched courses
+        Raises:
+            InvalidAssignmentError: if any operation cannot be applied; the message lists every problem
+        """
+        completed = self.progress.completed
+        staged_completed: Dict[str, bool] = {}
+        staged_pairs: Dict[str, List[Tuple[str, str]]] = {}
+        errors = []
+        for position, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                raise InvalidAssignmentError(f"Operation {position} must be an object")
+            op, course_code = operation.get("op"), operation.get("course_code")
+            if not isinstance(course_code, str) or not course_code.strip():
+                raise InvalidCourseError(f"Invalid course code in operation {position}: {course_code}")
+            pairs = operation.get("assignments") or []
+            if not isinstance(pairs, (list, tuple)) or not all(isinstance(a, (list, tuple)) and len(a) == 2 for a in pairs):
+                raise InvalidAssignmentError(f"Assignments for {course_code} must be a list of (program_name, category_name) tuples")
+            pairs = [tuple(a) for a in pairs]
+            is_completed = staged_completed.get(course_code, course_code in completed)
+            current = staged_pairs.get(course_code, self.assigner.assignments.get(course_code, []) if course_code in completed else [])
+            if op == "add":
+                if self.catalog.get_by_course_code(course_code) is None:
+                    errors.append(f"Operation {position}: course '{course_code}' not found in catalog")
+                    continue
+                staged_completed[course_code] = True
+                staged_pairs[course_code] = list(current) + [pair for pair in pairs if pair not in current]
+            elif op == "remove":
+                if not is_completed:
+                    errors.append(f"Operation {position}: {course_code} is not a completed course")
+                    continue
+                staged_completed[course_code] = False
+                staged_pairs[course_code] = []
+            elif op == "reassign":
+                if not is_completed:
+                    errors.append(f"Operation {position}: {course_code} is not a completed course")
+                    continue
+                staged_pairs[course_code] = pairs
+            else:
+                raise InvalidAssignmentError(f"Unknown operation '{op}' for {course_code}; expected add, remove or reassign")
+
+        # One check of the final state of every touched course
+        for course_code, pairs in staged_pairs.items():
+            course = self.catalog.get_by_course_code(course_code)
+            programs_used = set()
+            for program_name, category in pairs:
+                problem = self.assigner.check_assignment(course, program_name, category)
+                if problem:
+                    errors.append(problem)
+                elif program_name in programs_used:
+                    errors.append(f"{course_code} is assigned to more than one category in {program_name}")
+                programs_used.add(program_name)
+        validation = self.policy_engine.validate_plan(self.plan_config.programs, {code: pairs for code, pairs in staged_pairs.items() if pairs})
+        errors.extend(validation["errors"])
+        if errors:
+            raise InvalidAssignmentError("; ".join(errors))
+
+        # Commit
+        added, removed, changes = [], [], {}
+        for course_code, now_completed in staged_completed.items():
+            was_completed = course_code in completed
+            if now_completed and not was_completed:
+                added.append(course_code)
+            elif was_completed and not now_completed:
+                removed.append(course_code)
+        added_courses = [self.catalog.get_by_course_code(course_code) for course_code in added]
+        self.student_state.completed_courses.extend(added_courses)
+        if removed:
+            gone = set(removed)
+            self.student_state.completed_courses = [c for c in self.student_state.completed_courses if c.get_course_code() not in gone]
+        for course_code, pairs in staged_pairs.items():
+            before = self.assigner.assignments.get(course_code, [])
+            if list(before) != pairs:
+                changes[course_code] = {"before": list(before), "after": list(pairs)}
+            if pairs:
+                self.assigner.assignments[course_code] = list(pairs)
+            else:
+                self.assigner.assignments.pop(course_code, None)
+        self.progress.update(added_courses, removed, staged_pairs)
+        return {"added": added, "removed": removed, "assignments": changes, "validation": validation}
     
     def advance_semester(self) -> None:
         """Move to the next semester."""
@@ -84,6 +203,18 @@ class AcademicPlanner:
         self.student_state.set_current_semester(next_semester)
         print(f"Advanced to {next_semester.term_id}")
     
+    def auto_assign(self) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Replace the current assignments with the assignment of completed courses that completes the most credits.
+        
+        Returns:
+            Dict mapping course_code to list of (program_name, category_name) pairs
+        """
+        engine = AutoAssigner(self.plan_config.programs, self.policy_engine, self.catalog)
+        self.assigner.assignments = engine.assign(self.student_state.get_completed_courses())
+        self._progress = None
+        return self.assigner.assignments
+    
     def get_recommendations(self) -> Optional[Dict[str, List]]:
         """
         Get recommendations for the current semester.
@@ -100,7 +231,7 @@ class AcademicPlanner:
         
         # Get recommendations using SemesterPlanner
         recommendations = self.planner.get_semester_recommendations(
-            self.student_state, current_sem, self.assigner.get_assignment_summary()
+            self.student_state, current_sem, self.assigner.get_assignment_summary(), self.progress
         )
         
         # Organize recommendations by program
@@ -137,6 +268,18 @@ class AcademicPlanner:
         
         return recommendations
     
+    def get_ranked_recommendations(self, limit: int = RECOMMENDATION_PAGE_SIZE, offset: int = 0) -> Dict[str, Any]:
+        """
+        One page of the current recommendations, ranked within each category.
+        
+        Args:
+            limit: Items per category
+            offset: Items per category to skip
+        Returns:
+            Dictionary with the ranked items per category, each category's candidate count, offset and limit
+        """
+        return self.planner.get_ranked_recommendations(self.student_state, self.progress, limit, offset)
+    
     def get_progress_summary(self) -> Dict[str, Any]:
         """
         Get a summary of the student's progress across all programs.
@@ -153,11 +296,40 @@ class AcademicPlanner:
         }
         
         for program in self.plan_config.programs:
-            program_progress = program.progress(completed_courses, self.assigner.assignments)
-            progress_summary["programs"].append(program_progress)
+            progress_summary["programs"].append(self.progress.program_progress(program))
         
         return progress_summary
     
+    def get_critical_path(self) -> Dict[str, Any]:
+        """
+        Minimum number of remaining semesters to finish every program from the current progress.
+        
+        Returns:
+            Dictionary with the semester count, the critical path, the courses on longest chains,
+            the remaining courses layered by earliest semester, and required courses that cannot be scheduled
+        """
+        unmet = self.progress.unmet_requirements()
+        solver = CriticalPathSolver(self.graph, list(self.progress.completed))
+        targets = solver.requirement_targets([req for reqs in unmet.values() for req in reqs], self.catalog.courses)
+        return solver.solve(targets).to_dict()
+    
+    def generate_schedule(self, max_credits: int = Semester.MAX_CREDITS) -> Dict[str, Any]:
+        """
+        Generate a term-by-term schedule from the current semester through the end of the plan.
+        
+        Args:
+            max_credits: Credit cap per term
+        Returns:
+            Dictionary with the scheduled terms, whether every requirement is covered, and the categories left unmet
+        """
+        start = Semester(self.plan_config.start_season, self.plan_config.start_year)
+        current = self.student_state.get_current_semester() or start
+        # Fall and Spring alternate, so terms are consecutive on this scale
+        ordinal = lambda s: 2 * s.year + (1 if s.season == "Fall" else 0)
+        remaining = max(self.plan_config.num_years * 2 - (ordinal(current) - ordinal(start)), 0)
+        generator = ScheduleGenerator(self.catalog, self.graph, self.plan_config.programs, self.policy_engine, max_credits)
+        return generator.generate(self.student_state.get_completed_courses(), self.assigner.assignments, current, remaining)
+    
     def plan_semester(self, chosen_courses: Dict[str, List[Tuple[str, str]]]) -> Dict[str, Any]:
         """
         Plan a specific semester by adding chosen courses with batch validation.
@@ -174,24 +346,25 @@ class AcademicPlanner:
                 raise InvalidAssignmentError(f"Assignments for {course_code} must be a list of (program_name, category_name) tuples")
             course = self.catalog.get_by_course_code(course_code)
             if course:
-                if course not in self.student_state.completed_courses:
+                if self.progress.add(course):
                     self.student_state.completed_courses.append(course)
-                for program_name, category in assignments:
-                    if not isinstance(program_name, str) or not program_name.strip():
-                        raise InvalidProgramError(f"Invalid program name: {program_name}")
-                    if not isinstance(category, str) or not category.strip():
-                        raise InvalidCategoryError(f"Invalid category name: {category}")
-                    success = self.assigner.assign_course_to_requirement(course, category)
-                    results[f"{course_code} -> {program_name} - {category}"] = success
-                    if success:
-                        print(f"Added {course_code} for {program_name} - {category}")
+                try:
+                    for program_name, category in assignments:
+                        if not isinstance(program_name, str) or not program_name.strip():
+                            raise InvalidProgramError(f"Invalid program name: {program_name}")
+                        if not isinstance(category, str) or not category.strip():
+                            raise InvalidCategoryError(f"Invalid category name: {category}")
+                        success = self.assigner.assign_course_to_requirement(course, category)
+                        results[f"{course_code} -> {program_name} - {category}"] = success
+                        if success:
+                            print(f"Added {course_code} for {program_name} - {category}")
+                finally:
+                    self.progress.sync(course_code)
             else:
                 print(f"Course '{course_code}' not found in catalog")
                 results[f"{course_code}"] = False
         print(f"Completed courses: {[c.get_course_code() for c in self.student_state.get_completed_courses()]}")
         print(f"Assignments: {self.assigner.get_assignment_summary()}")
-        invalidate_requirement_cache()
-        invalidate_graph_cache()
         validation_result = self.validate_plan()
         return {
             "assignment_results": results,
@@ -0,0 +1,226 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+from models.courses.catalog import Catalog
+from models.courses.course import Course
+from models.requirements.program import Program
+from models.requirements.category import RequirementCategory
+from models.requirements.policy_engine import PolicyEngine
+from models.requirements.requirement_types.evaluation import CodeSetPlan, CompoundPlan, RequirementEvaluator
+from models.planning.requirement_assigner import RequirementAssigner
+
+
+class MinCostFlow:
+    """Successive shortest paths with Dijkstra on reduced costs; edge costs must be non-negative."""
+
+    def __init__(self, size: int):
+        self.size = size
+        # Edge lists: [to, capacity, cost, index of reverse edge]
+        self.edges: List[List[list]] = [[] for _ in range(size)]
+
+    def add_edge(self, source: int, target: int, capacity: int, cost: int) -> Tuple[int, int]:
+        """Returns a handle for flow_on()."""
+        self.edges[source].append([target, capacity, cost, len(self.edges[target])])
+        self.edges[target].append([source, 0, -cost, len(self.edges[source]) - 1])
+        return source, len(self.edges[source]) - 1
+
+    def flow_on(self, handle: Tuple[int, int]) -> int:
+        source, i = handle
+        target, _, _, rev = self.edges[source][i]
+        return self.edges[target][rev][1]
+
+    def solve(self, source: int, sink: int) -> Tuple[int, int]:
+        """Maximum flow from source to sink at minimum cost. Returns (flow, cost)."""
+        potential = [0] * self.size
+        total_flow = total_cost = 0
+        while True:
+            dist = [None] * self.size
+            prev: List[Optional[Tuple[int, int]]] = [None] * self.size
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, node = heapq.heappop(heap)
+                if d > dist[node]:
+                    continue
+                for i, (target, capacity, cost, _) in enumerate(self.edges[node]):
+                    if capacity <= 0:
+                        continue
+                    nd = d + cost + potential[node] - potential[target]
+                    if dist[target] is None or nd < dist[target]:
+                        dist[target] = nd
+                        prev[target] = (node, i)
+                        heapq.heappush(heap, (nd, target))
+            if dist[sink] is None:
+                return total_flow, total_cost
+            for node in range(self.size):
+                if dist[node] is not None:
+                    potential[node] += dist[node]
+            push = None
+            node = sink
+            while node != source:
+                parent, i = prev[node]
+                capacity = self.edges[parent][i][1]
+                push = capacity if push is None else min(push, capacity)
+                node = parent
+            node = sink
+            while node != source:
+                parent, i = prev[node]
+                edge = self.edges[parent][i]
+                edge[1] -= push
+                self.edges[node][edge[3]][1] += push
+                total_cost += push * edge[2]
+                node = parent
+            total_flow += push
+
+
+def named_codes(category: RequirementCategory) -> set:
+    """Course codes listed explicitly by the category's requirements."""
+    codes = set()
+    plans = [requirement.evaluation_plan() for requirement in category.requirements]
+    while plans:
+        plan = plans.pop()
+        if isinstance(plan, CodeSetPlan):
+            codes |= plan.codes
+        elif isinstance(plan, CompoundPlan):
+            plans.extend(plan.options)
+    return codes
+
+
+class AutoAssigner:
+    """
+    Assigns completed courses to requirement categories for maximum progress.
+
+    Each program is a flow network: source -> course (capacity = its credits) -> category it can count
+    toward -> sink (capacity = the category's required credits). A min-cost max flow maximizes the credits
+    that count, preferring categories that list a course by name over open-ended ones. The flow may split
+    a course's credits; each course then goes wholly to the category that received most of it (a basic
+    optimal flow splits at most one course per category), and a repair pass fills categories left short
+    from unused courses or from categories with surplus credits. Courses count in at most one category
+    per program, and cross-program sharing is checked against the overlap policies.
+    """
+
+    NAMED_COST = 0
+    OPEN_COST = 1
+
+    def __init__(self, programs: List[Program], policy_engine: Optional[PolicyEngine] = None, catalog: Optional[Catalog] = None):
+        self.programs = programs
+        self.policy_engine = policy_engine or PolicyEngine()
+        self.candidates = RequirementAssigner(programs, self.policy_engine, catalog)
+
+    def assign(self, completed_courses: List[Course]) -> Dict[str, List[Tuple[str, str]]]:
+        courses = []
+        seen = set()
+        for course in completed_courses:
+            code = course.get_course_code()
+            if code and code not in seen:
+                seen.add(code)
+                courses.append(course)
+        fits = {course.get_course_code(): self.candidates.get_assignable_categories(course) for course in courses}
+
+        assignments: Dict[str, List[Tuple[str, str]]] = {}
+        for program in self.programs:
+            for code, category_name in self._assign_program(program, courses, fits).items():
+                assignments.setdefault(code, []).append((program.name, category_name))
+        self._enforce_overlap_policies(assignments)
+        return assignments
+
+    # === Per program ===
+
+    def _assign_program(self, program: Program, courses: List[Course], fits) -> Dict[str, str]:
+        categories = program.categories
+        category_index = {category.category: i for i, category in enumerate(categories)}
+        named = [named_codes(category) for category in categories]
+        eligible = []
+        for course in courses:
+            code = course.get_course_code()
+            options = [category_index[category] for program_name, category in fits[code]
+                       if program_name == program.name and category in category_index]
+            if options and course.get_credit_hours() > 0:
+                eligible.append((course, options))
+
+        # Nodes: 0 source, 1 sink, then courses, then categories
+        network = MinCostFlow(2 + len(eligible) + len(categories))
+        category_node = lambda k: 2 + len(eligible) + k
+        for k, category in enumerate(categories):
+            network.add_edge(category_node(k), 1, category.min_credits, 0)
+        handles = []
+        for i, (course, options) in enumerate(eligible):
+            network.add_edge(0, 2 + i, course.get_credit_hours(), 0)
+            code = course.get_course_code()
+            for k in options:
+                cost = self.NAMED_COST if code in named[k] else self.OPEN_COST
+                handles.append((i, k, cost, network.add_edge(2 + i, category_node(k), course.get_credit_hours(), cost)))
+        network.solve(0, 1)
+
+        # Round: each course to the category that received most of its credits
+        best: Dict[int, Tuple[int, int, int]] = {}
+        for i, k, cost, handle in handles:
+            flow = network.flow_on(handle)
+            if flow > 0 and (i not in best or (flow, -cost) > (best[i][1], -best[i][2])):
+                best[i] = (k, flow, cost)
+        placement = {i: k for i, (k, _, _) in best.items()}
+        self._repair(categories, eligible, named, placement)
+        return {eligible[i][0].get_course_code(): categories[k].category for i, k in placement.items()}
+
+    def _repair(self, categories, eligible, named, placement: Dict[int, int]) -> None:
+        """
+        Fill categories that rounding left short: move in a course when that completes more credits overall
+        (unused courses first), otherwise swap one of the category's courses with a course placed elsewhere.
+        """
+        evaluator = RequirementEvaluator()
+
+        def value(ks) -> int:
+            total = 0
+            for k in ks:
+                if k is None:
+                    continue
+                assigned = [eligible[i][0] for i, placed in placement.items() if placed == k]
+                earned = categories[k].progress(assigned, None, evaluator)["earned_credits"]
+                total += min(earned, categories[k].min_credits)
+            return total
+
+        def try_change(changes: Dict[int, Optional[int]], touched) -> bool:
+            before = value(touched)
+            previous = {i: placement.get(i) for i in changes}
+            placement.update(changes)
+            if value(touched) > before:
+                return True
+            for i, k in previous.items():
+                if k is None:
+                    placement.pop(i, None)
+                else:
+                    placement[i] = k
+            return False
+
+        for k, category in enumerate(categories):
+            if value([k]) >= category.min_credits:
+                continue
+            fitting = [i for i, (_, options) in enumerate(eligible) if k in options and placement.get(i) != k]
+            # Unused courses first, then named ones, then larger courses
+            fitting.sort(key=lambda i: (i in placement, eligible[i][0].get_course_code() not in named[k],
+                                        -eligible[i][0].get_credit_hours()))
+            for i in fitting:
+                if value([k]) >= category.min_credits:
+                    break
+                try_change({i: k}, {k, placement.get(i)})
+            if value([k]) >= category.min_credits:
+                continue
+            for i in [i for i, placed in placement.items() if placed == k]:
+                for j in fitting:
+                    source = placement.get(j)
+                    if placement.get(i) == k and source is not None and source != k and source in eligible[i][1]:
+                        if try_change({i: source, j: k}, {k, source}):
+                            break
+
+    # === Across programs ===
+
+    def _enforce_overlap_policies(self, assignments: Dict[str, List[Tuple[str, str]]]) -> None:
+        """Keep a shared course only in the programs the overlap policies let it count toward together."""
+        programs = {program.name: program for program in self.programs}
+        for code, pairs in assignments.items():
+            kept = []
+            for pair in pairs:
+                candidate = kept + [pair]
+                involved = [programs[name] for name, _ in candidate]
+                if len(candidate) == 1 or self.policy_engine.validate_plan(involved, {code: candidate})["is_valid"]:
+                    kept = candidate
+            pairs[:] = kept
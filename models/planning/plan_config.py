@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from models.requirements.program import Program
 from models.courses.course import Course
 
@@ -8,8 +8,11 @@ class PlanConfig:
     Holds all information about a student's academic plan at a point in time, including
     start term and planning horizon.
     """
-    def __init__(self, programs: List[Program], completed_courses: List[Course], start_season: str, start_year: int, num_years: int):
+    def __init__(self, programs: List[Program], completed_courses: List[Course], start_season: str, start_year: int, num_years: int,
+                 program_ids: Optional[List[int]] = None):
         self.programs = programs
+        # Database ids of the programs, when the plan is stored (see PlanManager)
+        self.program_ids = program_ids
         self.completed_courses = completed_courses
         self.start_season = start_season
         self.start_year = start_year
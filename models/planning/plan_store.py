@@ -0,0 +1,396 @@
+import json
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from models.courses.catalog import Catalog
+from models.requirements.program import Program
+from models.requirements.policy_engine import PolicyEngine
+from models.planning.academic_planner import AcademicPlanner
+from models.planning.semester import Semester
+from config.config import (
+    REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD, PLAN_STORE_BACKEND, PLAN_STORE_MAX_PLANS,
+    PLAN_STORE_TTL_SECONDS, PLAN_CACHE_MAX_LIVE, PLAN_CACHE_IDLE_SECONDS
+)
+from core.exceptions import DatabaseError, ResourceNotFoundError
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PlanState:
+    """
+    Compact, serializable state of one plan: everything needed to rebuild its AcademicPlanner
+    against the shared catalog and program registry. Courses are stored as codes and programs as database ids.
+    """
+
+    FORMAT = 1
+
+    def __init__(self, program_ids: Sequence[int], start_season: str, start_year: int,
+                 completed: Sequence[str] = (), assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+                 current: Optional[Tuple[str, int]] = None, enrolled: Sequence[str] = ()):
+        self.program_ids = list(program_ids)
+        self.start_season = start_season
+        self.start_year = start_year
+        self.completed = list(completed)
+        self.assignments = {code: [tuple(pair) for pair in pairs] for code, pairs in (assignments or {}).items()}
+        self.current = tuple(current) if current else None
+        self.enrolled = list(enrolled)
+
+    @classmethod
+    def from_planner(cls, planner: AcademicPlanner, program_ids: Sequence[int]) -> "PlanState":
+        config = planner.plan_config
+        current = planner.student_state.get_current_semester()
+        return cls(
+            program_ids,
+            config.start_season,
+            config.start_year,
+            [c.get_course_code() for c in planner.student_state.completed_courses],
+            planner.assigner.assignments,
+            (current.season, current.year) if current else None,
+            [c.get_course_code() for c in planner.student_state.enrolled_courses],
+        )
+
+    def to_bytes(self) -> bytes:
+        payload = {
+            "v": self.FORMAT,
+            "p": self.program_ids,
+            "s": [self.start_season, self.start_year],
+            "c": self.completed,
+            "a": self.assignments,
+            "cur": self.current,
+            "e": self.enrolled,
+        }
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "PlanState":
+        payload = json.loads(raw)
+        if payload.get("v") != cls.FORMAT:
+            raise ValueError(f"Unsupported plan state format: {payload.get('v')!r}")
+        return cls(payload["p"], payload["s"][0], payload["s"][1], payload["c"], payload["a"], payload["cur"], payload["e"])
+
+    def rehydrate(self, catalog: Catalog, programs: List[Program], policy_engine: Optional[PolicyEngine] = None) -> AcademicPlanner:
+        """Rebuild the planner. Assignments were validated when made and are restored as-is."""
+        planner = AcademicPlanner(catalog, programs, Semester(self.start_season, self.start_year), policy_engine=policy_engine)
+        state = planner.student_state
+        state.completed_courses = [course for course in map(catalog.get_by_course_code, self.completed) if course is not None]
+        if self.current:
+            state.set_current_semester(Semester(*self.current))
+        state.enrolled_courses = [course for course in map(catalog.get_by_course_code, self.enrolled) if course is not None]
+        planner.assigner.assignments = {code: list(pairs) for code, pairs in self.assignments.items()}
+        planner.plan_config.program_ids = list(self.program_ids)
+        return planner
+
+
+# === Backends ===
+
+class PlanStore(ABC):
+    """
+    Storage for serialized plan states keyed by plan id.
+    `shared` is True when other processes may write the same plans, so cached planners must be revalidated.
+    """
+
+    shared = False
+
+    @abstractmethod
+    def next_id(self) -> int:
+        """An unused plan id."""
+
+    @abstractmethod
+    def load(self, plan_id: int) -> Optional[bytes]:
+        """The stored plan state, or None if the plan is not stored."""
+
+    @abstractmethod
+    def save(self, plan_id: int, data: bytes) -> None:
+        """Store a plan state, replacing the previous one."""
+
+    @abstractmethod
+    def delete(self, plan_id: int) -> None:
+        """Drop a plan; a plan that is not stored is ignored."""
+
+    def free_capacity(self) -> Optional[int]:
+        """How many more plans can be stored before older ones are dropped; None if unbounded."""
+        return None
+
+
+class MemoryPlanStore(PlanStore):
+    """
+    Process-local store of record. Unbounded by default; with `max_plans` set, the least recently used
+    plans beyond it are deleted, each one logged, and later reads of them find nothing.
+    """
+
+    def __init__(self, max_plans: int = PLAN_STORE_MAX_PLANS):
+        self.max_plans = max_plans
+        self._data: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.evictions = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            plan_id = self._counter
+            self._counter += 1
+            return plan_id
+
+    def load(self, plan_id: int) -> Optional[bytes]:
+        with self._lock:
+            data = self._data.get(plan_id)
+            if data is not None:
+                self._data.move_to_end(plan_id)
+            return data
+
+    def save(self, plan_id: int, data: bytes) -> None:
+        with self._lock:
+            self._data[plan_id] = data
+            self._data.move_to_end(plan_id)
+            while self.max_plans and len(self._data) > self.max_plans:
+                evicted, _ = self._data.popitem(last=False)
+                self.evictions += 1
+                logger.warning(f"Plan store is full ({self.max_plans} plans): deleted least recently used plan {evicted}")
+
+    def delete(self, plan_id: int) -> None:
+        with self._lock:
+            self._data.pop(plan_id, None)
+
+    def free_capacity(self) -> Optional[int]:
+        if not self.max_plans:
+            return None
+        with self._lock:
+            return max(self.max_plans - len(self._data), 0)
+
+
+class RedisPlanStore(PlanStore):
+    """Plans in Redis under `plan:<id>`, expiring after `ttl` seconds without a save (None = never)."""
+
+    shared = True
+
+    def __init__(self, client=None, ttl: Optional[int] = PLAN_STORE_TTL_SECONDS, prefix: str = "plan"):
+        if client is None:
+            import redis
+            client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, plan_id: int) -> str:
+        return f"{self.prefix}:{plan_id}"
+
+    def next_id(self) -> int:
+        # INCR starts at 1; keep API plan ids starting at 0
+        return int(self.client.incr(f"{self.prefix}:next_id")) - 1
+
+    def load(self, plan_id: int) -> Optional[bytes]:
+        return self.client.get(self._key(plan_id))
+
+    def save(self, plan_id: int, data: bytes) -> None:
+        self.client.set(self._key(plan_id), data, ex=self.ttl)
+
+    def delete(self, plan_id: int) -> None:
+        self.client.delete(self._key(plan_id))
+
+
+class PostgresPlanStore(PlanStore):
+    """Plans in the `plans` table, one row per plan."""
+
+    shared = True
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from db.database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+
+    def _run(self, fn: Callable[[Any], Any]) -> Any:
+        from sqlalchemy.exc import SQLAlchemyError
+        session = self.session_factory()
+        try:
+            result = fn(session)
+            session.commit()
+            return result
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise DatabaseError(f"Plan store operation failed: {e}") from e
+        finally:
+            session.close()
+
+    def next_id(self) -> int:
+        from db.models.plan import Plan as ORMPlan
+        def insert(session):
+            row = ORMPlan(state=b"")
+            session.add(row)
+            session.flush()
+            return row.id
+        return self._run(insert)
+
+    def load(self, plan_id: int) -> Optional[bytes]:
+        from db.models.plan import Plan as ORMPlan
+        def select(session):
+            row = session.get(ORMPlan, plan_id)
+            return bytes(row.state) if row is not None and row.state else None
+        return self._run(select)
+
+    def save(self, plan_id: int, data: bytes) -> None:
+        from db.models.plan import Plan as ORMPlan
+        self._run(lambda session: session.merge(ORMPlan(id=plan_id, state=data)))
+
+    def delete(self, plan_id: int) -> None:
+        from db.models.plan import Plan as ORMPlan
+        self._run(lambda session: session.query(ORMPlan).filter(ORMPlan.id == plan_id).delete())
+
+
+def make_plan_store(backend: str = PLAN_STORE_BACKEND) -> PlanStore:
+    if backend == 'memory':
+        return MemoryPlanStore()
+    if backend == 'redis':
+        return RedisPlanStore()
+    if backend == 'postgres':
+        return PostgresPlanStore()
+    raise ValueError(f"Unknown PLAN_STORE_BACKEND '{backend}', expected 'memory', 'redis' or 'postgres'")
+
+
+# === Live planners ===
+
+class LivePlan:
+    def __init__(self, planner: AcademicPlanner, program_ids: List[int], data: bytes):
+        self.planner = planner
+        self.program_ids = program_ids
+        self.data = data
+        self.last_used = time.monotonic()
+
+
+class PlanManager:
+    """
+    Hands out AcademicPlanners backed by a PlanStore.
+    Planners are rebuilt lazily from their stored state against the current catalog and programs,
+    kept in a bounded LRU while in use, and dropped after `idle_seconds` without access.
+    Callers must save() a planner after changing it.
+    """
+
+    def __init__(self, store: PlanStore, catalog_provider: Callable[[], Catalog],
+                 program_loader: Callable[[List[int]], List[Program]],
+                 policy_engine_factory: Callable[[], PolicyEngine] = PolicyEngine,
+                 max_live: int = PLAN_CACHE_MAX_LIVE, idle_seconds: float = PLAN_CACHE_IDLE_SECONDS):
+        self.store = store
+        self._catalog_provider = catalog_provider
+        self._program_loader = program_loader
+        self._policy_engine_factory = policy_engine_factory
+        self.max_live = max_live
+        self.idle_seconds = idle_seconds
+        self._live: "OrderedDict[int, LivePlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.rehydrations = 0
+        self.evictions = 0
+
+    def create(self, program_ids: List[int], start_semester: Semester) -> Tuple[int, AcademicPlanner]:
+        """Create and store a new plan for the given program database ids."""
+        catalog = self._catalog_provider()
+        programs = self._program_loader(program_ids)
+        planner = AcademicPlanner(catalog, programs, start_semester, policy_engine=self._policy_engine_factory())
+        planner.plan_config.program_ids = list(program_ids)
+        plan_id = self.store.next_id()
+        self._put(plan_id, planner, list(program_ids))
+        return plan_id, planner
+
+    def get(self, plan_id: int) -> Optional[AcademicPlanner]:
+        with self._lock:
+            live = self._live.get(plan_id)
+        data = None
+        if live is not None and self.store.shared:
+            # Another worker may have changed the plan since it was cached here
+            data = self.store.load(plan_id)
+            if data != live.data:
+                live = None
+        if live is not None and not self._is_current(live):
+            data = None
+            live = None
+        if live is None:
+            return self._rehydrate(plan_id, data)
+        self.hits += 1
+        with self._lock:
+            live.last_used = time.monotonic()
+            if plan_id in self._live:
+                self._live.move_to_end(plan_id)
+        self._evict()
+        return live.planner
+
+    def import_plan(self, data: bytes) -> int:
+        """Store a plan serialized elsewhere (e.g. by a transcript import worker) under a new id; it is rebuilt on first get()."""
+        plan_id = self.store.next_id()
+        self.store.save(plan_id, data)
+        return plan_id
+
+    def save(self, plan_id: int, planner: AcademicPlanner) -> None:
+        # The ids travel with the planner, so a save after the planner left the live cache keeps them
+        program_ids = planner.plan_config.program_ids
+        if program_ids is None:
+            data = self.store.load(plan_id)
+            if data is None:
+                raise ResourceNotFoundError(f"Plan {plan_id} has no known programs to save with")
+            program_ids = PlanState.from_bytes(data).program_ids
+        self._put(plan_id, planner, list(program_ids))
+
+    def delete(self, plan_id: int) -> None:
+        self.store.delete(plan_id)
+        with self._lock:
+            self._live.pop(plan_id, None)
+
+    def _is_current(self, live: LivePlan) -> bool:
+        # Rebuild against a new catalog snapshot or reloaded programs
+        planner = live.planner
+        if planner.catalog is not self._catalog_provider():
+            return False
+        programs = self._program_loader(live.program_ids)
+        current = planner.plan_config.programs
+        return len(programs) == len(current) and all(a is b for a, b in zip(programs, current))
+
+    def _rehydrate(self, plan_id: int, data: Optional[bytes] = None) -> Optional[AcademicPlanner]:
+        if data is None:
+            data = self.store.load(plan_id)
+        if data is None:
+            return None
+        try:
+            state = PlanState.from_bytes(data)
+        except ValueError as e:
+            logger.error(f"Could not read stored plan {plan_id}: {e}")
+            return None
+        catalog = self._catalog_provider()
+        planner = state.rehydrate(catalog, self._program_loader(state.program_ids), self._policy_engine_factory())
+        self.rehydrations += 1
+        self._remember(plan_id, LivePlan(planner, state.program_ids, data))
+        return planner
+
+    def _put(self, plan_id: int, planner: AcademicPlanner, program_ids: List[int]) -> None:
+        data = PlanState.from_planner(planner, program_ids).to_bytes()
+        self.store.save(plan_id, data)
+        self._remember(plan_id, LivePlan(planner, program_ids, data))
+
+    def _remember(self, plan_id: int, live: LivePlan) -> None:
+        with self._lock:
+            self._live[plan_id] = live
+            self._live.move_to_end(plan_id)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop planners beyond max_live and those idle for longer than idle_seconds; their state stays in the store."""
+        cutoff = time.monotonic() - self.idle_seconds if self.idle_seconds else None
+        with self._lock:
+            while self._live:
+                plan_id, live = next(iter(self._live.items()))
+                over_limit = self.max_live and len(self._live) > self.max_live
+                idle = cutoff is not None and live.last_used < cutoff
+                if not (over_limit or idle):
+                    break
+                del self._live[plan_id]
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.store).__name__,
+            "live_planners": len(self._live),
+            "hits": self.hits,
+            "rehydrations": self.rehydrations,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,206 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from models.courses.course import Course
+from models.graph.dependency_graph import DependencyGraph
+from models.graph.eligibility import CourseEligibility
+from models.requirements.program import Program
+from models.requirements.requirement_types.requirement import Requirement
+from models.requirements.requirement_types.evaluation import RequirementEvaluator, RequirementResult
+from core.exceptions import EnrollmentError
+
+
+class ProgressTracker:
+    """
+    Derived state of one plan, kept current course by course instead of recomputed per request:
+    the completed set and bitset, per-requirement results, per-category progress and unmet
+    requirements, and the frontier of courses the student can take next.
+
+    Adding or removing a course re-evaluates only the categories it is assigned to and re-checks
+    eligibility only for the courses it directly unlocks (plus their corequisite partners). While a plan
+    has no assignments at all, every completed course counts toward every category, as in
+    get_unmet_requirements, so each change then touches every category.
+
+    `assignments` is the RequirementAssigner's dict, read live; call sync() after changing a course's assignments.
+    """
+
+    def __init__(self, graph: DependencyGraph, programs: List[Program], completed_courses: Iterable[Course],
+                 assignments: Dict[str, List[Tuple[str, str]]]):
+        self.graph = graph
+        self.programs = programs
+        self.assignments = assignments
+        self.completed: Dict[str, Course] = {}
+        self.completed_bits = 0
+        # Completion order, since category progress credits courses in that order
+        self._order: Dict[str, int] = {}
+        self._sequence = 0
+        self._categories = {(program.name, category.category): category for program in programs for category in program.categories}
+        self._members: Dict[Tuple[str, str], Set[str]] = {key: set() for key in self._categories}
+        self._pairs: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        self._unassigned = not assignments
+        self.requirement_results: Dict[Tuple[str, str], List[Optional[RequirementResult]]] = {}
+        self.category_progress: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.unmet: Dict[Tuple[str, str], List[Requirement]] = {}
+        self._eligible: Optional[Set[str]] = None
+
+        for course in completed_courses:
+            code = course.get_course_code()
+            if code and code not in self.completed:
+                self._mark_completed(code, course)
+                self._pairs[code] = self._current_pairs(code)
+                for key in self._pairs[code]:
+                    if key in self._members:
+                        self._members[key].add(code)
+        self._refresh(self._categories)
+
+    # === Updates ===
+
+    def is_completed(self, course_code: str) -> bool:
+        return course_code in self.completed
+
+    def add(self, course: Course) -> bool:
+        """Record a completed course. Returns False if it was already completed."""
+        code = course.get_course_code()
+        if not code or code in self.completed:
+            return False
+        self.update(added=[course])
+        return True
+
+    def remove(self, course_code: str) -> bool:
+        """Drop a completed course. Its assignments are left in place. Returns False if it was not completed."""
+        if course_code not in self.completed:
+            return False
+        self.update(removed=[course_code])
+        return True
+
+    def sync(self, course_code: str) -> None:
+        """Bring the categories a course counts toward up to date after its assignments changed."""
+        self.update(synced=[course_code])
+
+    def update(self, added: Iterable[Course] = (), removed: Iterable[str] = (), synced: Iterable[str] = ()) -> None:
+        """
+        Batch form of add, remove and sync: courses are added and removed first, then every
+        category touched by any of them is re-evaluated once.
+        """
+        changed = []
+        for course in added:
+            code = course.get_course_code()
+            if code and code not in self.completed:
+                self._mark_completed(code, course)
+                changed.append(code)
+        for code in removed:
+            if self.completed.pop(code, None) is not None:
+                self._order.pop(code, None)
+                course_id = self.graph.index.get(code)
+                if course_id is not None:
+                    self.completed_bits &= ~(1 << course_id)
+                changed.append(code)
+        for code in changed:
+            self._update_frontier(code)
+
+        touched = set()
+        for code in list(changed) + [code for code in synced if code not in changed]:
+            old = self._pairs.get(code, ())
+            new = self._current_pairs(code) if code in self.completed else ()
+            if new:
+                self._pairs[code] = new
+            else:
+                self._pairs.pop(code, None)
+            for key in old:
+                if key in self._members:
+                    self._members[key].discard(code)
+            for key in new:
+                if key in self._members:
+                    self._members[key].add(code)
+            touched.update(key for key in set(old) ^ set(new) if key in self._categories)
+
+        unassigned = not self.assignments
+        if unassigned != self._unassigned or (unassigned and changed):
+            self._unassigned = unassigned
+            self._refresh(self._categories)
+        elif not unassigned:
+            self._refresh([key for key in self._categories if key in touched])
+
+    # === Derived state ===
+
+    def unmet_requirements(self) -> Dict[Tuple[str, str], List[Requirement]]:
+        """Same result as get_unmet_requirements for the tracked courses and assignments."""
+        return {key: self.unmet[key] for key in self._categories if self.unmet.get(key)}
+
+    def program_progress(self, program: Program) -> Dict[str, Any]:
+        """Same result as Program.progress for the tracked courses and assignments."""
+        categories = [self.category_progress[(program.name, category.category)] for category in program.categories]
+        total_earned = sum(progress.get("earned_credits", 0) for progress in categories)
+        return {
+            "program": program.name,
+            "type": program.type,
+            "total_required": program.total_credits,
+            "total_earned": total_earned,
+            "complete": total_earned >= program.total_credits and all(progress.get("complete", False) for progress in categories),
+            "categories": categories,
+            "notes": program.notes
+        }
+
+    def eligible_codes(self) -> Set[str]:
+        """Catalog courses the student can take next, with nothing enrolled; built on first use, then maintained."""
+        if self._eligible is None:
+            self._eligible = CourseEligibility.eligible_set(self.completed.keys(), (), self.graph)
+        return self._eligible
+
+    # === Internals ===
+
+    def _mark_completed(self, code: str, course: Course) -> None:
+        self.completed[code] = course
+        self._order[code] = self._sequence
+        self._sequence += 1
+        course_id = self.graph.index.get(code)
+        if course_id is not None:
+            self.completed_bits |= 1 << course_id
+
+    def _current_pairs(self, course_code: str) -> Tuple[Tuple[str, str], ...]:
+        return tuple(tuple(pair) for pair in self.assignments.get(course_code, ()))
+
+    def _assigned(self, key: Tuple[str, str]) -> List[Course]:
+        if self._unassigned:
+            return list(self.completed.values())
+        return [self.completed[code] for code in sorted(self._members[key], key=self._order.__getitem__)]
+
+    def _refresh(self, keys: Iterable[Tuple[str, str]]) -> None:
+        evaluator = RequirementEvaluator()
+        for key in keys:
+            category = self._categories[key]
+            assigned = self._assigned(key)
+            progress = category.progress(assigned, None, evaluator)
+            results: List[Optional[RequirementResult]] = []
+            unmet = []
+            for requirement in category.requirements:
+                try:
+                    result = evaluator.evaluate(requirement, assigned)
+                except EnrollmentError:
+                    result = None
+                results.append(result)
+                if result is None or not result.satisfied:
+                    unmet.append(requirement)
+            self.requirement_results[key] = results
+            self.category_progress[key] = progress
+            self.unmet[key] = [] if progress.get("complete", False) else unmet
+
+    def _update_frontier(self, course_code: str) -> None:
+        """Re-check the courses whose eligibility can depend on course_code being completed."""
+        if self._eligible is None:
+            return
+        adjacency = self.graph.adjacency
+        groups = self.graph.mutual_corequisite_groups()
+        # Direct dependents, then theirs (a single corequisite's own prerequisites count), then corequisite partners
+        affected = {course_code} | adjacency.get(course_code, frozenset()) | set(groups.get(course_code, ()))
+        for code in list(affected):
+            affected |= adjacency.get(code, frozenset())
+        for code in list(affected):
+            affected.update(groups.get(code, ()))
+
+        completed = self.completed.keys()
+        for code in affected:
+            if code not in self.graph.nodes:
+                continue
+            if CourseEligibility.evaluate(code, completed, (), self.completed_bits, self.completed_bits, self.graph):
+                self._eligible.add(code)
+            else:
+                self._eligible.discard(code)
@@ -1,10 +1,7 @@
 from typing import List, Dict, Tuple, Optional, Set
 from models.requirements.program import Program
 from models.requirements.requirement_types.requirement import Requirement
-from models.requirements.requirement_types.course_filter import CourseFilterRequirement
-from models.requirements.requirement_types.course_options import CourseOptionsRequirement
-from models.requirements.requirement_types.course_list import CourseListRequirement
-from models.requirements.requirement_types.compound import CompoundRequirement
+from models.requirements.requirement_types.evaluation import RequirementEvaluator
 from models.courses.course import Course
 from models.courses.catalog import Catalog
 from models.graph.eligibility import CourseEligibility
@@ -12,7 +9,7 @@ from models.graph.dependency_graph import DependencyGraph
 from core.exceptions import EnrollmentError
 
 
-def get_unmet_requirements(programs: List[Program], completed_courses: List[Course], requirement_assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None) -> Dict[Tuple[str, str], List[Requirement]]:
+def get_unmet_requirements(programs: List[Program], completed_courses: List[Course], requirement_assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None, evaluator: Optional[RequirementEvaluator] = None) -> Dict[Tuple[str, str], List[Requirement]]:
     """
     Given a list of Program objects and a list of completed Course objects,
     return a dict mapping (program_name, category_name) to a list of unmet requirement objects for that category in that program.
@@ -22,7 +19,9 @@ def get_unmet_requirements(programs: List[Program], completed_courses: List[Cour
         programs: List of programs to check
         completed_courses: List of completed courses
         requirement_assignments: Optional dict mapping course_code to category_name for assigned courses
+        evaluator: Optional RequirementEvaluator shared with other progress checks in the same request
     """
+    evaluator = evaluator or RequirementEvaluator()
     unmet = {}
     for program in programs:
         for category in program.categories:
@@ -40,49 +39,18 @@ def get_unmet_requirements(programs: List[Program], completed_courses: List[Cour
                 assigned_courses = completed_courses
 
             # First check if the category as a whole is complete
-            category_progress = category.progress(assigned_courses, None)
+            category_progress = category.progress(assigned_courses, None, evaluator)
             category_complete = category_progress.get("complete", False)
             
             # If the category is complete, skip it entirely
             if category_complete:
                 continue
                 
-            # Otherwise, check individual requirements
+            # Otherwise, check individual requirements; results are shared with the progress pass above
             unmet_reqs = []
             for req in category.requirements:
                 try:
-                    satisfied_credits = req.satisfied_credits(assigned_courses)
-                    if isinstance(req, CourseOptionsRequirement):
-                        completed_codes = {c.get_course_code() for c in assigned_courses}
-                        matching_courses = completed_codes.intersection(set(req.options))
-                        is_satisfied = len(matching_courses) >= req.min_required
-                    elif isinstance(req, CourseListRequirement):
-                        completed_codes = {c.get_course_code() for c in assigned_courses}
-                        is_satisfied = all(course in completed_codes for course in req.courses)
-                    elif isinstance(req, CompoundRequirement):
-                        is_satisfied = False
-                        for opt in req.options:
-                            if hasattr(opt, 'min_credits') and getattr(opt, 'min_credits', None) is not None:
-                                if opt.satisfied_credits(assigned_courses) >= getattr(opt, 'min_credits', 0):
-                                    is_satisfied = True
-                                    break
-                            elif hasattr(opt, 'min_required') and getattr(opt, 'min_required', None) is not None:
-                                completed_codes = {c.get_course_code() for c in assigned_courses}
-                                matching_courses = completed_codes.intersection(set(getattr(opt, 'options', [])))
-                                if len(matching_courses) >= getattr(opt, 'min_required', 0):
-                                    is_satisfied = True
-                                    break
-                            elif hasattr(opt, 'courses'):
-                                completed_codes = {c.get_course_code() for c in assigned_courses}
-                                if all(course in completed_codes for course in getattr(opt, 'courses', [])):
-                                    is_satisfied = True
-                                    break
-                            else:
-                                if opt.satisfied_credits(assigned_courses) > 0:
-                                    is_satisfied = True
-                                    break
-                    else:
-                        is_satisfied = satisfied_credits > 0
+                    is_satisfied = evaluator.evaluate(req, assigned_courses).satisfied
                 except EnrollmentError:
                     is_satisfied = False
                 if not is_satisfied:
@@ -116,11 +84,15 @@ def get_all_recommendations(unmet_requirements: Dict[Tuple[str, str], List[Requi
     return recommendation_sets
 
 
-def get_eligible_recommendations(recommendations_dict: Dict[str, List[Course]], completed_courses: List[Course], enrolled_courses: List[Course], graph: DependencyGraph) -> Dict[str, List[Course]]:
+def get_eligible_recommendations(recommendations_dict: Dict[str, List[Course]], completed_courses: List[Course], enrolled_courses: List[Course], graph: DependencyGraph, eligible_codes: Optional[Set[str]] = None) -> Dict[str, List[Course]]:
     """
     Given a dictionary {category: list(courses)}, completed_courses, enrolled_courses, and graph,
     returns a dictionary {category: list(eligible_courses)} with only eligible courses.
+    eligible_codes, if given, is the already known eligible set for these courses and skips the catalog sweep.
     """
+    if eligible_codes is not None:
+        return {category: [course for course in courses if course.get_course_code() in eligible_codes]
+                for category, courses in recommendations_dict.items()}
     # Convert Course objects to course codes for eligibility checking
     completed_codes: Set[str] = set()
     for course in completed_courses:
@@ -134,12 +106,9 @@ def get_eligible_recommendations(recommendations_dict: Dict[str, List[Course]],
         if code:
             enrolled_codes.add(code)
     
+    # One sweep over the whole catalog, then each category is a set intersection
+    eligible_codes = CourseEligibility.eligible_set(completed_codes, enrolled_codes, graph)
     eligible_recs: Dict[str, List[Course]] = {}
     for category, courses in recommendations_dict.items():
-        eligible = []
-        for course in courses:
-            code = course.get_course_code()
-            if code and CourseEligibility.is_course_eligible(code, completed_codes, enrolled_codes, graph):
-                eligible.append(course)
-        eligible_recs[category] = eligible
+        eligible_recs[category] = [course for course in courses if course.get_course_code() in eligible_codes]
     return eligible_recs 
\ No newline at end of file
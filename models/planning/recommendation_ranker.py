@@ -0,0 +1,73 @@
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Union
+from models.courses.course import Course
+from models.graph.dependency_graph import DependencyGraph
+from config.config import RECOMMENDATION_WEIGHTS
+
+# A recommendation is a course or a mutual corequisite group taken together
+Item = Union[Course, List[Course]]
+
+
+class RecommendationRanker:
+    """
+    Scores recommendation candidates and keeps a bounded top-K per category.
+
+    A course scores for the unmet requirements it can satisfy (anywhere in the plan), the courses it
+    directly unlocks (log scale, so gateway courses do not drown out the rest), its critical-path height
+    (semesters of remaining work that hang off it) and how much of its credit the category can still use.
+    A corequisite group adds up its members' requirements and unlocks, takes the largest height, and fits
+    on its total credits. Equal scores rank by course code, so pages are stable.
+    """
+
+    def __init__(self, graph: DependencyGraph, requirement_counts: Dict[str, int], heights: Dict[str, int],
+                 remaining_credits: Dict[str, int], weights: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            graph: Dependency graph the dependents are read from
+            requirement_counts: Number of unmet requirements each course can satisfy
+            heights: Critical-path height of the courses needed for the unmet requirements
+            remaining_credits: Credits each category (by name) still needs
+            weights: Term weights; RECOMMENDATION_WEIGHTS when omitted
+        """
+        self.graph = graph
+        self.requirement_counts = requirement_counts
+        self.heights = heights
+        self.remaining_credits = remaining_credits
+        self.weights = weights or RECOMMENDATION_WEIGHTS
+
+    @staticmethod
+    def count_requirements(candidates: Dict[str, List[Course]]) -> Dict[str, int]:
+        """Per course code, how many unmet requirements list it, from get_all_recommendations output."""
+        return Counter(course.get_course_code() for courses in candidates.values() for course in courses)
+
+    def score(self, item: Item, category: str) -> float:
+        courses = item if isinstance(item, list) else [item]
+        codes = [course.get_course_code() for course in courses]
+        credits = sum(course.get_credit_hours() for course in courses)
+        remaining = self.remaining_credits.get(category, 0)
+        fit = min(credits, remaining) / credits if credits > 0 else 0.0
+        unlocks = sum(len(self.graph.adjacency.get(code, ())) for code in codes)
+        return (self.weights["requirements"] * sum(self.requirement_counts.get(code, 0) for code in codes)
+                + self.weights["unlocks"] * math.log2(1 + unlocks)
+                + self.weights["height"] * max(self.heights.get(code, 0) for code in codes)
+                + self.weights["credit_fit"] * fit)
+
+    def top(self, items: List[Item], category: str, limit: int, offset: int = 0) -> List[Item]:
+        """Items ranked offset .. offset + limit - 1, selected with a heap of offset + limit entries instead of a full sort."""
+        keyed = ((-self.score(item, category), (item[0] if isinstance(item, list) else item).get_course_code(), i, item)
+                 for i, item in enumerate(items))
+        return [entry[3] for entry in heapq.nsmallest(offset + limit, keyed)[offset:]]
+
+    def rank(self, recommendations: Dict[str, List[Item]], limit: int, offset: int = 0) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary with one page of ranked items per category and each category's candidate count
+        """
+        page: Dict[str, List[Item]] = {}
+        totals: Dict[str, int] = {}
+        for category, items in recommendations.items():
+            page[category] = self.top(items, category, limit, offset)
+            totals[category] = len(items)
+        return {"recommendations": page, "totals": totals, "offset": offset, "limit": limit}
@@ -3,6 +3,8 @@ from models.courses.course import Course
 from models.requirements.requirement_types.requirement import Requirement
 from models.requirements.program import Program
 from models.requirements.policy_engine import PolicyEngine
+from models.requirements.requirement_index import RequirementIndex
+from models.courses.catalog import Catalog
 
 
 class RequirementAssigner:
@@ -12,11 +14,13 @@ class RequirementAssigner:
     Now supports assigning a course to multiple categories, but only if those categories are from different programs.
     """
     
-    def __init__(self, programs: List[Program], policy_engine: Optional[PolicyEngine] = None):
+    def __init__(self, programs: List[Program], policy_engine: Optional[PolicyEngine] = None, catalog: Optional[Catalog] = None):
         self.programs = programs
         # assignments: Dict[course_code, List[Tuple[program_name, category_name]]]
         self.assignments: Dict[str, List[Tuple[str, str]]] = {}
         self.policy_engine = policy_engine or PolicyEngine()
+        # Inverted course -> requirement index over self.programs; only available with a catalog
+        self.index: Optional[RequirementIndex] = RequirementIndex(programs, catalog) if catalog is not None else None
     
     def assign_course_to_requirement(self, course: Course, category_name: str) -> bool:
         course_code = course.get_course_code()
@@ -61,6 +65,18 @@ class RequirementAssigner:
         self.assignments.setdefault(course_code, []).append((program_name, category_name))
         return True
 
+    def check_assignment(self, course: Course, program_name: str, category_name: str) -> Optional[str]:
+        """Why the course cannot count toward the program's category, or None if it can. Overlap policies are not checked."""
+        course_code = course.get_course_code()
+        program = next((p for p in self.programs if p.name == program_name), None)
+        if program is None:
+            return f"Cannot assign {course_code} - program '{program_name}' is not part of this plan"
+        if not any(category.category == category_name for category in program.categories):
+            return f"Cannot assign {course_code} to '{category_name}' - category not found in {program_name}"
+        if not self._validate_assignment(course, category_name):
+            return f"Cannot assign {course_code} to {category_name} - course does not satisfy any requirement in this category"
+        return None
+
     def get_assignment_summary(self) -> Dict[str, List[Tuple[str, str]]]:
         # Returns {course_code: [(program_name, category_name), ...]}
         return self.assignments
@@ -76,7 +92,24 @@ class RequirementAssigner:
         except:
             return False
     
+    def get_assignable_categories(self, course: Course) -> List[Tuple[str, str]]:
+        """(program_name, category_name) pairs the course can satisfy a requirement in."""
+        if self._indexed(course):
+            return self.index.categories_for(course.get_course_code())
+        pairs = []
+        for program in self.programs:
+            for category in program.categories:
+                if any(self._course_satisfies_requirement(course, r) for r in category.requirements):
+                    pairs.append((program.name, category.category))
+        return pairs
+
+    def _indexed(self, course: Course) -> bool:
+        # The index describes catalog courses; anything else takes the direct path
+        return self.index is not None and self.index.catalog.get_by_course_code(course.get_course_code()) is course
+
     def _validate_assignment(self, course: Course, category_name: str) -> bool:
+        if self._indexed(course):
+            return self.index.satisfies(course.get_course_code(), category_name)
         for program in self.programs:
             for category in program.categories:
                 if category.category == category_name:
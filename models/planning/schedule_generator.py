@@ -0,0 +1,181 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+from models.courses.catalog import Catalog
+from models.courses.course import Course
+from models.graph.critical_path import CriticalPathSolver
+from models.graph.dependency_graph import DependencyGraph
+from models.requirements.program import Program
+from models.requirements.policy_engine import PolicyEngine
+from models.requirements.requirement_types.evaluation import RequirementEvaluator
+from models.planning.requirement_assigner import RequirementAssigner
+from models.planning.semester import Semester
+from core.exceptions import EnrollmentError
+
+
+def next_semester(semester: Semester) -> Semester:
+    if semester.season == "Fall":
+        return Semester("Spring", semester.year + 1)
+    return Semester("Fall", semester.year)
+
+
+class ScheduleGenerator:
+    """
+    Builds a term-by-term plan through graduation by list scheduling.
+    Each term the remaining requirements are resolved to courses with a CriticalPathSolver; courses
+    whose prerequisites are met are packed under the credit cap, highest critical-path height first,
+    with mutual and chosen corequisites kept together. Scheduled courses are assigned to the categories
+    they were picked for through a RequirementAssigner, so overlap policies apply as they do to manual assignments.
+    """
+
+    def __init__(self, catalog: Catalog, graph: DependencyGraph, programs: List[Program],
+                 policy_engine: Optional[PolicyEngine] = None, max_credits: int = Semester.MAX_CREDITS):
+        self.catalog = catalog
+        self.graph = graph
+        self.programs = programs
+        self.policy_engine = policy_engine or PolicyEngine()
+        self.max_credits = max_credits
+
+    def generate(self, completed_courses: List[Course], assignments: Dict[str, List[Tuple[str, str]]],
+                 first_semester: Semester, num_semesters: int) -> Dict[str, Any]:
+        """
+        Args:
+            completed_courses: Courses already taken
+            assignments: Existing course assignments; not modified
+            first_semester: First term to schedule
+            num_semesters: Number of terms available
+        Returns:
+            Dictionary with the scheduled terms, whether every requirement is covered, and what remains unmet
+        """
+        assigner = RequirementAssigner(self.programs, self.policy_engine, self.catalog)
+        assigner.assignments = {code: list(pairs) for code, pairs in assignments.items()}
+        taken = list(completed_courses)
+        taken_codes: Set[str] = {c.get_course_code() for c in taken}
+        terms = []
+        semester = first_semester
+        pending = self._pending_categories(taken, assigner.assignments)
+        for _ in range(num_semesters):
+            if not pending:
+                break
+            # Eligibility is fixed by earlier terms; picking repeats while credits remain, since courses
+            # scheduled this term can leave categories short of credits that further courses must cover
+            solver = CriticalPathSolver(self.graph, taken_codes)
+            term_courses: List[Course] = []
+            term_codes: Set[str] = set()
+            term_assignments: Dict[str, List[Tuple[str, str]]] = {}
+            while pending:
+                scheduled, picked_for = self._schedule_term(solver, pending, taken_codes | term_codes,
+                                                            self.max_credits - sum(c.get_credit_hours() for c in term_courses))
+                if not scheduled:
+                    break
+                open_categories = {(program.name, category.category) for program, category, *_ in pending}
+                for course in scheduled:
+                    code = course.get_course_code()
+                    for program_name, category_name in picked_for.get(code, ()):
+                        if assigner.assign_course_to_requirement(course, category_name):
+                            term_assignments.setdefault(code, []).append((program_name, category_name))
+                    if code not in term_assignments:
+                        # Taken only as a prerequisite; let it count toward an open category it fits, such as electives
+                        for pair in assigner.get_assignable_categories(course):
+                            if pair in open_categories and assigner.assign_course_to_requirement(course, pair[1]):
+                                term_assignments[code] = [pair]
+                                break
+                term_courses.extend(scheduled)
+                term_codes.update(c.get_course_code() for c in scheduled)
+                pending = self._pending_categories(taken + term_courses, assigner.assignments)
+            if not term_courses:
+                break
+            taken.extend(term_courses)
+            taken_codes |= term_codes
+            terms.append({
+                "term": semester.term_id,
+                "courses": [c.get_course_code() for c in term_courses],
+                "credits": sum(c.get_credit_hours() for c in term_courses),
+                "assignments": term_assignments,
+            })
+            semester = next_semester(semester)
+        return {
+            "semesters": terms,
+            "complete": not pending,
+            "unmet": [{"program": program.name, "category": category.category} for program, category, *_ in pending],
+        }
+
+    def _pending_categories(self, taken: List[Course], assignments: Dict[str, List[Tuple[str, str]]]) -> List[tuple]:
+        """
+        (program, category, requirements still to schedule, codes already counted, whether only credits are missing)
+        for every incomplete category.
+        """
+        evaluator = RequirementEvaluator()
+        pending = []
+        for program in self.programs:
+            for category in program.categories:
+                assigned = [c for c in taken if (program.name, category.category) in assignments.get(c.get_course_code(), ())]
+                if category.progress(assigned, None, evaluator).get("complete", False):
+                    continue
+                unmet = []
+                for requirement in category.requirements:
+                    try:
+                        satisfied = evaluator.evaluate(requirement, assigned).satisfied
+                    except EnrollmentError:
+                        satisfied = False
+                    if not satisfied:
+                        unmet.append(requirement)
+                counted = {c.get_course_code() for c in assigned}
+                if unmet:
+                    pending.append((program, category, unmet, counted, False))
+                else:
+                    # Every requirement met but credits short: open-ended requirements need more courses
+                    pending.append((program, category, list(category.requirements), counted, True))
+        return pending
+
+    def _schedule_term(self, solver: CriticalPathSolver, pending: List[tuple], exclude: Set[str],
+                       capacity: int) -> Tuple[List[Course], Dict[str, List[Tuple[str, str]]]]:
+        """Courses available this term for the pending categories, packed into capacity credits."""
+        picked_for: Dict[str, List[Tuple[str, str]]] = {}
+        targets: List[str] = []
+        for program, category, requirements, counted, short_of_credits in pending:
+            for code in solver.requirement_targets(requirements, self.catalog.courses, exclude, counted, short_of_credits):
+                picked_for.setdefault(code, []).append((program.name, category.category))
+                if code not in targets:
+                    targets.append(code)
+        plan = solver.solve(targets)
+        if not plan.layers:
+            return [], picked_for
+
+        # Courses available this term, grouped with the corequisites they must be taken with: a unit is
+        # a connected set of corequisite links, so a corequisite two courses share joins them into one unit
+        linked: Dict[str, List[str]] = {}
+        stack = list(plan.layers[0])
+        while stack:
+            code = stack.pop()
+            if code in linked or code in exclude or solver.depth(code) != 1:
+                continue
+            linked[code] = list(self.graph.mutual_corequisite_groups().get(code, ())) + solver.chosen(code)
+            stack.extend(linked[code])
+        parent = {code: code for code in linked}
+
+        def root(code: str) -> str:
+            while parent[code] != code:
+                parent[code] = parent[parent[code]]
+                code = parent[code]
+            return code
+
+        for code, others in linked.items():
+            for other in others:
+                if other in parent:
+                    parent[root(other)] = root(code)
+        # Members in layer order, then corequisites reached only through the links
+        layer = set(plan.layers[0])
+        grouped: Dict[str, List[str]] = {}
+        for code in [c for c in plan.layers[0] if c in linked] + [c for c in linked if c not in layer]:
+            grouped.setdefault(root(code), []).append(code)
+        units = list(grouped.values())
+        units.sort(key=lambda unit: (-max(plan.heights.get(c, 1) for c in unit), unit[0]))
+
+        scheduled: List[Course] = []
+        credits = 0
+        for unit in units:
+            courses = [self.catalog.get_by_course_code(code) for code in unit]
+            unit_credits = sum(c.get_credit_hours() for c in courses)
+            if credits + unit_credits <= capacity:
+                scheduled.extend(courses)
+                credits += unit_credits
+        return scheduled, picked_for
@@ -1,4 +1,4 @@
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Any, Dict, List, Set, Optional, Tuple
 from models.courses.course import Course
 from models.courses.catalog import Catalog
 from models.graph.dependency_graph import DependencyGraph
@@ -6,6 +6,9 @@ from models.planning.semester import Semester
 from models.planning.student_state import StudentState
 from models.planning.recommendation_engine import get_unmet_requirements, get_all_recommendations, get_eligible_recommendations
 from models.graph.eligibility import CourseEligibility
+from models.graph.critical_path import CriticalPathSolver
+from models.planning.progress_tracker import ProgressTracker
+from models.planning.recommendation_ranker import RecommendationRanker
 
 
 class SemesterPlanner:
@@ -17,13 +20,61 @@ class SemesterPlanner:
         self.catalog = catalog
         self.graph = graph
     
-    def get_semester_recommendations(self, student_state: StudentState, semester: Semester, requirement_assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None) -> Dict[str, List]:
+    def get_semester_recommendations(self, student_state: StudentState, semester: Semester, requirement_assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None, progress: Optional[ProgressTracker] = None) -> Dict[str, List]:
+        """
+        With a ProgressTracker for the same state, unmet requirements and the eligible frontier
+        are read from it instead of being recomputed.
+        """
+        return self._recommend(student_state, requirement_assignments, progress)[2]
+
+    def get_ranked_recommendations(self, student_state: StudentState, progress: ProgressTracker, limit: int, offset: int = 0) -> Dict[str, Any]:
+        """
+        One page of recommendations per category, best first (see RecommendationRanker).
+        Only the page is ordered; the other candidates are counted in `totals`.
+        """
+        unmet, candidates, recommendations = self._recommend(student_state, progress.assignments, progress)
+        solver = CriticalPathSolver(self.graph, list(progress.completed))
+        # Filter requirements pick their target among completed and recommendable courses only: those are the
+        # cheapest matches whenever one exists, and it spares a depth solve for every other match in the catalog
+        nearby = set(progress.completed)
+        for items in recommendations.values():
+            for item in items:
+                nearby.update(course.get_course_code() for course in (item if isinstance(item, list) else [item]))
+        courses = [course for course in self.catalog.courses if course.get_course_code() in nearby]
+        targets = solver.requirement_targets([req for reqs in unmet.values() for req in reqs], courses)
+        remaining: Dict[str, int] = {}
+        for (_, category), result in progress.category_progress.items():
+            needed = max(result["required_credits"] - result["earned_credits"], 0)
+            remaining[category] = max(remaining.get(category, 0), needed)
+        ranker = RecommendationRanker(self.graph, RecommendationRanker.count_requirements(candidates),
+                                      solver.solve(targets).heights, remaining)
+        return ranker.rank(recommendations, limit, offset)
+
+    def _recommend(self, student_state: StudentState, requirement_assignments, progress: Optional[ProgressTracker]):
+        """(unmet requirements, every candidate per category, eligible recommendations per category)."""
         completed_courses, enrolled_courses = student_state.get_eligibility_context()
         
         programs = [program for program in student_state.plan_config.programs]
-        unmet = get_unmet_requirements(programs, completed_courses, requirement_assignments)
+        if progress is not None:
+            unmet = progress.unmet_requirements()
+        else:
+            unmet = get_unmet_requirements(programs, completed_courses, requirement_assignments)
         all_recs = get_all_recommendations(unmet, self.catalog)
-        eligible_recs = get_eligible_recommendations(all_recs, completed_courses, enrolled_courses, self.graph)
+        
+        completed_codes: Set[str] = set()
+        for c in completed_courses:
+            code = c.get_course_code()
+            if code:
+                completed_codes.add(code)
+        # Mutual corequisite groups are checked against completed courses only
+        if progress is not None:
+            group_eligible = progress.eligible_codes()
+        else:
+            group_eligible = CourseEligibility.eligible_set(completed_codes, set(), self.graph)
+        if progress is not None and not enrolled_courses:
+            eligible_recs = get_eligible_recommendations(all_recs, completed_courses, enrolled_courses, self.graph, group_eligible)
+        else:
+            eligible_recs = get_eligible_recommendations(all_recs, completed_courses, enrolled_courses, self.graph)
         
         recommendations = {}
         
@@ -38,13 +89,7 @@ class SemesterPlanner:
                 course_code = course.get_course_code()
                 if not course_code:
                     continue
-                
-                completed_codes: Set[str] = set()
-                for c in completed_courses:
-                    code = c.get_course_code()
-                    if code:
-                        completed_codes.add(code)
-                
+
                 coreq_group = CourseEligibility._find_mutual_coreq_group(
                     course_code, 
                     completed_codes, 
@@ -60,7 +105,7 @@ class SemesterPlanner:
                         course_obj = self.catalog.get_by_course_code(code)
                         if course_obj:
                             # Check if this course is eligible
-                            if CourseEligibility.is_course_eligible(code, completed_codes, set(), self.graph):
+                            if code in group_eligible:
                                 group_courses.append(course_obj)
                             else:
                                 all_group_eligible = False
@@ -82,7 +127,7 @@ class SemesterPlanner:
             if category_recommendations:
                 recommendations[category] = category_recommendations
         
-        return recommendations
+        return unmet, all_recs, recommendations
     
     def __repr__(self):
         return f"<SemesterPlanner catalog={len(self.catalog.courses)} courses>" 
\ No newline at end of file
@@ -0,0 +1,272 @@
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from models.courses.catalog import Catalog
+from models.graph.dependency_graph import catalog_graph
+from models.requirements.program import Program
+from models.requirements.policy_engine import PolicyEngine
+from models.planning.academic_planner import AcademicPlanner
+from models.planning.plan_store import PlanState
+from models.planning.schedule_generator import next_semester
+from models.planning.semester import Semester
+from config.config import IMPORT_WORKERS, IMPORT_CHUNK_SIZE, DEFAULT_START_SEMESTER, DEFAULT_START_YEAR
+from core.exceptions import EnrollmentError, InvalidProgramError
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SEASONS = ("Spring", "Fall")
+
+
+def parse_term(term: str) -> Semester:
+    """'Fall 2023' -> Semester("Fall", 2023)."""
+    parts = term.split() if isinstance(term, str) else []
+    if len(parts) != 2 or parts[0].title() not in SEASONS or not parts[1].isdigit():
+        raise EnrollmentError(f"Invalid term '{term}', expected e.g. 'Fall 2023'")
+    return Semester(parts[0].title(), int(parts[1]))
+
+
+def term_ordinal(semester: Semester) -> int:
+    return 2 * semester.year + SEASONS.index(semester.season)
+
+
+class TranscriptRecord:
+    """
+    One student's transcript: API program ids and (course_code, term) pairs.
+    Records that could not be read carry the reason in `error` and are reported without being built.
+    """
+
+    def __init__(self, student_id: str, program_ids: Sequence[int] = (), courses: Sequence[Tuple[str, str]] = (),
+                 start_term: Optional[str] = None, error: Optional[str] = None):
+        self.student_id = student_id
+        self.program_ids = list(program_ids)
+        self.courses = list(courses)
+        self.start_term = start_term
+        self.error = error
+
+    def __repr__(self):
+        return f"<TranscriptRecord {self.student_id} programs={self.program_ids} courses={len(self.courses)}>"
+
+
+# === Reading ===
+
+def read_transcripts(lines: Iterable[str], fmt: str = "jsonl") -> Iterator[TranscriptRecord]:
+    """
+    Stream transcript records from text lines.
+
+    jsonl: one student per line, {"student_id", "program_ids": [...], "courses": [{"course_code", "term"}, ...], "start_term"?}
+    csv: a header with student_id, program_ids, course_code, term (and optionally start_term), one row per course;
+         a student's rows must be consecutive, program ids are separated by ';' and a row with no course_code adds none.
+    """
+    if fmt == "jsonl":
+        return _read_jsonl(lines)
+    if fmt == "csv":
+        return _read_csv(lines)
+    raise ValueError(f"Unknown transcript format '{fmt}', expected 'jsonl' or 'csv'")
+
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator[TranscriptRecord]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            student_id = str(data["student_id"])
+        except (ValueError, KeyError, TypeError) as e:
+            yield TranscriptRecord(f"line {number}", error=f"Unreadable record: {e}")
+            continue
+        try:
+            courses = [(c["course_code"], c["term"]) if isinstance(c, dict) else (c[0], c[1]) for c in data.get("courses", [])]
+            program_ids = [int(pid) for pid in data.get("program_ids", [])]
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            yield TranscriptRecord(student_id, error=f"Unreadable record: {e}")
+            continue
+        yield TranscriptRecord(student_id, program_ids, courses, data.get("start_term"))
+
+
+def _read_csv(lines: Iterable[str]) -> Iterator[TranscriptRecord]:
+    record: Optional[TranscriptRecord] = None
+    for row in csv.DictReader(lines):
+        student_id = (row.get("student_id") or "").strip()
+        if record is None or student_id != record.student_id:
+            if record is not None:
+                yield record
+            try:
+                program_ids = [int(pid) for pid in (row.get("program_ids") or "").replace(",", ";").split(";") if pid.strip()]
+                record = TranscriptRecord(student_id, program_ids, start_term=(row.get("start_term") or "").strip() or None)
+            except ValueError as e:
+                record = TranscriptRecord(student_id, error=f"Unreadable program ids: {e}")
+            if not student_id:
+                record.error = "Missing student_id"
+        code = (row.get("course_code") or "").strip()
+        if code and record.error is None:
+            record.courses.append((code, (row.get("term") or "").strip()))
+    if record is not None:
+        yield record
+
+
+def detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+# === Building ===
+
+def build_plan_state(record: TranscriptRecord, catalog: Catalog, programs: Sequence[Tuple[int, Program]],
+                     policy_engine: PolicyEngine) -> Tuple[bytes, List[str]]:
+    """
+    Serialized plan for one transcript: courses are added in term order, assigned with the
+    AutoAssigner, and the plan continues from the term after the last one on the transcript.
+    Courses the catalog does not have are left out and returned alongside the plan.
+    """
+    if not record.program_ids:
+        raise InvalidProgramError("No programs given")
+    unknown = [pid for pid in record.program_ids if not 0 <= pid < len(programs)]
+    if unknown:
+        raise InvalidProgramError(f"Unknown program ids: {unknown}")
+    db_ids = [programs[pid][0] for pid in record.program_ids]
+
+    skipped = [code for code, _ in record.courses if catalog.get_by_course_code(code) is None]
+    taken = sorted(((parse_term(term), code) for code, term in record.courses if code not in skipped),
+                   key=lambda item: term_ordinal(item[0]))
+    if record.start_term:
+        start = parse_term(record.start_term)
+    elif taken:
+        start = taken[0][0]
+    else:
+        start = Semester(DEFAULT_START_SEMESTER, DEFAULT_START_YEAR)
+
+    planner = AcademicPlanner(catalog, [programs[pid][1] for pid in record.program_ids], start, policy_engine)
+    planner.apply_course_operations([{"op": "add", "course_code": code} for _, code in taken])
+    planner.auto_assign()
+    if taken:
+        planner.student_state.set_current_semester(next_semester(taken[-1][0]))
+    return PlanState.from_planner(planner, db_ids).to_bytes(), skipped
+
+
+# Per-process state of pool workers, set once by _init_worker
+_worker_context: Optional[Tuple[Catalog, Sequence[Tuple[int, Program]], PolicyEngine]] = None
+
+
+def _init_worker(catalog: Catalog, programs: Sequence[Tuple[int, Program]], policy_config: Optional[list]) -> None:
+    global _worker_context
+    _worker_context = (catalog, programs, PolicyEngine(policy_config=policy_config) if policy_config is not None else PolicyEngine())
+    catalog_graph(catalog)
+
+
+ChunkResult = Tuple[str, Optional[bytes], Optional[str], List[str]]
+
+
+def _build_chunk(records: List[TranscriptRecord], context=None) -> List[ChunkResult]:
+    """(student_id, plan state, error, skipped course codes) per record; failures never escape the chunk."""
+    catalog, programs, policy_engine = context or _worker_context
+    results = []
+    for record in records:
+        try:
+            data, skipped = build_plan_state(record, catalog, programs, policy_engine)
+            results.append((record.student_id, data, None, skipped))
+        except EnrollmentError as e:
+            results.append((record.student_id, None, str(e), []))
+        except Exception as e:
+            results.append((record.student_id, None, f"{type(e).__name__}: {e}", []))
+    return results
+
+
+class TranscriptImporter:
+    """
+    Builds plans for a stream of transcripts against one catalog and program set.
+    Records are sent in chunks to a process pool whose workers each receive the catalog once and
+    keep it, its dependency graph and a policy engine for the whole run; the calling process only assigns plan ids
+    and stores the serialized plans through `save`. At most a few chunks per worker are in flight,
+    so the input is read as it is consumed. Per-student failures are reported and do not stop the run.
+    """
+
+    def __init__(self, catalog: Catalog, programs: Sequence[Tuple[int, Program]], save: Callable[[bytes], int],
+                 policy_config: Optional[list] = None, workers: int = IMPORT_WORKERS, chunk_size: int = IMPORT_CHUNK_SIZE):
+        """
+        Args:
+            catalog: Catalog every plan is built against
+            programs: (database id, Program) pairs in API id order
+            save: Stores one serialized plan and returns its plan id
+            policy_config: Overlap policies; the default policy file when omitted
+            workers: Worker processes; 0 = one per CPU, 1 = build in this process
+            chunk_size: Students per worker task
+        """
+        self.catalog = catalog
+        self.programs = list(programs)
+        self.save = save
+        self.policy_config = policy_config
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(chunk_size, 1)
+
+    def run(self, records: Iterable[TranscriptRecord]) -> Dict[str, Any]:
+        """
+        Returns:
+            Dictionary with the number of plans created, the plan id of every imported student,
+            the failures as {student_id, error}, the course codes left out of each imported student's
+            plan because the catalog does not have them, and the elapsed time and throughput
+        """
+        started = time.monotonic()
+        report: Dict[str, Any] = {"plans_created": 0, "plan_ids": {}, "failures": [], "skipped_courses": {}}
+        chunks = self._chunks(records, report)
+        if self.workers <= 1:
+            context = (self.catalog, self.programs, PolicyEngine(policy_config=self.policy_config) if self.policy_config is not None else PolicyEngine())
+            for chunk in chunks:
+                self._collect(_build_chunk(chunk, context), report)
+        else:
+            # Spawned rather than forked: the parent runs background refresher and cache flusher threads
+            with ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker,
+                                     initargs=(self.catalog, self.programs, self.policy_config)) as pool:
+                pending = {}
+                for chunk in chunks:
+                    pending[pool.submit(_build_chunk, chunk)] = chunk
+                    if len(pending) >= 2 * self.workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._finish(future, pending.pop(future), report)
+                for future in list(pending):
+                    self._finish(future, pending.pop(future), report)
+        elapsed = time.monotonic() - started
+        report["failed"] = len(report["failures"])
+        report["seconds"] = round(elapsed, 3)
+        report["plans_per_minute"] = round(report["plans_created"] * 60 / elapsed) if elapsed > 0 else None
+        return report
+
+    def _chunks(self, records: Iterable[TranscriptRecord], report: Dict[str, Any]) -> Iterator[List[TranscriptRecord]]:
+        chunk = []
+        for record in records:
+            if record.error is not None:
+                report["failures"].append({"student_id": record.student_id, "error": record.error})
+                continue
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _finish(self, future, chunk: List[TranscriptRecord], report: Dict[str, Any]) -> None:
+        try:
+            results = future.result()
+        except Exception as e:
+            # A worker died; the rest of the run continues on the remaining workers
+            logger.error(f"Transcript import worker failed: {e}")
+            results = [(record.student_id, None, f"Worker failed: {e}", []) for record in chunk]
+        self._collect(results, report)
+
+    def _collect(self, results: List[ChunkResult], report: Dict[str, Any]) -> None:
+        for student_id, data, error, skipped in results:
+            if data is None:
+                report["failures"].append({"student_id": student_id, "error": error})
+                continue
+            try:
+                report["plan_ids"][student_id] = self.save(data)
+            except Exception as e:
+                report["failures"].append({"student_id": student_id, "error": f"Could not store plan: {e}"})
+                continue
+            report["plans_created"] += 1
+            if skipped:
+                report["skipped_courses"][student_id] = skipped
@@ -1,2 +1,3 @@
 from .category import RequirementCategory
-from .program import Program
\ No newline at end of file
+from .program import Program
+from .registry import ProgramRegistry, program_registry
\ No newline at end of file
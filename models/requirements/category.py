@@ -2,6 +2,7 @@ from typing import List, Optional, Sequence, Dict, Tuple
 from models.requirements.requirement_types.requirement import Requirement
 from models.requirements.requirement_types.course_filter import CourseFilterRequirement
 from models.requirements.requirement_types.course_options import CourseOptionsRequirement
+from models.requirements.requirement_types.evaluation import RequirementEvaluator
 from models.requirements.restrictions.group import RestrictionGroup
 from models.courses.course import Course
 from core.exceptions import InvalidCategoryError, InvalidCreditsError, EnrollmentError
@@ -24,7 +25,8 @@ class RequirementCategory:
         self.restrictions = restrictions
         self.notes = notes
 
-    def progress(self, completed_courses: List[Course], requirement_assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None) -> dict:
+    def progress(self, completed_courses: List[Course], requirement_assignments: Optional[Dict[str, List[Tuple[str, str]]]] = None, evaluator: Optional[RequirementEvaluator] = None) -> dict:
+        evaluator = evaluator or RequirementEvaluator()
         earned = 0
         used_courses = set()
         
@@ -45,7 +47,7 @@ class RequirementCategory:
         
         for req in self.requirements:
             try:
-                matching = req.get_completed_courses(assigned_courses)
+                matching = evaluator.evaluate(req, assigned_courses).matched
                 # Only consider unused courses
                 unused_matching = [course for course in matching if course.get_course_code() not in used_courses]
                 credits_needed = getattr(req, 'min_credits', None)
@@ -1,6 +1,7 @@
 from typing import List, Optional, Literal, Dict
 from .category import RequirementCategory
 from models.courses.course import Course
+from models.requirements.requirement_types.evaluation import RequirementEvaluator
 from core.exceptions import InvalidProgramError, InvalidCategoryError
 
 class Program:
@@ -36,7 +37,8 @@ class Program:
     def is_valid(self) -> bool:
         return self.total_required_credits() <= self.total_credits
     
-    def progress(self, completed_courses: List[Course], requirement_assignments: Optional[Dict[str, list]] = None) -> dict:
+    def progress(self, completed_courses: List[Course], requirement_assignments: Optional[Dict[str, list]] = None, evaluator: Optional[RequirementEvaluator] = None) -> dict:
+        evaluator = evaluator or RequirementEvaluator()
         category_progress = []
         total_earned = 0
         all_categories_complete = True
@@ -53,9 +55,9 @@ class Program:
                             if prog == self.name and cat == category.category:
                                 assigned_courses.append(course)
                                 break
-                cat_progress = category.progress(assigned_courses, None)
+                cat_progress = category.progress(assigned_courses, None, evaluator)
             else:
-                cat_progress = category.progress(completed_courses, None)
+                cat_progress = category.progress(completed_courses, None, evaluator)
             category_progress.append(cat_progress)
             total_earned += cat_progress.get("earned_credits", 0)
             if not cat_progress.get("complete", False):
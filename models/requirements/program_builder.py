@@ -1,4 +1,6 @@
 import json
+from typing import List, Optional, Iterable
+from sqlalchemy.orm import selectinload
 from .program import Program
 from .category import RequirementCategory
 from .requirement_types import CourseListRequirement, CourseOptionsRequirement, CourseFilterRequirement, CompoundRequirement
@@ -88,9 +90,23 @@ class ProgramBuilder:
         )
 
     @staticmethod
-    def build_programs_from_db():
+    def query_programs(session, program_ids: Optional[Iterable[int]] = None):
+        """
+        Query programs with their categories and requirements eagerly loaded
+        (one SELECT per table instead of one per relationship access), ordered by id.
+        """
+        query = session.query(ORMProgram).options(
+            selectinload(ORMProgram.categories).selectinload(ORMCategory.requirements)
+        )
+        if program_ids is not None:
+            query = query.filter(ORMProgram.id.in_(list(program_ids)))
+        return query.order_by(ORMProgram.id).all()
+
+    @staticmethod
+    def build_programs_from_db(program_ids: Optional[Iterable[int]] = None) -> List[Program]:
         session = SessionLocal()
-        orm_programs = session.query(ORMProgram).all()
-        programs = [ProgramBuilder.build_program_from_db(prog) for prog in orm_programs]
-        session.close()
-        return programs 
\ No newline at end of file
+        try:
+            orm_programs = ProgramBuilder.query_programs(session, program_ids)
+            return [ProgramBuilder.build_program_from_db(prog) for prog in orm_programs]
+        finally:
+            session.close() 
\ No newline at end of file
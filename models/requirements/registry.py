@@ -0,0 +1,256 @@
+import hashlib
+import json
+import threading
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from .program import Program
+from .program_builder import ProgramBuilder
+from db.database import SessionLocal
+from db.models.program import Program as ORMProgram
+from config.config import PROGRAM_REFRESH_INTERVAL
+from core.refresh import BackgroundRefresher
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Cheap fingerprint of the three program tables, used to decide whether a reload is needed at all.
+PROGRAM_VERSION_QUERY = text(
+    "SELECT "
+    "(SELECT coalesce(md5(string_agg(md5(p::text), '' ORDER BY p.id)), '') FROM programs p), "
+    "(SELECT coalesce(md5(string_agg(md5(c::text), '' ORDER BY c.id)), '') FROM requirement_categories c), "
+    "(SELECT coalesce(md5(string_agg(md5(r::text), '' ORDER BY r.id)), '') FROM requirements r)"
+)
+
+def probe_program_version() -> str:
+    session = SessionLocal()
+    try:
+        return ":".join(session.execute(PROGRAM_VERSION_QUERY).one())
+    finally:
+        session.close()
+
+def load_program_ids() -> List[int]:
+    session = SessionLocal()
+    try:
+        return [row[0] for row in session.query(ORMProgram.id).order_by(ORMProgram.id).all()]
+    finally:
+        session.close()
+
+def load_orm_programs(program_ids: Optional[Iterable[int]] = None) -> List[ORMProgram]:
+    session = SessionLocal()
+    try:
+        return ProgramBuilder.query_programs(session, program_ids)
+    finally:
+        session.close()
+
+def program_fingerprint(prog_orm) -> str:
+    """Content hash of a program row together with its category and requirement rows."""
+    payload = {
+        'name': prog_orm.name,
+        'type': prog_orm.type,
+        'total_credits': prog_orm.total_credits,
+        'notes': prog_orm.notes,
+        'school': prog_orm.school,
+        'categories': [
+            {
+                'category': cat.category,
+                'min_credits': cat.min_credits,
+                'notes': cat.notes,
+                'requirements': [
+                    {'type': req.type, 'data': req.data, 'min_credits': req.min_credits, 'notes': req.notes}
+                    for req in cat.requirements
+                ]
+            }
+            for cat in prog_orm.categories
+        ]
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ProgramEntry:
+    """
+    A built program together with the database id and content hash it was built from.
+    """
+
+    def __init__(self, db_id: int, fingerprint: str, program: Program):
+        self.db_id = db_id
+        self.fingerprint = fingerprint
+        self.program = program
+
+    def __repr__(self):
+        return f"<ProgramEntry id={self.db_id} program={self.program.name} fingerprint={self.fingerprint[:8]}>"
+
+
+class ProgramRegistry:
+    """
+    Process-wide cache of built Program trees.
+    Programs are loaded with eager queries, built once per content hash and shared read-only
+    by every request and planner. Reloads only rebuild programs whose rows changed.
+    API program ids are positions in the id-ordered program list.
+    """
+
+    def __init__(self, loader: Callable[[Optional[Iterable[int]]], List[Any]] = load_orm_programs,
+                 id_loader: Callable[[], List[int]] = load_program_ids,
+                 version_probe: Callable[[], str] = probe_program_version,
+                 builder: Callable[[Any], Program] = ProgramBuilder.build_program_from_db,
+                 refresh_interval: float = PROGRAM_REFRESH_INTERVAL):
+        self._loader = loader
+        self._id_loader = id_loader
+        self._probe = version_probe
+        self._builder = builder
+        self._lock = threading.RLock()
+        self._entries: Dict[int, ProgramEntry] = {}
+        self._by_fingerprint: Dict[str, Program] = {}
+        self._order: Optional[Tuple[int, ...]] = None
+        self._programs: Optional[Tuple[Program, ...]] = None
+        self._version: Optional[str] = None
+        self._refresher = BackgroundRefresher(self.refresh, refresh_interval, name="program-refresher")
+        self.generation = 0
+        self.hits = 0
+        self.builds = 0
+        self.reloads = 0
+        self.probe_failures = 0
+
+    # === Read access ===
+
+    def get_all(self) -> Tuple[Program, ...]:
+        programs = self._programs
+        if programs is not None:
+            self.hits += 1
+            return programs
+        with self._lock:
+            if self._programs is None:
+                self._version = self._probe_version()
+                self._load(None)
+        self._refresher.start()
+        return self._programs
+
+    def get_many(self, program_ids: Iterable[int]) -> List[Program]:
+        """Programs at the given API ids, loading only those programs if the full set is not cached yet."""
+        program_ids = list(program_ids)
+        programs = self._programs
+        if programs is not None:
+            self.hits += 1
+            return [programs[pid] for pid in program_ids if 0 <= pid < len(programs)]
+        with self._lock:
+            if self._order is None:
+                self._order = tuple(self._id_loader())
+            wanted = [self._order[pid] for pid in program_ids if 0 <= pid < len(self._order)]
+            missing = [db_id for db_id in wanted if db_id not in self._entries]
+            if missing:
+                self._load(missing)
+            return [self._entries[db_id].program for db_id in wanted if db_id in self._entries]
+
+    def db_ids(self, program_ids: Iterable[int]) -> List[int]:
+        """Database ids of the programs at the given API ids; unknown API ids are skipped."""
+        with self._lock:
+            if self._order is None:
+                self._order = tuple(self._id_loader())
+            return [self._order[pid] for pid in program_ids if 0 <= pid < len(self._order)]
+
+    def get_by_db_ids(self, db_ids: Iterable[int]) -> List[Program]:
+        """Programs by database id, loading only those not built yet. Ids that no longer exist are skipped."""
+        db_ids = list(db_ids)
+        with self._lock:
+            missing = [db_id for db_id in db_ids if db_id not in self._entries]
+            if missing:
+                self._load(missing)
+            return [self._entries[db_id].program for db_id in db_ids if db_id in self._entries]
+
+    def entries(self) -> Tuple[ProgramEntry, ...]:
+        self.get_all()
+        with self._lock:
+            return tuple(self._entries[db_id] for db_id in self._order)
+
+    # === Reloading ===
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload if the program tables changed. Returns True if any program was rebuilt or removed."""
+        version = self._probe_version()
+        if not force and self._programs is not None and (version is None or version == self._version):
+            return False
+        with self._lock:
+            generation = self.generation
+            self._load(None)
+            self._version = version
+            return self.generation != generation
+
+    def reload_program(self, db_id: int) -> bool:
+        """Reload a single program by database id. Returns True if it changed."""
+        with self._lock:
+            generation = self.generation
+            if not self._loader([db_id]):
+                if self._remove([db_id]):
+                    self.generation += 1
+                if self._order is not None:
+                    self._order = tuple(pid for pid in self._order if pid != db_id)
+            else:
+                self._load([db_id])
+                if self._order is not None and db_id not in self._order:
+                    self._order = tuple(sorted(self._order + (db_id,)))
+            self._publish()
+            return self.generation != generation
+
+    def _probe_version(self) -> Optional[str]:
+        try:
+            return self._probe()
+        except Exception as e:
+            self.probe_failures += 1
+            logger.error(f"Program version probe failed: {e}")
+            return None
+
+    def _load(self, program_ids: Optional[List[int]]) -> None:
+        loaded = self._loader(program_ids)
+        changed = False
+        for prog_orm in loaded:
+            fingerprint = program_fingerprint(prog_orm)
+            entry = self._entries.get(prog_orm.id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                continue
+            program = self._by_fingerprint.get(fingerprint)
+            if program is None:
+                program = self._builder(prog_orm)
+                self._by_fingerprint[fingerprint] = program
+                self.builds += 1
+            self._entries[prog_orm.id] = ProgramEntry(prog_orm.id, fingerprint, program)
+            changed = True
+        if program_ids is None:
+            ids = [prog_orm.id for prog_orm in loaded]
+            changed = self._remove(set(self._entries) - set(ids)) or changed
+            self._order = tuple(ids)
+            self._publish()
+        if changed:
+            self.generation += 1
+        self.reloads += 1
+
+    def _remove(self, db_ids: Iterable[int]) -> bool:
+        removed = False
+        for db_id in db_ids:
+            if self._entries.pop(db_id, None) is not None:
+                removed = True
+        if removed:
+            live = {entry.fingerprint for entry in self._entries.values()}
+            self._by_fingerprint = {fp: p for fp, p in self._by_fingerprint.items() if fp in live}
+        return removed
+
+    def _publish(self) -> None:
+        # Swap in a new tuple so requests holding the previous view are unaffected.
+        if self._order is not None and all(db_id in self._entries for db_id in self._order):
+            self._programs = tuple(self._entries[db_id].program for db_id in self._order)
+
+    def stop(self) -> None:
+        self._refresher.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self._version,
+            "generation": self.generation,
+            "programs": len(self._entries),
+            "hits": self.hits,
+            "builds": self.builds,
+            "reloads": self.reloads,
+            "probe_failures": self.probe_failures,
+            "refresher_running": self._refresher.is_running(),
+        }
+
+
+program_registry = ProgramRegistry()
@@ -0,0 +1,89 @@
+import threading
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.courses.catalog import Catalog
+from models.requirements.program import Program
+from models.requirements.requirement_types.requirement import Requirement
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# course_code -> ((category name, requirement), ...) for one program
+Postings = Dict[str, Tuple[Tuple[str, Requirement], ...]]
+
+_lock = threading.Lock()
+# catalog snapshot -> program -> postings. Weak keys drop the postings of a replaced catalog
+# snapshot or program, so a reloaded program is re-indexed on its own and nothing else is rebuilt.
+_postings: "weakref.WeakKeyDictionary[Catalog, weakref.WeakKeyDictionary[Program, Postings]]" = weakref.WeakKeyDictionary()
+
+def build_postings(program: Program, catalog: Catalog) -> Postings:
+    """Every catalog course code that can satisfy a requirement of the program, with the requirements it satisfies."""
+    postings: Dict[str, List[Tuple[str, Requirement]]] = {}
+    for category in program.categories:
+        for requirement in category.requirements:
+            try:
+                possible = requirement.get_possible_courses(catalog.courses)
+            except Exception as e:
+                logger.error(f"Could not index requirement in {program.name} - {category.category}: {e}")
+                continue
+            for course in possible:
+                code = course.get_course_code()
+                if code:
+                    postings.setdefault(code, []).append((category.category, requirement))
+    return {code: tuple(entries) for code, entries in postings.items()}
+
+def program_postings(program: Program, catalog: Catalog) -> Postings:
+    """Postings of a program against a catalog snapshot, built once and shared by every planner."""
+    by_program = _postings.get(catalog)
+    if by_program is not None:
+        postings = by_program.get(program)
+        if postings is not None:
+            return postings
+    postings = build_postings(program, catalog)
+    with _lock:
+        by_program = _postings.get(catalog)
+        if by_program is None:
+            by_program = weakref.WeakKeyDictionary()
+            _postings[catalog] = by_program
+        return by_program.setdefault(program, postings)
+
+
+class RequirementIndex:
+    """
+    Inverted index from course code to the (program, category, requirement) triples it can satisfy,
+    over a fixed set of programs. Lookups are dictionary hits into per-program postings.
+    """
+
+    def __init__(self, programs: Iterable[Program], catalog: Catalog):
+        self.catalog = catalog
+        self.programs = list(programs)
+        self._postings = [(program, program_postings(program, catalog)) for program in self.programs]
+
+    def __contains__(self, course_code: str) -> bool:
+        return self.catalog.get_by_course_code(course_code) is not None
+
+    def matches(self, course_code: str) -> List[Tuple[Program, str, Requirement]]:
+        """Every (program, category name, requirement) the course can count toward."""
+        return [
+            (program, category, requirement)
+            for program, postings in self._postings
+            for category, requirement in postings.get(course_code, ())
+        ]
+
+    def categories_for(self, course_code: str) -> List[Tuple[str, str]]:
+        """Distinct (program name, category name) pairs the course can be assigned to, in program order."""
+        seen = []
+        for program, category, _ in self.matches(course_code):
+            pair = (program.name, category)
+            if pair not in seen:
+                seen.append(pair)
+        return seen
+
+    def satisfies(self, course_code: str, category_name: str, program_name: Optional[str] = None) -> bool:
+        for program, postings in self._postings:
+            if program_name is not None and program.name != program_name:
+                continue
+            for category, _ in postings.get(course_code, ()):
+                if category == category_name:
+                    return True
+        return False
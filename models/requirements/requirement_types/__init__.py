@@ -2,4 +2,5 @@ from .requirement import Requirement
 from .course_list import CourseListRequirement
 from .course_options import CourseOptionsRequirement
 from .course_filter import CourseFilterRequirement
-from .compound import CompoundRequirement
\ No newline at end of file
+from .compound import CompoundRequirement
+from .evaluation import RequirementEvaluator, RequirementResult
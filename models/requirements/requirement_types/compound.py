@@ -1,25 +1,12 @@
 from models.courses.course import Course
 from typing import List, Optional, cast
 from .requirement import Requirement
+from .evaluation import CompoundPlan
 from .course_list import CourseListRequirement
 from .course_options import CourseOptionsRequirement
 from .course_filter import CourseFilterRequirement
-import redis
-from config.config import REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD
-from core.exceptions import InvalidRequirementError, EnrollmentError
-
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD)
-
-def _req_cache_key(prefix, op, options, completed_courses):
-    completed = ','.join(sorted([c.get_course_code() for c in completed_courses]))
-    options_str = ','.join([str(opt) for opt in options])
-    return f"{prefix}:{op}|options:{options_str}|completed:{completed}"
-
-def invalidate_requirement_cache():
-    for pattern in ["req_credits:*", "req_completed:*"]:
-        keys = redis_client.keys(pattern)
-        if isinstance(keys, (list, tuple, set)) and keys:
-            redis_client.delete(*keys)
+from core.cache import requirement_credits_cache, requirement_completed_cache, course_set_fingerprint, rehydrate_courses
+from core.exceptions import InvalidRequirementError
 
 class CompoundRequirement(Requirement):
     """
@@ -41,39 +28,37 @@ class CompoundRequirement(Requirement):
             f"  - {opt.describe()}" for opt in self.options
         )
 
+    def cache_parts(self) -> tuple:
+        # Options are identified by their own definitions, not object identity
+        return (self.op,) + tuple(opt.cache_id() for opt in self.options)
+
+    def compile_plan(self):
+        return CompoundPlan(self.op, [opt.evaluation_plan() for opt in self.options])
+
     def satisfied_credits(self, completed_courses: List[Course]) -> int:
-        key = _req_cache_key('req_credits', self.op, self.options, completed_courses)
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            try:
-                return int(cached.decode())
-            except EnrollmentError:
-                invalidate_requirement_cache()
+        key = requirement_credits_cache.key(self.cache_id(), course_set_fingerprint(completed_courses))
+        cached = requirement_credits_cache.get(key)
+        if cached is not None:
+            return cached
         if self.op == "AND":
             total_credits = 0
             for opt in self.options:
                 total_credits += opt.satisfied_credits(completed_courses)
-            redis_client.set(key, total_credits)
-            invalidate_requirement_cache()
+            requirement_credits_cache.set(key, total_credits)
             return total_credits
         else:  # OR logic (default, backward compatible)
             max_credits = 0
             for opt in self.options:
                 earned_credits = opt.satisfied_credits(completed_courses)
                 max_credits = max(max_credits, earned_credits)
-            redis_client.set(key, max_credits)
-            invalidate_requirement_cache()
+            requirement_credits_cache.set(key, max_credits)
             return max_credits
 
     def get_completed_courses(self, completed_courses: List[Course]) -> List[Course]:
-        key = _req_cache_key('req_completed', self.op, self.options, completed_courses)
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            import pickle
-            try:
-                return pickle.loads(cached)
-            except EnrollmentError:
-                invalidate_requirement_cache()
+        key = requirement_completed_cache.key(self.cache_id(), course_set_fingerprint(completed_courses))
+        cached = requirement_completed_cache.get(key)
+        if cached is not None:
+            return rehydrate_courses(cached, completed_courses)
         if self.op == "AND":
             all_courses = []
             seen = set()
@@ -83,9 +68,7 @@ class CompoundRequirement(Requirement):
                     if code not in seen:
                         all_courses.append(course)
                         seen.add(code)
-            import pickle
-            redis_client.set(key, pickle.dumps(all_courses))
-            invalidate_requirement_cache()
+            requirement_completed_cache.set(key, tuple(c.get_course_code() for c in all_courses))
             return all_courses
         else:  # OR logic (default, backward compatible)
             best_option_courses = []
@@ -96,9 +79,7 @@ class CompoundRequirement(Requirement):
                 if option_credits > max_credits:
                     max_credits = option_credits
                     best_option_courses = option_courses
-            import pickle
-            redis_client.set(key, pickle.dumps(best_option_courses))
-            invalidate_requirement_cache()
+            requirement_completed_cache.set(key, tuple(c.get_course_code() for c in best_option_courses))
             return best_option_courses
 
     def get_possible_courses(self, courses: List[Course]) -> List[Course]:
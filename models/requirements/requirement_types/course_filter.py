@@ -1,23 +1,11 @@
 from typing import List, Optional, Union, cast
 from .requirement import Requirement
+from .evaluation import FilterPlan
 from models.courses.course import Course
-import redis
-from config.config import REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD
+from models.courses.columns import columns_of
+from core.cache import requirement_credits_cache, requirement_completed_cache, course_set_fingerprint, rehydrate_courses
 from core.exceptions import InvalidRequirementError, InvalidCreditsError, EnrollmentError
 
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD)
-
-def _req_cache_key(prefix, subject, tags, min_level, max_level, min_credits, completed_courses):
-    completed = ','.join(sorted([c.get_course_code() for c in completed_courses]))
-    tags_str = ','.join(sorted(tags)) if tags else ''
-    return f"{prefix}:{subject}|tags:{tags_str}|minlvl:{min_level}|maxlvl:{max_level}|mincred:{min_credits}|completed:{completed}"
-
-def invalidate_requirement_cache():
-    for pattern in ["req_credits:*", "req_completed:*"]:
-        keys = redis_client.keys(pattern)
-        if isinstance(keys, (list, tuple, set)) and keys:
-            redis_client.delete(*keys)
-
 class CourseFilterRequirement(Requirement):
     """
     Requirement defined by course attributes (not explicit codes)
@@ -60,14 +48,17 @@ class CourseFilterRequirement(Requirement):
             parts.append(f"Note: {self.note}")
         return f"Take at least {self.min_credits} credits from courses matching: " + ", ".join(parts)
     
+    def cache_parts(self) -> tuple:
+        return (self.subject, tuple(sorted(self.tags)), self.min_level, self.max_level, self.min_credits)
+
+    def compile_plan(self):
+        return FilterPlan(self.subject, self.tags, self.min_level, self.max_level, self.min_credits)
+
     def satisfied_credits(self, completed_courses: List[Course]) -> int:
-        key = _req_cache_key('req_credits', self.subject, self.tags, self.min_level, self.max_level, self.min_credits, completed_courses)
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            try:
-                return int(cached.decode())
-            except EnrollmentError:
-                invalidate_requirement_cache()
+        key = requirement_credits_cache.key(self.cache_id(), course_set_fingerprint(completed_courses))
+        cached = requirement_credits_cache.get(key)
+        if cached is not None:
+            return cached
         total = 0
         for course in completed_courses:
             try:
@@ -84,19 +75,14 @@ class CourseFilterRequirement(Requirement):
             except EnrollmentError as e:
                 print(f"Warning: Error processing course {course}: {e}")
                 continue
-        redis_client.set(key, total)
-        invalidate_requirement_cache()
+        requirement_credits_cache.set(key, total)
         return total
 
     def get_completed_courses(self, completed_courses: List[Course]) -> List[Course]:
-        key = _req_cache_key('req_completed', self.subject, self.tags, self.min_level, self.max_level, self.min_credits, completed_courses)
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            import pickle
-            try:
-                return pickle.loads(cached)
-            except EnrollmentError:
-                invalidate_requirement_cache()
+        key = requirement_completed_cache.key(self.cache_id(), course_set_fingerprint(completed_courses))
+        cached = requirement_completed_cache.get(key)
+        if cached is not None:
+            return rehydrate_courses(cached, completed_courses)
         matching = []
         for course in completed_courses:
             try:
@@ -113,16 +99,20 @@ class CourseFilterRequirement(Requirement):
             except EnrollmentError as e:
                 print(f"Warning: Error processing course {course}: {e}")
                 continue
-        import pickle
-        redis_client.set(key, pickle.dumps(matching))
-        invalidate_requirement_cache()
+        requirement_completed_cache.set(key, tuple(c.get_course_code() for c in matching))
         return matching
 
     def get_possible_courses(self, courses: List[Course]) -> List[Course]:
         """
         Returns all matching courses from the provided list, applying self.restrictions if present.
+        The catalog's own course list is filtered as one mask over its columns.
         """
-        filtered = []
+        columns = columns_of(courses)
+        if columns is not None:
+            filtered = columns.select(self.evaluation_plan().mask(columns) & columns.has_number_mask())
+            courses = ()
+        else:
+            filtered = []
         for course in courses:
             try:
                 if self.subject and course.subject_code != self.subject:
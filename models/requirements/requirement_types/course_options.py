@@ -1,19 +1,7 @@
 from .requirement import Requirement
-import redis
-from config.config import REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_PASSWORD
-from core.exceptions import InvalidRequirementError, EnrollmentError
-
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, password=REDIS_PASSWORD)
-
-def _req_cache_key(prefix, req_id, completed_courses):
-    completed = ','.join(sorted([c.get_course_code() for c in completed_courses]))
-    return f"{prefix}:{req_id}|completed:{completed}"
-
-def invalidate_requirement_cache():
-    for pattern in ["req_credits:*", "req_completed:*"]:
-        keys = redis_client.keys(pattern)
-        if isinstance(keys, (list, tuple, set)) and keys:
-            redis_client.delete(*keys)
+from .evaluation import CodeSetPlan
+from core.cache import requirement_credits_cache, requirement_completed_cache, course_set_fingerprint, rehydrate_courses
+from core.exceptions import InvalidRequirementError
 
 class CourseOptionsRequirement(Requirement):
     """
@@ -32,37 +20,33 @@ class CourseOptionsRequirement(Requirement):
     def describe(self):
         return f"Choose at least {self.min_required} from {', '.join(self.options)}"
     
+    def cache_parts(self):
+        return tuple(sorted(self.options))
+
+    def compile_plan(self):
+        return CodeSetPlan(self.options, self.min_required)
+
     def satisfied_credits(self, completed_courses):
-        key = _req_cache_key('req_credits', ','.join(sorted(self.options)), completed_courses)
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            try:
-                return int(cached.decode())
-            except EnrollmentError:
-                invalidate_requirement_cache()
+        key = requirement_credits_cache.key(self.cache_id(), course_set_fingerprint(completed_courses))
+        cached = requirement_credits_cache.get(key)
+        if cached is not None:
+            return cached
         matching = [
             (course, course.get_credit_hours())
             for course in completed_courses
             if course.get_course_code() in self.options
         ]
         result = sum(ch for c, ch in matching)
-        redis_client.set(key, result)
-        invalidate_requirement_cache()
+        requirement_credits_cache.set(key, result)
         return result
 
     def get_completed_courses(self, completed_courses):
-        key = _req_cache_key('req_completed', ','.join(sorted(self.options)), completed_courses)
-        cached = redis_client.get(key)
-        if isinstance(cached, bytes):
-            import pickle
-            try:
-                return pickle.loads(cached)
-            except EnrollmentError:
-                invalidate_requirement_cache()
+        key = requirement_completed_cache.key(self.cache_id(), course_set_fingerprint(completed_courses))
+        cached = requirement_completed_cache.get(key)
+        if cached is not None:
+            return rehydrate_courses(cached, completed_courses)
         result = [course for course in completed_courses if course.get_course_code() in self.options]
-        import pickle
-        redis_client.set(key, pickle.dumps(result))
-        invalidate_requirement_cache()
+        requirement_completed_cache.set(key, tuple(c.get_course_code() for c in result))
         return result
 
     def get_possible_courses(self, courses):
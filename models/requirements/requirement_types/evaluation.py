@@ -0,0 +1,164 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from models.courses.course import Course
+from models.courses.columns import CourseColumns
+from core.exceptions import EnrollmentError, RequirementNotImplementedError
+
+
+class RequirementResult:
+    """
+    Outcome of evaluating one requirement against a list of courses.
+    credits and matched agree with satisfied_credits() and get_completed_courses();
+    satisfied is whether the requirement counts as met on its own, and option_satisfied
+    whether it counts as met when it is one option of a CompoundRequirement.
+    """
+
+    __slots__ = ("credits", "matched", "satisfied", "option_satisfied")
+
+    def __init__(self, credits: int, matched: List[Course], satisfied: bool, option_satisfied: bool):
+        self.credits = credits
+        self.matched = matched
+        self.satisfied = satisfied
+        self.option_satisfied = option_satisfied
+
+    def __repr__(self):
+        return f"<RequirementResult credits={self.credits} matched={len(self.matched)} satisfied={self.satisfied}>"
+
+
+class EvaluationPlan:
+    """
+    A requirement compiled for evaluation: everything derivable from the definition alone
+    (code sets, filter bounds, child plans) is computed once, so evaluating a course list
+    is a single pass that yields credits, matched courses and satisfaction together.
+    """
+
+    def evaluate(self, courses: Sequence[Course], evaluator: "RequirementEvaluator") -> RequirementResult:
+        raise RequirementNotImplementedError("Subclasses must implement evaluate()")
+
+
+class CodeSetPlan(EvaluationPlan):
+    """CourseListRequirement (every code required) or CourseOptionsRequirement (min_required distinct codes)."""
+
+    def __init__(self, codes: Sequence[str], min_required: Optional[int] = None):
+        self.codes = frozenset(codes)
+        # None means every listed course is required
+        self.min_required = min_required
+
+    def evaluate(self, courses, evaluator):
+        codes = self.codes
+        matched = [course for course in courses if course.get_course_code() in codes]
+        credits = sum(course.get_credit_hours() for course in matched)
+        present = {course.get_course_code() for course in matched}
+        if self.min_required is None:
+            satisfied = len(present) == len(codes)
+        else:
+            satisfied = len(present) >= self.min_required
+        return RequirementResult(credits, matched, satisfied, satisfied)
+
+
+class FilterPlan(EvaluationPlan):
+    """CourseFilterRequirement: attribute predicates with the bounds and tag set resolved up front."""
+
+    def __init__(self, subject: Optional[str], tags: Sequence[str], min_level: Optional[int],
+                 max_level: Optional[int], min_credits: Optional[int]):
+        self.subject = subject or None
+        self.tags = frozenset(tags)
+        self.min_level = min_level or None
+        self.max_level = max_level or None
+        self.min_credits = min_credits
+
+    def matches(self, course: Course) -> bool:
+        if self.subject and course.subject_code != self.subject:
+            return False
+        if self.tags and self.tags.isdisjoint(course.get_axle_requirements()):
+            return False
+        level = course.level
+        if self.min_level and (level is None or level < self.min_level):
+            return False
+        if self.max_level and (level is None or level > self.max_level):
+            return False
+        return True
+
+    def mask(self, columns: CourseColumns) -> np.ndarray:
+        """matches() for every row of the columns at once."""
+        mask = columns.all()
+        if self.subject:
+            mask &= columns.subject_mask(self.subject)
+        if self.tags:
+            mask &= columns.tag_mask(self.tags)
+        if self.min_level or self.max_level:
+            mask &= columns.level_range_mask(self.min_level, self.max_level)
+        return mask
+
+    def evaluate(self, courses, evaluator):
+        matched = []
+        credits = 0
+        for course in courses:
+            try:
+                if self.matches(course):
+                    credits += course.get_credit_hours()
+                    matched.append(course)
+            except EnrollmentError as e:
+                print(f"Warning: Error processing course {course}: {e}")
+        # Standalone filters count once any credit matches; the category total enforces the rest
+        option_satisfied = credits >= self.min_credits if self.min_credits is not None else credits > 0
+        return RequirementResult(credits, matched, credits > 0, option_satisfied)
+
+
+class CompoundPlan(EvaluationPlan):
+    """CompoundRequirement: AND sums its options, OR keeps the best one."""
+
+    def __init__(self, op: str, options: Sequence[EvaluationPlan]):
+        self.op = op
+        self.options = tuple(options)
+
+    def evaluate(self, courses, evaluator):
+        results = [evaluator.evaluate_plan(option, courses) for option in self.options]
+        if self.op == "AND":
+            credits = sum(result.credits for result in results)
+            matched = []
+            seen = set()
+            for result in results:
+                for course in result.matched:
+                    code = course.get_course_code()
+                    if code not in seen:
+                        matched.append(course)
+                        seen.add(code)
+        else:
+            credits = max((result.credits for result in results), default=0)
+            matched = []
+            best = 0
+            for result in results:
+                option_credits = sum(course.get_credit_hours() for course in result.matched)
+                if option_credits > best:
+                    best = option_credits
+                    matched = result.matched
+        satisfied = any(result.option_satisfied for result in results)
+        return RequirementResult(credits, matched, satisfied, credits > 0)
+
+
+class RequirementEvaluator:
+    """
+    Evaluates compiled requirement plans and memoizes the results by (plan, course list).
+    Create one per request or planning call and pass it down, so a requirement reached through
+    category progress, program progress and unmet-requirement checks is evaluated once.
+    """
+
+    def __init__(self):
+        self._memo: Dict[Tuple[int, Tuple[str, ...]], RequirementResult] = {}
+        self.hits = 0
+        self.evaluations = 0
+
+    def evaluate(self, requirement, courses: Sequence[Course]) -> RequirementResult:
+        return self.evaluate_plan(requirement.evaluation_plan(), courses)
+
+    def evaluate_plan(self, plan: EvaluationPlan, courses: Sequence[Course]) -> RequirementResult:
+        key = (id(plan), tuple(course.get_course_code() for course in courses))
+        result = self._memo.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        result = plan.evaluate(courses, self)
+        self._memo[key] = result
+        self.evaluations += 1
+        return result
@@ -1,6 +1,7 @@
 from typing import List, Optional, Union, Any
 from models.courses.course import Course
 from core.exceptions import RequirementNotImplementedError
+from core.cache import fingerprint
 
 class Requirement:
     """
@@ -12,6 +13,29 @@ class Requirement:
         # Example: if restrictions is not None and not isinstance(restrictions, (RestrictionGroup, ...)):
         #     raise ValueError("restrictions must be a valid restriction group or None")
     
+    def cache_id(self) -> str:
+        """Stable hash of the requirement definition, used to key cached results."""
+        cache_id = getattr(self, '_cache_id', None)
+        if cache_id is None:
+            cache_id = fingerprint(type(self).__name__, *self.cache_parts())
+            self._cache_id = cache_id
+        return cache_id
+
+    def cache_parts(self) -> tuple:
+        """The fields that determine satisfied_credits() and get_completed_courses()."""
+        raise RequirementNotImplementedError("Subclasses must implement cache_parts()")
+
+    def evaluation_plan(self):
+        """The requirement compiled into an EvaluationPlan, built on first use."""
+        plan = getattr(self, '_plan', None)
+        if plan is None:
+            plan = self.compile_plan()
+            self._plan = plan
+        return plan
+
+    def compile_plan(self):
+        raise RequirementNotImplementedError("Subclasses must implement compile_plan()")
+
     def describe(self) -> str:
         raise RequirementNotImplementedError("Subclasses must implement describe()")
     
@@ -0,0 +1,30 @@
+from models.courses.course import Course
+
+
+def make_course(code, credits=3, source=None, **fields):
+    """
+    A Course for tests. Subject and number come from a "CS 1101" style code and the level from the
+    number's first digit; fields (level, axle, prerequisites or prereqs, description, ...) override the row.
+    """
+    subject, _, number = code.partition(' ')
+    data = {
+        'course_code': code,
+        'title': f"Title {code}",
+        'subject_code': subject if number else None,
+        'course_number': number or None,
+        'level': int(number[0]) * 1000 if number[:1].isdigit() else None,
+        'credits': credits,
+    }
+    data.update(fields)
+    return Course(data, source)
+
+
+class MockCatalog:
+    """Just the lookup DependencyGraph needs, without building the Catalog indexes."""
+
+    def __init__(self, courses):
+        self.courses = courses
+        self._by_code = {c.course_code: c for c in courses}
+
+    def get_by_course_code(self, code):
+        return self._by_code.get(code)
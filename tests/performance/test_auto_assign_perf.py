@@ -0,0 +1,31 @@
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+
+client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def finished_plan_id():
+    response = client.get("/programs")
+    assert response.status_code == 200
+    program_ids = [p["id"] for p in response.json()][:2]
+    if len(program_ids) < 2:
+        pytest.skip("Need two programs for a double major.")
+    response = client.post("/plans", json={"program_ids": program_ids, "start_semester": "Fall", "year": 2024})
+    assert response.status_code == 200
+    plan_id = response.json()["id"]
+    schedule = client.get(f"/plans/{plan_id}/schedule").json()
+    # Record the scheduled courses as completed without assignments so auto-assignment has everything to place
+    courses = {code: [] for term in schedule["semesters"] for code in term["courses"]}
+    response = client.post(f"/plans/{plan_id}/add_completed_course", json=courses)
+    assert response.status_code == 200
+    return plan_id
+
+
+def test_double_major_auto_assign(benchmark, finished_plan_id):
+    def assign():
+        response = client.post(f"/plans/{finished_plan_id}/auto_assign")
+        assert response.status_code == 200
+        return response.json()
+    plan = benchmark(assign)
+    assert plan["assignments"]
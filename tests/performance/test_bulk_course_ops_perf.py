@@ -47,4 +47,13 @@ def test_bulk_remove_completed_courses(benchmark, plan_id, many_course_codes):
         for code in many_course_codes:
             response = client.post(f"/plans/{plan_id}/remove_completed_course", json={"course_code": code})
             assert response.status_code == 200
-    benchmark(remove_courses) 
\ No newline at end of file
+    benchmark(remove_courses)
+
+def test_batch_add_and_remove_completed_courses(benchmark, plan_id, many_course_codes):
+    add = [{"op": "add", "course_code": code} for code in many_course_codes]
+    remove = [{"op": "remove", "course_code": code} for code in many_course_codes]
+    def apply_batches():
+        for operations in (add, remove):
+            response = client.post(f"/plans/{plan_id}/course_operations", json={"operations": operations})
+            assert response.status_code == 200
+    benchmark(apply_batches)
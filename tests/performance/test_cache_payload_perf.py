@@ -0,0 +1,34 @@
+import json
+import pickle
+import pytest
+from config.config import COURSES_PARSED_PATH
+from db.migrations.migrate_courses import parse_credits
+from core.cache import encode_course_codes, decode_course_codes, rehydrate_courses
+from models.courses.course import Course
+
+@pytest.fixture(scope="module")
+def completed():
+    with open(COURSES_PARSED_PATH) as f:
+        data = json.load(f)
+    return [Course(dict(d, credits=parse_credits(d.get('credits')))) for d in data[:40]]
+
+def test_compact_payload_is_smaller_than_pickle(completed):
+    pickled = pickle.dumps(completed)
+    compact = encode_course_codes([c.get_course_code() for c in completed])
+    print(f"\npickle: {len(pickled)} bytes, compact: {len(compact)} bytes")
+    assert len(compact) * 10 < len(pickled)
+
+def test_pickle_encode(benchmark, completed):
+    benchmark(pickle.dumps, completed)
+
+def test_compact_encode(benchmark, completed):
+    benchmark(lambda: encode_course_codes([c.get_course_code() for c in completed]))
+
+def test_pickle_decode(benchmark, completed):
+    payload = pickle.dumps(completed)
+    benchmark(pickle.loads, payload)
+
+def test_compact_decode(benchmark, completed):
+    payload = encode_course_codes([c.get_course_code() for c in completed])
+    result = benchmark(lambda: rehydrate_courses(decode_course_codes(payload), completed))
+    assert result == completed
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from db.database import engine
+from db.models.course import Course as ORMCourse
+from models.courses.catalog import Catalog
+from models.courses.course import Course
+
+SYNTHETIC_COURSES = 50000
+
+def synthetic_rows(count):
+    subjects = ["CS", "MATH", "HIST", "ECON", "BIO", "CHEM", "PHIL", "ENGL"]
+    rows = []
+    for i in range(count):
+        subject = subjects[i % len(subjects)]
+        number = 1000 + i // len(subjects)
+        code = f"{subject} {number}"
+        rows.append({
+            "course_code": code,
+            "title": f"Synthetic course {i}",
+            "subject_name": f"Subject {subject}",
+            "subject_code": subject,
+            "course_number": str(number),
+            "level": number // 1000 * 1000,
+            "axle": ["HCA"] if i % 3 == 0 else [],
+            "credits": 3,
+            "prerequisites": [[f"{subject} {number - 1}"]] if i % 2 else None,
+            "corequisites": None,
+            "description": f"Description of {code}. " * 8,
+        })
+    return rows
+
+@pytest.fixture(scope="module")
+def session():
+    # A courses table of its own in a throwaway schema; the transaction is rolled back afterwards
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(text("CREATE SCHEMA loader_bench"))
+        connection.execute(text("SET LOCAL search_path TO loader_bench"))
+        ORMCourse.__table__.create(connection)
+        connection.execute(insert(ORMCourse.__table__), synthetic_rows(SYNTHETIC_COURSES))
+        session = Session(bind=connection)
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+
+def load_entities(session):
+    """The previous loader: full ORM entities, each copied into a Course dict."""
+    session.expunge_all()
+    return [Course.from_orm(oc) for oc in session.query(ORMCourse).all()]
+
+@pytest.mark.parametrize("loader", [load_entities, Catalog.load_courses], ids=["orm_entities", "core_rows"])
+def test_catalog_loader_rows_per_second(benchmark, session, loader):
+    courses = benchmark.pedantic(loader, args=(session,), rounds=5, iterations=1)
+    assert len(courses) == SYNTHETIC_COURSES
+    rows_per_second = SYNTHETIC_COURSES / benchmark.stats.stats.mean
+    benchmark.extra_info["rows_per_second"] = round(rows_per_second)
+    print(f"\n{loader.__name__}: {rows_per_second:,.0f} rows/s")
+
+def test_loaders_build_the_same_courses(session):
+    # Descriptions included: the row loader reads them lazily from the same schema as the rows
+    by_code = {course.course_code: course.to_dict() for course in load_entities(session)}
+    loaded = Catalog.load_courses(session)
+    assert len(loaded) == len(by_code) and all(course.to_dict() == by_code[course.course_code] for course in loaded)
@@ -0,0 +1,23 @@
+import pytest
+from config.config import COURSES_PARSED_PATH
+from db.scripts.build_catalog_snapshot import courses_from_json
+from models.courses.catalog import Catalog
+from models.courses.snapshot import write_snapshot
+from models.graph.dependency_graph import DependencyGraph
+
+@pytest.fixture(scope="module")
+def snapshot_path(tmp_path_factory):
+    courses, version = courses_from_json(COURSES_PARSED_PATH)
+    path = str(tmp_path_factory.mktemp("snapshot") / "catalog.snap")
+    write_snapshot(courses, path, version)
+    return path
+
+def test_cold_start_from_parsed_json(benchmark):
+    def start():
+        courses, version = courses_from_json(COURSES_PARSED_PATH)
+        return DependencyGraph(Catalog(courses, version=version))
+    benchmark(start)
+
+def test_cold_start_from_snapshot(benchmark, snapshot_path):
+    graph = benchmark(lambda: DependencyGraph(Catalog.from_snapshot(snapshot_path)))
+    assert graph.version.startswith("json:")
@@ -0,0 +1,89 @@
+import gc
+import json
+import os
+import tracemalloc
+import pytest
+from config.config import COURSES_PARSED_PATH
+from db.migrations.migrate_courses import parse_credits
+from models.courses.catalog import Catalog
+from models.courses.course import Course
+from models.courses.details import DescriptionSource
+
+class DictCourse:
+    """The previous Course layout: a __dict__ with every field, description and requisite aliases included."""
+
+    def __init__(self, data):
+        for field in ('subject_name', 'title', 'course_code', 'subject_code', 'course_number', 'level', 'axle',
+                      'credits', 'prerequisites', 'corequisites', 'prereqs', 'coreqs', 'description'):
+            setattr(self, field, data.get(field))
+
+class SideDescriptions(DescriptionSource):
+    """Descriptions kept apart from the courses, as Catalog.load_courses leaves them in the table."""
+
+    def __init__(self, records):
+        self.descriptions = {record['course_code']: record.get('description') for record in records}
+
+    def get(self, course_code):
+        return self.descriptions.get(course_code)
+
+@pytest.fixture(scope="module")
+def records():
+    with open(COURSES_PARSED_PATH) as f:
+        data = json.load(f)
+    return [dict(d, credits=parse_credits(d.get('credits'))) for d in data]
+
+def build_slotted(rows):
+    # Rows are read without the description column, as in Catalog.load_courses; the side store is
+    # built here too, so both layouts are measured holding every description
+    descriptions = SideDescriptions(rows)
+    return [Course(dict(row, description=None), descriptions) for row in rows]
+
+@pytest.fixture(scope="module")
+def layouts():
+    return {
+        "slotted": build_slotted,
+        "dict": lambda rows: [DictCourse(row) for row in rows],
+    }
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+def measure(build, records):
+    """
+    What the built courses keep alive once the rows they were read from are dropped: bytes traced and RSS growth.
+    Rows are decoded inside the measurement, as if just read from the database.
+    """
+    payload = json.dumps(records)
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    rows = json.loads(payload)
+    built = build(rows)
+    del rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return built, retained, rss_bytes() - rss_before
+
+@pytest.mark.parametrize("layout", ["slotted", "dict"])
+def test_course_memory(benchmark, records, layouts, layout):
+    courses, retained, rss = measure(layouts[layout], records)
+    per_course = retained / len(courses)
+    benchmark.extra_info.update(courses=len(courses), bytes_per_course=round(per_course), rss_delta=rss)
+    print(f"\n{layout}: {per_course:.0f} bytes/course, rss +{rss / 1e6:.1f} MB for {len(courses)} courses")
+    benchmark(layouts[layout], records)
+
+def test_slotted_courses_are_smaller(records, layouts):
+    _, slotted, _ = measure(layouts["slotted"], records)
+    _, legacy, _ = measure(layouts["dict"], records)
+    print(f"\nslotted: {slotted / len(records):.0f} bytes/course, dict: {legacy / len(records):.0f} bytes/course")
+    # Both hold every description, so the saving is the per-instance __dict__ and the interned strings
+    assert slotted * 4 < legacy * 3
+
+def test_catalog_rss(benchmark, records, layouts):
+    build = lambda rows: Catalog(layouts["slotted"](rows), version="memory")
+    catalog, retained, rss = measure(build, records)
+    benchmark.extra_info.update(courses=len(catalog.courses), catalog_bytes=retained, rss_delta=rss)
+    print(f"\ncatalog: {retained / 1e6:.1f} MB traced, rss +{rss / 1e6:.1f} MB for {len(catalog.courses)} courses")
+    benchmark(build, records)
@@ -0,0 +1,26 @@
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+
+client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def double_major_plan_id():
+    response = client.get("/programs")
+    assert response.status_code == 200
+    program_ids = [p["id"] for p in response.json()][:2]
+    if len(program_ids) < 2:
+        pytest.skip("Need two programs for a double major.")
+    response = client.post("/plans", json={"program_ids": program_ids, "start_semester": "Fall", "year": 2024})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_double_major_schedule(benchmark, double_major_plan_id):
+    def generate():
+        response = client.get(f"/plans/{double_major_plan_id}/schedule")
+        assert response.status_code == 200
+        return response.json()
+    schedule = benchmark(generate)
+    assert len(schedule["semesters"]) <= 8
+    assert all(term["credits"] <= 18 for term in schedule["semesters"])
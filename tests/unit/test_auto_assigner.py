@@ -0,0 +1,59 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.requirements import Program, RequirementCategory
+from models.requirements.policy_engine import PolicyEngine
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.auto_assigner import AutoAssigner, MinCostFlow
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    return Catalog([make_course(c) for c in ["CS 1101", "CS 2201", "CS 3251", "MATH 1300"]] + [make_course("MATH 2300", 4)], version="v1")
+
+def cs_program(name="CS"):
+    # An open category listed first takes CS 1101 under first-fit and leaves Core short
+    return Program(name, "major", 9, [
+        RequirementCategory("Open", 3, [CourseFilterRequirement(subject="CS")]),
+        RequirementCategory("Core", 6, [CourseListRequirement(["CS 1101", "CS 2201"])]),
+    ])
+
+def test_min_cost_flow():
+    network = MinCostFlow(4)
+    cheap = network.add_edge(0, 1, 2, 1)
+    network.add_edge(0, 2, 2, 5)
+    network.add_edge(1, 3, 3, 0)
+    network.add_edge(2, 3, 1, 0)
+    assert network.solve(0, 3) == (3, 7)
+    assert network.flow_on(cheap) == 2
+
+def test_named_courses_go_where_they_are_required(catalog):
+    engine = AutoAssigner([cs_program()], catalog=catalog)
+    completed = [catalog.get_by_course_code(c) for c in ["CS 1101", "CS 2201", "CS 3251"]]
+    assert engine.assign(completed) == {
+        "CS 1101": [("CS", "Core")],
+        "CS 2201": [("CS", "Core")],
+        "CS 3251": [("CS", "Open")],
+    }
+
+def test_indivisible_credits_are_repaired(catalog):
+    # 4 + 3 credits against categories needing 3 and 4: the flow splits MATH 2300, rounding must not
+    program = Program("Math", "major", 7, [
+        RequirementCategory("A", 3, [CourseFilterRequirement(subject="MATH")]),
+        RequirementCategory("B", 4, [CourseFilterRequirement(subject="MATH")]),
+    ])
+    completed = [catalog.get_by_course_code(c) for c in ["MATH 2300", "MATH 1300"]]
+    assignments = AutoAssigner([program], catalog=catalog).assign(completed)
+    assert sorted(pairs[0][1] for pairs in assignments.values()) == ["A", "B"]
+    assert assignments["MATH 2300"] == [("Math", "B")]
+
+def test_cross_program_sharing_follows_policies(catalog):
+    completed = [catalog.get_by_course_code(c) for c in ["CS 1101", "CS 2201", "CS 3251"]]
+    shared = AutoAssigner([cs_program("CS"), cs_program("CS2")], catalog=catalog).assign(completed)
+    assert shared["CS 3251"] == [("CS", "Open"), ("CS2", "Open")]
+    policy = PolicyEngine(policy_config=[{
+        "program_types": ["major"],
+        "rules": [{"type": "allow_cross_program_overlap", "condition": "required_courses_only"}],
+    }])
+    restricted = AutoAssigner([cs_program("CS"), cs_program("CS2")], policy, catalog).assign(completed)
+    assert restricted["CS 3251"] == [("CS", "Open")]
+    assert restricted["CS 1101"] == [("CS", "Core"), ("CS2", "Core")]
@@ -0,0 +1,78 @@
+import gc
+import weakref
+import pytest
+from models.graph.bitset import CourseIndex, iter_bits, masks_satisfied
+from models.graph.dependency_graph import DependencyGraph, catalog_graph
+from models.graph.logic import PrerequisiteLogic
+from tests.helpers import make_course, MockCatalog
+
+@pytest.fixture
+def graph():
+    # A requires (B or C) and D; E requires A; F requires an unknown course
+    return DependencyGraph(MockCatalog([
+        make_course('A', prereqs=[['B', 'C'], ['D']]),
+        make_course('B'),
+        make_course('C'),
+        make_course('D'),
+        make_course('E', prereqs=[['A']]),
+        make_course('F', prereqs=[['X 9999']]),
+    ]))
+
+def test_course_index_round_trip():
+    index = CourseIndex(['A', 'B', 'C'])
+    bits = index.to_bitset(['C', 'A', 'unknown'])
+    assert sorted(index.from_bitset(bits)) == ['A', 'C']
+    assert list(iter_bits(bits)) == [0, 2]
+
+def test_masks_satisfied():
+    index = CourseIndex(['A', 'B', 'C', 'D'])
+    masks = index.compile_groups([['A', 'B'], ['D']])
+    assert masks_satisfied(masks, index.to_bitset(['B', 'D']))
+    assert not masks_satisfied(masks, index.to_bitset(['A', 'C']))
+    assert masks_satisfied((), 0)
+
+def test_catalog_courses_get_dense_ids_first(graph):
+    assert [graph.index.get(code) for code in 'ABCDEF'] == [0, 1, 2, 3, 4, 5]
+    assert graph.index.get('X 9999') == 6
+    assert graph.from_bitset(graph.catalog_bits) == list('ABCDEF')
+
+def test_logic_view_matches_string_evaluation(graph):
+    logic = graph.get_prerequisite_logic('A')
+    for completed in [set(), {'B'}, {'D'}, {'C', 'D'}, {'B', 'C', 'D'}]:
+        assert logic.is_satisfied(graph.to_bitset(completed)) == logic.is_satisfied(completed)
+
+def test_whole_catalog_prerequisite_sweep(graph):
+    satisfied = graph.prerequisites_satisfied_bitset(graph.to_bitset({'C', 'D'}))
+    assert set(graph.from_bitset(satisfied)) == {'A', 'B', 'C', 'D'}
+    satisfied = graph.prerequisites_satisfied_bitset(graph.to_bitset({'A', 'X 9999'}))
+    assert set(graph.from_bitset(satisfied)) == {'B', 'C', 'D', 'E', 'F'}
+
+def test_uncompiled_logic_still_accepts_string_sets():
+    logic = PrerequisiteLogic([['B', 'C'], ['D']])
+    assert logic.masks is None
+    assert logic.is_satisfied({'C', 'D'})
+    assert not logic.is_satisfied({'B'})
+
+def test_dependents_recorded_regardless_of_catalog_order():
+    graph = DependencyGraph(MockCatalog([make_course('B', prereqs=[['A']]), make_course('A')]))
+    assert graph.adjacency['A'] == {'B'}
+
+def test_graph_shared_per_catalog_snapshot():
+    catalog = MockCatalog([make_course('B', prereqs=[['A']]), make_course('A')])
+    graph = catalog_graph(catalog)
+    assert catalog_graph(catalog) is graph
+    assert catalog_graph(MockCatalog(catalog.courses)) is not graph
+    assert graph.requisite_matrix() is graph.requisite_matrix()
+
+def test_replaced_snapshot_and_its_graph_are_freed():
+    catalog = MockCatalog([make_course('B', prereqs=[['A']]), make_course('A')])
+    catalog_ref, graph_ref = weakref.ref(catalog), weakref.ref(catalog_graph(catalog))
+    del catalog
+    gc.collect()
+    assert catalog_ref() is None and graph_ref() is None
+
+def test_graph_is_read_only(graph):
+    with pytest.raises(TypeError):
+        graph.adjacency['A'] = set()
+    with pytest.raises(AttributeError):
+        graph.adjacency['B'].add('Z')
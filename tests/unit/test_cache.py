@@ -0,0 +1,181 @@
+import json
+import pytest
+from types import SimpleNamespace
+from core.cache import CacheNamespace, LRUCache, RedisL2, course_set_fingerprint, encode_course_codes, decode_course_codes, rehydrate_courses
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement, CompoundRequirement
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+        self.pipelines = 0
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("redis down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self._check()
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append((key, value, ex))
+
+    def execute(self):
+        self.client._check()
+        self.client.pipelines += 1
+        for key, value, ex in self.ops:
+            self.client.set(key, value, ex=ex)
+
+def make_ns(l2=None, name="test"):
+    return CacheNamespace(name, lambda v: json.dumps(v).encode(), json.loads, l2=l2, ttl=60,
+                          generation_check_interval=3600)
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+@pytest.fixture
+def l2(redis):
+    return RedisL2(redis, batch_size=2, flush_interval=0, retry_seconds=60)
+
+def test_lru_bounds_and_expiry():
+    lru = LRUCache(max_entries=2, ttl=None)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") == (False, None)
+    assert lru.get("a") == (True, 1)
+    assert lru.evictions == 1
+    expiring = LRUCache(max_entries=10, ttl=-1)
+    expiring.set("a", 1)
+    assert expiring.get("a") == (False, None)
+
+def test_memory_mode_hits_and_invalidation():
+    ns = make_ns()
+    key = ns.key("req", "abc")
+    assert ns.get(key) is None
+    ns.set(key, [1, 2])
+    assert ns.get(key) == [1, 2]
+    assert ns.invalidate() == 1
+    assert ns.key("req", "abc") != key
+    stats = ns.stats()
+    assert (stats["l1_hits"], stats["misses"], stats["writes"], stats["l1_entries"]) == (1, 1, 1, 0)
+
+def test_l2_writes_are_pipelined_in_batches(l2, redis):
+    ns = make_ns(l2)
+    ns.set(ns.key("a"), 1)
+    assert redis.pipelines == 0
+    ns.set(ns.key("b"), 2)
+    assert redis.pipelines == 1
+    assert redis.data[ns.key("a")] == b"1"
+    assert redis.expiry[ns.key("a")] == 60
+
+def test_l2_hit_fills_l1(l2, redis):
+    writer, reader = make_ns(l2), make_ns(l2)
+    key = writer.key("a")
+    writer.set(key, {"x": 1})
+    l2.flush()
+    assert reader.get(key) == {"x": 1}
+    assert reader.get(key) == {"x": 1}
+    assert (reader.l2_hits, reader.l1_hits) == (1, 1)
+
+def test_generation_shared_through_l2(l2):
+    ns = make_ns(l2)
+    other = CacheNamespace("test", json.dumps, json.loads, l2=l2, generation_check_interval=0)
+    before = other.key("x")
+    ns.invalidate()
+    assert other.key("x") != before
+    assert other.key("x") == ns.key("x")
+
+def test_generation_changes_are_adopted_after_outage_and_restart(redis):
+    l2 = RedisL2(redis, batch_size=1, flush_interval=0, retry_seconds=0)
+    ns, other = (CacheNamespace("test", json.dumps, json.loads, l2=l2, generation_check_interval=0) for _ in range(2))
+    other.invalidate()
+    assert ns.generation() == 1
+    redis.down = True
+    assert ns.invalidate() == 2
+    key = ns.key("x")
+    ns.set(key, "local")
+    redis.down = False
+    l2.flush()
+    assert ns.get(key) == "local" and key not in redis.data
+    # Another worker invalidates too; the missed invalidation is replayed on top of it
+    assert other.invalidate() == 2
+    assert ns.generation() == 3 and ns.get(key) is None
+    assert other.generation() == 3
+    # Redis restarted without the generation: a smaller remote value is still a change
+    ns.set(ns.key("y"), "old")
+    del redis.data[ns.generation_key]
+    assert ns.generation() == 3
+    assert other.invalidate() == 1
+    assert ns.generation() == 1 and len(ns.l1) == 0
+
+def test_undecodable_l2_entry_is_evicted(l2, redis):
+    ns = make_ns(l2)
+    key = ns.key("bad")
+    redis.data[key] = b"not json"
+    assert ns.get(key) is None
+    assert key not in redis.data
+    assert ns.stats()["evictions"] == 1
+
+def test_redis_outage_degrades_to_l1(l2, redis):
+    ns = make_ns(l2)
+    redis.down = True
+    key = ns.key("a")
+    ns.set(key, 1)
+    l2.flush()
+    assert ns.get(key) == 1
+    assert ns.invalidate() == 1
+    assert not l2.available()
+    assert l2.stats()["errors"] >= 1
+
+def test_course_codes_round_trip():
+    codes = ("CS 1101", "MATH 1300", "ES 1401")
+    assert decode_course_codes(encode_course_codes(codes)) == codes
+    assert decode_course_codes(encode_course_codes(())) == ()
+    with pytest.raises(ValueError):
+        decode_course_codes(b"\x80\x04legacy pickle")
+
+def test_rehydrate_uses_callers_courses():
+    courses = [SimpleNamespace(get_course_code=lambda c=c: c) for c in ("A 1", "B 2", "C 3")]
+    assert rehydrate_courses(("C 3", "A 1", "Z 9"), courses) == [courses[2], courses[0]]
+
+def test_course_set_fingerprint_is_order_independent():
+    assert course_set_fingerprint(["CS 1101", "MATH 1300"]) == course_set_fingerprint(["MATH 1300", "CS 1101"])
+    assert course_set_fingerprint(["CS 1101"]) != course_set_fingerprint(["CS 1101", "MATH 1300"])
+
+def test_requirement_cache_id_follows_definition():
+    a = CourseListRequirement(["CS 1101", "CS 2201"])
+    b = CourseListRequirement(["CS 2201", "CS 1101"])
+    assert a.cache_id() == b.cache_id()
+    assert a.cache_id() != CourseFilterRequirement(subject="CS").cache_id()
+    either = CompoundRequirement([a, CourseFilterRequirement(subject="CS")], op="OR")
+    both = CompoundRequirement([b, CourseFilterRequirement(subject="CS")], op="AND")
+    assert either.cache_id() != both.cache_id()
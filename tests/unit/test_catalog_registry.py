@@ -0,0 +1,78 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.courses.registry import CatalogRegistry
+from tests.helpers import make_course
+
+class FakeSource:
+    def __init__(self):
+        self.version = "v1"
+        self.codes = ["CS 1101", "MATH 1300"]
+        self.loads = 0
+
+    def probe(self):
+        return self.version
+
+    def load(self, version):
+        self.loads += 1
+        return Catalog([make_course(code) for code in self.codes], version=version)
+
+@pytest.fixture
+def source():
+    return FakeSource()
+
+@pytest.fixture
+def registry(source):
+    registry = CatalogRegistry(loader=source.load, version_probe=source.probe, refresh_interval=0)
+    yield registry
+    registry.stop()
+
+def test_catalog_loaded_once_and_shared(registry, source):
+    first = registry.get()
+    second = registry.get()
+    assert first is second
+    assert source.loads == 1
+    assert registry.stats()["hits"] == 1
+    assert registry.stats()["reloads"] == 1
+
+def test_refresh_is_noop_when_version_unchanged(registry, source):
+    catalog = registry.get()
+    assert registry.refresh() is False
+    assert registry.get() is catalog
+    assert source.loads == 1
+
+def test_refresh_swaps_snapshot_when_version_changes(registry, source):
+    old = registry.get()
+    source.version = "v2"
+    source.codes = ["CS 1101", "MATH 1300", "CS 2201"]
+    assert registry.refresh() is True
+    new = registry.get()
+    assert new is not old
+    assert new.version == "v2"
+    assert new.get_by_course_code("CS 2201") is not None
+    # The old snapshot is untouched for requests still holding it
+    assert old.get_by_course_code("CS 2201") is None
+
+def test_failed_probe_keeps_serving_snapshot(registry, source):
+    catalog = registry.get()
+    def broken_probe():
+        raise RuntimeError("database down")
+    registry._probe = broken_probe
+    assert registry.refresh() is False
+    assert registry.get() is catalog
+    assert registry.stats()["probe_failures"] == 1
+
+def test_catalog_indexes_do_not_grow_on_missing_lookups(registry):
+    catalog = registry.get()
+    subjects = set(catalog.by_subject)
+    assert catalog.get_by_subject("NOPE") == []
+    assert catalog.get_by_subject_and_number("NOPE", "0000") is None
+    assert set(catalog.by_subject) == subjects
+
+def test_listeners_called_only_when_snapshot_replaced(registry, source):
+    seen = []
+    registry.add_listener(seen.append)
+    registry.get()
+    assert seen == []
+    source.version = "v2"
+    registry.refresh()
+    assert [c.version for c in seen] == ["v2"]
@@ -0,0 +1,61 @@
+import pickle
+import pytest
+from core.exceptions import InvalidSnapshotError
+from models.courses.catalog import Catalog
+from models.courses.query import Query
+from models.courses.snapshot import CatalogSnapshot, read_snapshot_version, write_snapshot
+from models.graph.dependency_graph import DependencyGraph
+from tests.helpers import make_course
+
+def snapshot_course(code, level, credits=3, **fields):
+    # Non-ASCII titles and subject names, so the string table round-trip is covered
+    return make_course(code, credits, level=level, title=f"Title {code} – ü", subject_name=f"Subject {code.split()[0]}", **fields)
+
+@pytest.fixture
+def catalog():
+    return Catalog([
+        snapshot_course('CS 1101', 1000, axle=['P'], description="Intro"),
+        snapshot_course('CS 2201', 2000, axle='HCA', prerequisites=[['CS 1101']], description=""),
+        snapshot_course('CS 3251', 3000, 4, axle=[], prerequisites=[['CS 2201'], ['MATH 1300', 'MATH 1301']]),
+        snapshot_course('CS 3252', None, None, prerequisites='CS 2201', corequisites=[['CS 3251']]),
+        snapshot_course('MATH 1300', 1000, 4, axle=['MNS', 'HCA'], prerequisites=[]),
+    ], version="v1")
+
+@pytest.fixture
+def path(catalog, tmp_path):
+    path = str(tmp_path / "catalog.snap")
+    write_snapshot(catalog.courses, path, catalog.version)
+    return path
+
+def test_snapshot_reads_back_the_catalog(catalog, path):
+    opened = Catalog.from_snapshot(path)
+    assert opened.version == read_snapshot_version(path) == "v1"
+    assert [c.to_dict() for c in opened.courses] == [c.to_dict() for c in catalog.courses]
+    assert opened.by_axle.keys() == catalog.by_axle.keys()
+    assert not opened.columns.level.flags.writeable
+    query = lambda c: [course.course_code for course in Query(c).by_axle('HCA').by_level_range(1000, 2000).results()]
+    assert query(opened) == query(catalog) == ['CS 2201', 'MATH 1300']
+
+def test_graph_uses_the_saved_requisite_groups(catalog, path):
+    opened, built = DependencyGraph(Catalog.from_snapshot(path)), DependencyGraph(catalog)
+    for code in built.nodes:
+        assert opened.prereq_logic[code].groups == built.prereq_logic[code].groups
+        assert opened.coreq_logic[code].groups == built.coreq_logic[code].groups
+    assert dict(opened.adjacency) == dict(built.adjacency)
+    assert opened.prereq_logic['CS 3251'].groups == [['CS 2201'], ['MATH 1300', 'MATH 1301']]
+
+def test_snapshot_pickles_as_its_path(catalog, path):
+    opened = Catalog.from_snapshot(path)
+    restored = pickle.loads(pickle.dumps(opened))
+    assert isinstance(restored.snapshot, CatalogSnapshot) and restored.snapshot is not opened.snapshot
+    assert restored.get_by_course_code('CS 1101').description == "Intro"
+    payload = pickle.dumps(opened)
+    write_snapshot(catalog.courses, path, "v2")
+    with pytest.raises(InvalidSnapshotError):
+        pickle.loads(payload)
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.snap"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(InvalidSnapshotError):
+        Catalog.from_snapshot(str(path))
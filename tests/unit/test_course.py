@@ -0,0 +1,57 @@
+import pickle
+import pytest
+from models.courses.course import Course
+from models.courses.details import DescriptionSource
+from core.exceptions import InvalidCreditsError
+from tests.helpers import make_course
+
+class CountingDescriptions(DescriptionSource):
+    def __init__(self):
+        self.calls = []
+
+    def get(self, course_code):
+        self.calls.append(course_code)
+        return f"About {course_code}"
+
+def test_course_is_slotted_and_immutable():
+    course = make_course('CS 1101')
+    assert not hasattr(course, '__dict__')
+    with pytest.raises(AttributeError):
+        course.credits = 4
+    with pytest.raises(AttributeError):
+        del course.title
+
+def test_subjects_and_axle_tags_are_shared():
+    a = make_course('CS 1101', axle=['HCA', 'P'], subject_name='Computer Science')
+    b = make_course('CS 2201', axle=list(['HC' + 'A', 'P']), subject_name=' '.join(['Computer', 'Science']))
+    assert a.subject_code is b.subject_code and a.subject_name is b.subject_name
+    assert a.axle is b.axle and a.get_axle_requirements() == ('HCA', 'P')
+    assert make_course('CS 3251', axle='MNS').get_axle_requirements() == ('MNS',)
+    assert make_course('CS 3251').get_axle_requirements() == ()
+
+def test_requisites_decode_on_access_and_accept_alternate_names():
+    course = make_course('CS 2201', prereqs=[['CS 1101', 'CS 1104']], corequisites=[])
+    assert course.prerequisites == [['CS 1101', 'CS 1104']] and course.corequisites == []
+    course.prerequisites.append(['MATH 1300'])
+    assert course.prerequisites == [['CS 1101', 'CS 1104']]
+    assert course.has_prerequisites() and not course.has_corequisites()
+    assert make_course('CS 1101').prerequisites is None
+
+def test_description_is_read_from_the_source_on_access():
+    source = CountingDescriptions()
+    course = make_course('CS 1101', axle=['P'], prerequisites=[['CS 1000']], source=source)
+    assert source.calls == []
+    assert course.description == "About CS 1101" and source.calls == ['CS 1101']
+    assert make_course('CS 2201', description="Given", source=source).description == "Given"
+
+    restored = pickle.loads(pickle.dumps(course))
+    assert restored.to_dict() == course.to_dict()
+    assert restored.to_dict()['axle'] == ['P'] and restored.axle is course.axle
+
+def test_row_builds_the_same_course_and_is_validated():
+    course = make_course('CS 2201', level=1000, axle=['HCA'], subject_name='Computer Science', prerequisites=[['CS 1101']])
+    row = ('Computer Science', 'Title CS 2201', 'CS 2201', 'CS', '2201', 1000, ['HCA'], 3, '[[["CS 1101"]], null]')
+    assert Course.from_row(row).to_dict() == course.to_dict()
+    assert Course.from_row(row[:-1] + (None,)).prerequisites is None
+    with pytest.raises(InvalidCreditsError):
+        Course.from_row(row[:7] + (-1, None))
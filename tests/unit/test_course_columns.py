@@ -0,0 +1,72 @@
+import pickle
+import pytest
+from models.courses.catalog import Catalog
+from models.courses.filter import Filter
+from models.courses.query import Query
+from models.requirements.requirement_types import CourseFilterRequirement
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    return Catalog([
+        make_course('CS 1101', level=1000, axle=['P']),
+        make_course('CS 2294W', level=2000, axle=['HCA', 'P']),
+        make_course('CS 3251', 4, level=3000),
+        make_course('MATH 1300', 4, level=1000, axle=['MNS']),
+        make_course('HIST 3000', level=3000, axle=['HCA']),
+        make_course('HIST 4960', 1, level=4000, axle=['HCA', 'INT']),
+    ], version="v1")
+
+def test_columns_encode_courses(catalog):
+    columns = catalog.columns
+    assert columns.size == 6
+    assert columns.number.tolist() == [1101, 2294, 3251, 1300, 3000, 4960]
+    rows = [sorted(tag for tag, i in columns.tags.items() if i in columns.tag_ids[columns.tag_starts[r]:columns.tag_starts[r + 1]])
+            for r in range(columns.size)]
+    assert rows == [['P'], ['HCA', 'P'], [], ['MNS'], ['HCA'], ['HCA', 'INT']]
+    assert pickle.loads(pickle.dumps(catalog)).columns.level.tolist() == columns.level.tolist()
+
+@pytest.mark.parametrize("apply", [
+    lambda f, courses: f.get_courses_by_subject(['CS', 'HIST'], courses),
+    lambda f, courses: f.get_courses_by_subject('NOPE', courses),
+    lambda f, courses: f.get_courses_by_axle(['HCA', 'MNS'], False, courses),
+    lambda f, courses: f.get_courses_by_axle(['HCA', 'P'], True, courses),
+    lambda f, courses: f.get_courses_by_axle(['HCA', 'NOPE'], True, courses),
+    lambda f, courses: f.get_courses_by_level(3000, courses),
+    lambda f, courses: f.get_courses_by_level_range(2000, 3000, courses),
+    lambda f, courses: f.get_courses_by_level_range(None, 1000, courses),
+    lambda f, courses: f.get_courses_by_credits([1, 4], courses),
+    lambda f, courses: f.exclude_course_numbers(['1101', '2294W'], courses),
+])
+def test_filters_match_the_list_scan(catalog, apply):
+    f = Filter(catalog)
+    assert apply(f, None) == apply(f, list(catalog.courses))
+
+@pytest.mark.parametrize("requirement", [
+    CourseFilterRequirement(subject='HIST', min_level=3000),
+    CourseFilterRequirement(tags=['HCA', 'MNS'], max_level=3000),
+    CourseFilterRequirement(subject='CS', tags='P', min_level=2000, max_level=2000),
+    CourseFilterRequirement(min_credits=3),
+])
+def test_filter_requirement_matches_the_list_scan(catalog, requirement):
+    vectorized = requirement.get_possible_courses(catalog.courses)
+    assert vectorized == requirement.get_possible_courses(list(catalog.courses))
+    plan = requirement.evaluation_plan()
+    assert [c for c, hit in zip(catalog.courses, plan.mask(catalog.columns)) if hit] == [c for c in catalog.courses if plan.matches(c)]
+
+def test_query_chain_matches_chained_filters(catalog):
+    f = Filter(catalog)
+    expected = f.get_courses_by_credits([3], f.get_courses_by_axle('HCA', False, f.get_courses_by_subject(['CS', 'HIST'], list(catalog.courses))))
+    query = Query(catalog).by_subject(['CS', 'HIST']).by_axle('HCA').by_credits(3)
+    assert query.results() == expected and query.count() == len(expected) == 2
+    assert Query(catalog).by_level_range().count() == 0
+    assert query.reset().exclude_numbers(['1101']).count() == 5
+
+def test_query_drives_from_the_smallest_index_and_counts_without_courses(catalog, monkeypatch):
+    query = Query(catalog).by_level_range(1000, 3000).by_axle(['HCA', 'P'], match_all=True).by_subject('CS')
+    assert [type(p).__name__ for p in query.plan()] == ['AxlePredicate', 'SubjectPredicate', 'LevelRangePredicate']
+    assert query.columns.postings("tag", ['HCA']).tolist() == [1, 4, 5]
+    monkeypatch.setattr(query.columns, "take", lambda rows: pytest.fail("count() built courses"))
+    assert query.count() == 1
+    monkeypatch.undo()
+    assert [c.course_code for c in query.results()] == ['CS 2294W']
@@ -0,0 +1,73 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.requirements import Program, RequirementCategory
+from models.requirements.policy_engine import PolicyEngine
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.academic_planner import AcademicPlanner
+from models.planning.semester import Semester
+from models.requirements.requirement_types.evaluation import RequirementEvaluator
+from core.exceptions import InvalidAssignmentError, InvalidCategoryError
+from tests.helpers import make_course
+
+@pytest.fixture
+def planner():
+    catalog = Catalog([make_course(c) for c in ["CS 1101", "CS 2201", "CS 3251", "MATH 1300"]], version="v1")
+    program = Program("CS", "major", 12, [
+        RequirementCategory("Core", 6, [CourseListRequirement(["CS 1101", "CS 2201"])]),
+        RequirementCategory("Upper", 3, [CourseFilterRequirement(subject="CS", min_level=3000)]),
+        RequirementCategory("Electives", 3, [CourseFilterRequirement(subject="CS")]),
+    ])
+    return AcademicPlanner(catalog, [program], Semester("Fall", 2024), PolicyEngine(policy_config=[]))
+
+def test_batch_applies_mixed_operations_and_reports_diff(planner):
+    planner.add_completed_courses({"CS 3251": [("CS", "Electives")]})
+    diff = planner.apply_course_operations([
+        {"op": "add", "course_code": "CS 1101", "assignments": [("CS", "Core")]},
+        {"op": "add", "course_code": "MATH 1300"},
+        {"op": "add", "course_code": "CS 2201", "assignments": [["CS", "Core"]]},
+        {"op": "reassign", "course_code": "CS 3251", "assignments": [("CS", "Upper")]},
+        {"op": "remove", "course_code": "MATH 1300"},
+    ])
+    assert diff["added"] == ["CS 1101", "CS 2201"]
+    assert diff["removed"] == []
+    assert diff["assignments"] == {
+        "CS 1101": {"before": [], "after": [("CS", "Core")]},
+        "CS 2201": {"before": [], "after": [("CS", "Core")]},
+        "CS 3251": {"before": [("CS", "Electives")], "after": [("CS", "Upper")]},
+    }
+    assert [c.get_course_code() for c in planner.get_completed_courses()] == ["CS 3251", "CS 1101", "CS 2201"]
+    progress = planner.get_progress_summary()["programs"][0]["categories"]
+    assert [c["complete"] for c in progress] == [True, True, False]
+
+def test_batch_is_all_or_nothing(planner):
+    planner.add_completed_courses({"CS 1101": [("CS", "Core")]})
+    with pytest.raises(InvalidAssignmentError) as error:
+        planner.apply_course_operations([
+            {"op": "add", "course_code": "CS 2201", "assignments": [("CS", "Core")]},
+            {"op": "add", "course_code": "MATH 1300", "assignments": [("CS", "Core")]},
+            {"op": "reassign", "course_code": "CS 1101", "assignments": [("CS", "Core"), ("CS", "Electives")]},
+            {"op": "remove", "course_code": "CS 3251"},
+        ])
+    message = str(error.value)
+    assert "MATH 1300" in message and "more than one category" in message and "CS 3251 is not a completed course" in message
+    assert [c.get_course_code() for c in planner.get_completed_courses()] == ["CS 1101"]
+    assert planner.get_assignments() == {"CS 1101": [("CS", "Core")]}
+
+def test_removing_a_course_drops_its_assignments(planner):
+    planner.add_completed_courses({"CS 1101": [("CS", "Core")], "CS 2201": [("CS", "Core")]})
+    diff = planner.apply_course_operations([{"op": "remove", "course_code": "CS 1101"}])
+    assert diff["removed"] == ["CS 1101"]
+    assert planner.get_assignments() == {"CS 2201": [("CS", "Core")]}
+    assert planner.remove_completed_course("CS 2201")
+    assert planner.get_assignments() == {}
+    assert ("CS", "Core") in planner.progress.unmet_requirements()
+
+def test_rejected_assignment_pair_leaves_progress_in_step(planner):
+    with pytest.raises(InvalidCategoryError):
+        planner.add_completed_courses({"CS 1101": [("CS", "Core"), ("CS", " ")]})
+    with pytest.raises(InvalidCategoryError):
+        planner.plan_semester({"CS 2201": [("CS", "Core"), ("CS", "")]})
+    program = planner.plan_config.programs[0]
+    completed = planner.get_completed_courses()
+    assert planner.get_assignments() == {"CS 1101": [("CS", "Core")], "CS 2201": [("CS", "Core")]}
+    assert planner.progress.program_progress(program) == program.progress(completed, planner.get_assignments(), RequirementEvaluator())
@@ -0,0 +1,57 @@
+import pytest
+from models.graph.critical_path import CriticalPathSolver, UNREACHABLE
+from models.graph.dependency_graph import DependencyGraph
+from models.requirements.requirement_types import CourseListRequirement, CourseOptionsRequirement, CompoundRequirement
+from tests.helpers import make_course, MockCatalog
+
+@pytest.fixture
+def graph():
+    # A -> B -> C is the long chain; D needs C or A; F and G are mutual corequisites and F needs A
+    return DependencyGraph(MockCatalog([
+        make_course('A'),
+        make_course('B', prereqs=[['A']]),
+        make_course('C', prereqs=[['B']]),
+        make_course('D', prereqs=[['C', 'A']]),
+        make_course('E', prereqs=[['D']]),
+        make_course('F', prereqs=[['A']], coreqs=[['G']]),
+        make_course('G', coreqs=[['F']]),
+        make_course('H', prereqs=[['X 9999']]),
+    ]))
+
+def test_depths_take_cheapest_branch_and_merge_mutual_coreqs(graph):
+    solver = CriticalPathSolver(graph, [])
+    assert [solver.depth(c) for c in 'ABCDE'] == [1, 2, 3, 2, 3]
+    assert solver.depth('F') == solver.depth('G') == 2
+    assert solver.depth('H') == UNREACHABLE
+
+def test_solve_reports_path_chain_and_layers(graph):
+    result = CriticalPathSolver(graph, []).solve(['E', 'C', 'G', 'H'])
+    assert result.semesters == 3
+    assert result.critical_path == ['A', 'D', 'E']
+    assert result.longest_chain == ['A', 'B', 'D', 'C', 'E']
+    assert [sorted(layer) for layer in result.layers] == [['A'], ['B', 'D', 'F', 'G'], ['C', 'E']]
+    assert result.unreachable == ['H']
+
+def test_completed_courses_shorten_the_path(graph):
+    result = CriticalPathSolver(graph, ['A', 'B']).solve(['E', 'C'])
+    assert result.semesters == 2
+    assert result.critical_path == ['D', 'E']
+    assert CriticalPathSolver(graph, list('ABCDE')).solve(['E']).semesters == 0
+
+def test_requirement_targets_choose_cheapest_way(graph):
+    solver = CriticalPathSolver(graph, [])
+    requirements = [
+        CourseOptionsRequirement(['C', 'D'], min_required=1),
+        CompoundRequirement([CourseListRequirement(['E']), CourseListRequirement(['B'])], op="OR"),
+        CompoundRequirement([CourseListRequirement(['G']), CourseListRequirement(['A'])], op="AND"),
+    ]
+    assert solver.requirement_targets(requirements, graph.catalog.courses) == ['D', 'B', 'G', 'A']
+
+def test_or_cycle_depths_do_not_depend_on_solve_order():
+    # A needs B or C, B needs A: A is reached through C whichever course is solved first
+    courses = [make_course('A', prereqs=[['B', 'C']]), make_course('B', prereqs=[['A']]), make_course('C')]
+    for order in ('AB', 'BA'):
+        solver = CriticalPathSolver(DependencyGraph(MockCatalog(courses)), [])
+        depths = {code: solver.depth(code) for code in order}
+        assert depths == {'A': 2, 'B': 3}
+        assert solver.solve(['B']).critical_path == ['C', 'A', 'B']
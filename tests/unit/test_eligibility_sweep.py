@@ -0,0 +1,46 @@
+import pytest
+from models.graph.dependency_graph import DependencyGraph
+from models.graph.eligibility import CourseEligibility
+from tests.helpers import make_course, MockCatalog
+
+@pytest.fixture
+def graph():
+    return DependencyGraph(MockCatalog([
+        make_course('CALC 1'),
+        make_course('CALC 2', prereqs=[['CALC 1']]),
+        # Lecture and lab are mutual corequisites; the lab also needs CALC 1
+        make_course('PHYS 1', coreqs=[['PHYS 1L']]),
+        make_course('PHYS 1L', prereqs=[['CALC 1']], coreqs=[['PHYS 1']]),
+        # Single one-way corequisite whose own prerequisite is CALC 2
+        make_course('CHEM 1', coreqs=[['CHEM 1L']]),
+        make_course('CHEM 1L', prereqs=[['CALC 2']]),
+        # Multi-course corequisites: eligible only once one of them is completed
+        make_course('BIO 1', coreqs=[['CHEM 1', 'PHYS 1'], ['CALC 2']]),
+    ]))
+
+def test_fresh_student(graph):
+    assert CourseEligibility.eligible_set(set(), set(), graph) == {'CALC 1'}
+
+def test_mutual_group_unlocked_together(graph):
+    eligible = CourseEligibility.eligible_set({'CALC 1'}, set(), graph)
+    assert {'PHYS 1', 'PHYS 1L', 'CALC 2'} <= eligible
+    assert 'CALC 1' not in eligible
+
+def test_single_corequisite_rule(graph):
+    assert 'CHEM 1' not in CourseEligibility.eligible_set({'CALC 1'}, set(), graph)
+    assert 'CHEM 1' in CourseEligibility.eligible_set({'CALC 1', 'CALC 2'}, set(), graph)
+
+def test_completed_group_member_splits_group(graph):
+    eligible = CourseEligibility.eligible_set({'PHYS 1'}, set(), graph)
+    # PHYS 1L's corequisite is completed, but its own prerequisite is not
+    assert 'PHYS 1L' not in eligible
+    assert 'PHYS 1L' in CourseEligibility.eligible_set({'PHYS 1', 'CALC 1'}, set(), graph)
+
+def test_enrolled_courses_count_as_taken(graph):
+    eligible = CourseEligibility.eligible_set(set(), {'CALC 1'}, graph)
+    assert 'CALC 1' not in eligible
+    assert 'CALC 2' in eligible
+
+def test_complex_corequisites_need_a_completed_member(graph):
+    assert 'BIO 1' not in CourseEligibility.eligible_set({'CALC 1'}, set(), graph)
+    assert 'BIO 1' in CourseEligibility.eligible_set({'CALC 1', 'CALC 2'}, set(), graph)
@@ -0,0 +1,108 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.requirements import Program, RequirementCategory
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.plan_store import PlanManager, PlanState, PlanStore, MemoryPlanStore, RedisPlanStore
+from models.planning.semester import Semester
+from tests.unit.test_cache import FakeRedis
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    return Catalog([make_course(c) for c in ["CS 1101", "CS 2201", "CS 3251", "MATH 1300"]], version="v1")
+
+@pytest.fixture
+def programs():
+    return {7: Program("CS", "major", 30, [
+        RequirementCategory("Core", 6, [CourseListRequirement(["CS 1101", "CS 2201"])]),
+        RequirementCategory("Upper", 3, [CourseFilterRequirement(subject="CS", min_level=3000)]),
+    ])}
+
+def make_manager(store, catalog, programs, **kwargs):
+    return PlanManager(store, lambda: catalog, lambda ids: [programs[i] for i in ids if i in programs], **kwargs)
+
+def snapshot(planner):
+    state = planner.student_state
+    return ([c.get_course_code() for c in state.completed_courses], planner.assigner.assignments,
+            str(state.get_current_semester()), [p.name for p in planner.plan_config.programs])
+
+def test_state_round_trip(catalog, programs):
+    manager = make_manager(MemoryPlanStore(), catalog, programs)
+    plan_id, planner = manager.create([7], Semester("Fall", 2024))
+    planner.add_completed_courses({"CS 2201": [("CS", "Core")], "CS 1101": [("CS", "Core")]})
+    planner.advance_semester()
+    state = PlanState.from_planner(planner, [7])
+    restored = PlanState.from_bytes(state.to_bytes()).rehydrate(catalog, [programs[7]])
+    assert snapshot(restored) == snapshot(planner)
+    assert snapshot(restored)[0] == ["CS 2201", "CS 1101"]
+    with pytest.raises(ValueError):
+        PlanState.from_bytes(b'{"v":99}')
+
+def test_evicted_planner_is_rehydrated(catalog, programs):
+    store = MemoryPlanStore()
+    manager = make_manager(store, catalog, programs, max_live=1)
+    first, planner = manager.create([7], Semester("Fall", 2024))
+    planner.add_completed_courses({"CS 1101": [("CS", "Core")]})
+    manager.save(first, planner)
+    expected = snapshot(planner)
+    manager.create([7], Semester("Spring", 2025))
+    assert manager.stats()["live_planners"] == 1
+    rebuilt = manager.get(first)
+    assert rebuilt is not planner
+    assert snapshot(rebuilt) == expected
+    assert manager.get(first) is rebuilt
+    assert (manager.hits, manager.rehydrations) == (1, 1)
+    assert manager.get(99) is None
+
+def test_save_after_eviction_keeps_the_programs(catalog, programs):
+    store = MemoryPlanStore()
+    manager = make_manager(store, catalog, programs, max_live=1)
+    first = manager.get(manager.create([7], Semester("Fall", 2024))[0])
+    manager.create([7], Semester("Spring", 2025))
+    first.add_completed_courses({"CS 1101": [("CS", "Core")]})
+    manager.save(0, first)
+    assert PlanState.from_bytes(store.load(0)).program_ids == [7]
+    assert [p.name for p in manager.get(0).plan_config.programs] == ["CS"]
+
+def test_idle_planners_are_dropped(catalog, programs):
+    manager = make_manager(MemoryPlanStore(), catalog, programs, idle_seconds=-1)
+    plan_id, _ = manager.create([7], Semester("Fall", 2024))
+    assert manager.stats()["live_planners"] == 0
+    assert manager.get(plan_id) is not None
+
+def test_memory_store_is_bounded():
+    store = MemoryPlanStore(max_plans=2)
+    assert store.free_capacity() == 2
+    for plan_id in range(3):
+        store.save(plan_id, b"x")
+    assert store.load(0) is None
+    assert store.evictions == 1
+    assert store.free_capacity() == 0
+    assert MemoryPlanStore(max_plans=0).free_capacity() is None
+
+def test_shared_store_sees_other_workers(catalog, programs):
+    redis = FakeRedis()
+    mine = make_manager(RedisPlanStore(redis, ttl=60), catalog, programs)
+    theirs = make_manager(RedisPlanStore(redis, ttl=60), catalog, programs)
+    plan_id, planner = mine.create([7], Semester("Fall", 2024))
+    assert plan_id == 0 and theirs.create([7], Semester("Fall", 2024))[0] == 1
+    other = theirs.get(plan_id)
+    other.add_completed_courses({"CS 3251": [("CS", "Upper")]})
+    theirs.save(plan_id, other)
+    assert redis.expiry["plan:0"] == 60
+    assert snapshot(mine.get(plan_id))[0] == ["CS 3251"]
+
+def test_new_catalog_snapshot_rebuilds_planner(catalog, programs):
+    current = {"catalog": catalog}
+    manager = PlanManager(MemoryPlanStore(), lambda: current["catalog"], lambda ids: [programs[i] for i in ids])
+    plan_id, planner = manager.create([7], Semester("Fall", 2024))
+    current["catalog"] = Catalog(catalog.courses + [make_course("CS 4260")], version="v2")
+    assert manager.get(plan_id).catalog is current["catalog"]
+
+def test_plan_store_base_requires_every_operation():
+    class PartialStore(PlanStore):
+        def load(self, plan_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialStore()
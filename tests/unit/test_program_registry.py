@@ -0,0 +1,95 @@
+import copy
+import json
+import pytest
+from types import SimpleNamespace
+from config.config import PROGRAMS_PATH
+from models.requirements.registry import ProgramRegistry
+
+def to_orm_rows(programs_json):
+    rows = []
+    for pid, prog in enumerate(programs_json, start=1):
+        categories = [
+            SimpleNamespace(
+                category=cat['category'],
+                min_credits=cat['min_credits'],
+                notes=cat.get('notes'),
+                requirements=[
+                    SimpleNamespace(type=req['type'], data=req, min_credits=req.get('min_credits'), notes=req.get('note'))
+                    for req in cat.get('requirements', [])
+                ]
+            )
+            for cat in prog.get('categories', [])
+        ]
+        rows.append(SimpleNamespace(
+            id=pid, name=prog['name'], type=prog['type'], total_credits=prog['total_credits'],
+            notes=prog.get('notes'), school=prog.get('school'), categories=categories
+        ))
+    return rows
+
+class FakeProgramTables:
+    def __init__(self):
+        with open(PROGRAMS_PATH) as f:
+            self.rows = to_orm_rows(json.load(f))
+        self.version = "v1"
+        self.loaded_ids = []
+
+    def load(self, program_ids=None):
+        self.loaded_ids.append(None if program_ids is None else sorted(program_ids))
+        if program_ids is None:
+            return list(self.rows)
+        return [row for row in self.rows if row.id in set(program_ids)]
+
+    def ids(self):
+        return [row.id for row in self.rows]
+
+    def probe(self):
+        return self.version
+
+@pytest.fixture
+def tables():
+    return FakeProgramTables()
+
+@pytest.fixture
+def registry(tables):
+    return ProgramRegistry(loader=tables.load, id_loader=tables.ids, version_probe=tables.probe, refresh_interval=0)
+
+def test_programs_built_once_and_shared(registry, tables):
+    first = registry.get_all()
+    second = registry.get_all()
+    assert first is second
+    assert [p.name for p in first] == [row.name for row in tables.rows]
+    assert registry.stats()["builds"] == len(tables.rows)
+
+def test_get_many_loads_only_referenced_programs(registry, tables):
+    programs = registry.get_many([1])
+    assert [p.name for p in programs] == [tables.rows[1].name]
+    assert tables.loaded_ids == [[tables.rows[1].id]]
+    # A later full load reuses the program that was already built
+    registry.get_all()
+    assert registry.get_all()[1] is programs[0]
+    assert registry.stats()["builds"] == len(tables.rows)
+
+def test_refresh_rebuilds_only_changed_program(registry, tables):
+    before = registry.get_all()
+    changed = copy.deepcopy(tables.rows[0])
+    changed.categories[0].min_credits += 1
+    tables.rows[0] = changed
+    tables.version = "v2"
+    assert registry.refresh() is True
+    after = registry.get_all()
+    assert after is not before
+    assert after[0] is not before[0]
+    assert after[0].categories[0].min_credits == before[0].categories[0].min_credits + 1
+    assert after[1] is before[1]
+
+def test_refresh_noop_when_version_unchanged(registry):
+    registry.get_all()
+    generation = registry.generation
+    assert registry.refresh() is False
+    assert registry.generation == generation
+
+def test_reload_single_program_removed(registry, tables):
+    registry.get_all()
+    removed = tables.rows.pop(0)
+    assert registry.reload_program(removed.id) is True
+    assert [p.name for p in registry.get_all()] == [row.name for row in tables.rows]
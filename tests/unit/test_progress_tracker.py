@@ -0,0 +1,73 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.graph.dependency_graph import DependencyGraph
+from models.graph.eligibility import CourseEligibility
+from models.requirements import Program, RequirementCategory
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.requirements.requirement_types.evaluation import RequirementEvaluator
+from models.planning.progress_tracker import ProgressTracker
+from models.planning.recommendation_engine import get_unmet_requirements
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    return Catalog([
+        make_course('CS 1101'),
+        make_course('CS 2201', prereqs=[['CS 1101']]),
+        make_course('CS 3251', prereqs=[['CS 2201']]),
+        make_course('CS 3270', prereqs=[['CS 2201']], coreqs=[['CS 3271']]),
+        make_course('CS 3271', 1, prereqs=[['CS 2201']]),
+        make_course('PHYS 1601', 4, prereqs=[['CS 1101']], coreqs=[['PHYS 1601L']]),
+        make_course('PHYS 1601L', 1, coreqs=[['PHYS 1601']]),
+    ], version="v1")
+
+@pytest.fixture
+def programs():
+    return [Program("CS", "major", 12, [
+        RequirementCategory("Core", 6, [CourseListRequirement(['CS 1101', 'CS 2201'])]),
+        RequirementCategory("Upper", 3, [CourseFilterRequirement(subject="CS", min_level=3000)]),
+        RequirementCategory("Science", 5, [CourseListRequirement(['PHYS 1601', 'PHYS 1601L'])]),
+    ])]
+
+def assert_matches_recomputation(tracker, catalog, programs, graph):
+    completed = list(tracker.completed.values())
+    assert tracker.unmet_requirements() == get_unmet_requirements(programs, completed, tracker.assignments)
+    for program in programs:
+        assert tracker.program_progress(program) == program.progress(completed, tracker.assignments, RequirementEvaluator())
+    assert tracker.eligible_codes() == CourseEligibility.eligible_set(list(tracker.completed), (), graph)
+
+def test_updates_match_full_recomputation(catalog, programs):
+    graph = DependencyGraph(catalog)
+    assignments = {}
+    tracker = ProgressTracker(graph, programs, [], assignments)
+    assert_matches_recomputation(tracker, catalog, programs, graph)
+    steps = [('CS 1101', ("CS", "Core")), ('CS 2201', ("CS", "Core")), ('CS 3271', None),
+             ('PHYS 1601', ("CS", "Science")), ('CS 3251', ("CS", "Upper"))]
+    for code, pair in steps:
+        tracker.add(catalog.get_by_course_code(code))
+        if pair:
+            assignments.setdefault(code, []).append(pair)
+            tracker.sync(code)
+        assert_matches_recomputation(tracker, catalog, programs, graph)
+    for code in ['CS 2201', 'CS 3271', 'CS 1101']:
+        tracker.remove(code)
+        assert_matches_recomputation(tracker, catalog, programs, graph)
+
+def test_add_touches_only_assigned_categories_and_unlocked_courses(catalog, programs, monkeypatch):
+    graph = DependencyGraph(catalog)
+    assignments = {'CS 1101': [("CS", "Core")]}
+    tracker = ProgressTracker(graph, programs, [catalog.get_by_course_code('CS 1101')], assignments)
+    assert tracker.eligible_codes() == {'CS 2201', 'PHYS 1601', 'PHYS 1601L'}
+
+    refreshed, checked = [], []
+    original_refresh, original_evaluate = tracker._refresh, CourseEligibility.evaluate
+    monkeypatch.setattr(tracker, "_refresh", lambda keys: (refreshed.extend(keys), original_refresh(keys)))
+    monkeypatch.setattr(CourseEligibility, "evaluate", lambda code, *args: (checked.append(code), original_evaluate(code, *args))[1])
+
+    tracker.add(catalog.get_by_course_code('CS 2201'))
+    assignments['CS 2201'] = [("CS", "Core")]
+    tracker.sync('CS 2201')
+    assert refreshed == [("CS", "Core")]
+    assert set(checked) == {'CS 2201', 'CS 3251', 'CS 3270', 'CS 3271'}
+    assert tracker.eligible_codes() == {'PHYS 1601', 'PHYS 1601L', 'CS 3251', 'CS 3270', 'CS 3271'}
+    assert ("CS", "Core") not in tracker.unmet_requirements()
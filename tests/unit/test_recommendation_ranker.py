@@ -0,0 +1,46 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.requirements import Program, RequirementCategory
+from models.requirements.policy_engine import PolicyEngine
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.academic_planner import AcademicPlanner
+from models.planning.semester import Semester
+from tests.helpers import make_course
+
+@pytest.fixture
+def planner():
+    catalog = Catalog([
+        make_course('CS 1101'),
+        make_course('CS 2201', prereqs=[['CS 1101']]),
+        make_course('CS 3251', prereqs=[['CS 2201']]),
+        make_course('CS 1000', 1),
+        make_course('CS 1050', 6),
+        make_course('HIST 1000'),
+        make_course('HIST 1100'),
+        make_course('HIST 1200'),
+    ], version="v1")
+    program = Program("CS", "major", 12, [
+        RequirementCategory("Core", 9, [CourseListRequirement(['CS 1101', 'CS 2201', 'CS 3251'])]),
+        RequirementCategory("Electives", 3, [CourseFilterRequirement(subject="CS", max_level=1000)]),
+        RequirementCategory("Humanities", 3, [CourseFilterRequirement(subject="HIST")]),
+    ])
+    return AcademicPlanner(catalog, [program], Semester("Fall", 2024), PolicyEngine(policy_config=[]))
+
+def codes(items):
+    return [[c.get_course_code() for c in item] if isinstance(item, list) else item.get_course_code() for item in items]
+
+def test_ranks_by_requirements_unlocks_height_and_credit_fit(planner):
+    ranked = planner.get_ranked_recommendations(limit=2)
+    assert ranked["totals"] == {"Core": 1, "Electives": 3, "Humanities": 3}
+    assert ranked["offset"] == 0 and ranked["limit"] == 2
+    # CS 1101 counts for two requirements and starts the longest chain; CS 1050 overshoots the 3 credits left
+    assert codes(ranked["recommendations"]["Electives"]) == ["CS 1101", "CS 1000"]
+    assert codes(ranked["recommendations"]["Core"]) == ["CS 1101"]
+    # Equal scores fall back to course code order
+    assert codes(ranked["recommendations"]["Humanities"]) == ["HIST 1000", "HIST 1100"]
+
+def test_pages_continue_the_same_order(planner):
+    full = codes(planner.get_ranked_recommendations(limit=10)["recommendations"]["Humanities"])
+    pages = [codes(planner.get_ranked_recommendations(limit=1, offset=i)["recommendations"]["Humanities"]) for i in range(4)]
+    assert full == ["HIST 1000", "HIST 1100", "HIST 1200"]
+    assert pages == [["HIST 1000"], ["HIST 1100"], ["HIST 1200"], []]
@@ -0,0 +1,58 @@
+import pytest
+from models.requirements.requirement_types import (
+    CourseListRequirement, CourseOptionsRequirement, CourseFilterRequirement, CompoundRequirement, RequirementEvaluator
+)
+from tests.helpers import make_course
+
+@pytest.fixture
+def courses():
+    return [
+        make_course("CS 1101"),
+        make_course("CS 2201", credits=4),
+        make_course("MATH 1300", credits=4),
+        make_course("HIST 3000", axle=["HCA"]),
+    ]
+
+@pytest.fixture
+def requirements():
+    core = CourseListRequirement(["CS 1101", "CS 2201"])
+    calc = CourseOptionsRequirement(["MATH 1300", "MATH 1301"])
+    upper = CourseFilterRequirement(subject="CS", min_level=2000, min_credits=6)
+    humanities = CourseFilterRequirement(tags=["HCA"])
+    return [core, calc, upper, humanities,
+            CompoundRequirement([core, calc], op="AND"),
+            CompoundRequirement([upper, calc], op="OR")]
+
+def test_results_match_requirement_methods(requirements, courses):
+    evaluator = RequirementEvaluator()
+    for req in requirements:
+        result = evaluator.evaluate(req, courses)
+        assert result.credits == req.satisfied_credits(courses)
+        assert [c.get_course_code() for c in result.matched] == [c.get_course_code() for c in req.get_completed_courses(courses)]
+
+def test_satisfaction(requirements, courses):
+    core, calc, upper, humanities, both, either = requirements
+    evaluator = RequirementEvaluator()
+    assert evaluator.evaluate(core, courses).satisfied
+    assert not evaluator.evaluate(core, courses[:1]).satisfied
+    assert evaluator.evaluate(calc, courses).satisfied
+    # As a compound option a filter needs its min_credits; only 4 upper-level CS credits here
+    assert not evaluator.evaluate(upper, courses).option_satisfied
+    assert evaluator.evaluate(upper, courses).satisfied
+    assert evaluator.evaluate(either, courses).satisfied
+    # OR keeps the option with the most credits; ties keep the first
+    assert evaluator.evaluate(either, courses).matched == [courses[1]]
+
+def test_shared_subtrees_evaluated_once(requirements, courses):
+    core, calc, upper, humanities, both, either = requirements
+    evaluator = RequirementEvaluator()
+    evaluator.evaluate(both, courses)
+    evaluator.evaluate(either, courses)
+    evaluator.evaluate(core, courses)
+    # core, calc, both, upper, either; calc and core are memo hits the second time
+    assert evaluator.evaluations == 5
+    assert evaluator.hits == 2
+
+def test_plan_compiled_once(requirements):
+    core = requirements[0]
+    assert core.evaluation_plan() is core.evaluation_plan()
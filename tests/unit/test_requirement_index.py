@@ -0,0 +1,53 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.requirements import Program, RequirementCategory
+from models.requirements.requirement_index import RequirementIndex, program_postings
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.requirement_assigner import RequirementAssigner
+from tests.helpers import make_course
+
+def make_program(name, upper_subject="CS"):
+    return Program(name, "major", 30, [
+        RequirementCategory("Core", 6, [CourseListRequirement(["CS 1101", "CS 2201"])]),
+        RequirementCategory("Upper", 6, [CourseFilterRequirement(subject=upper_subject, min_level=3000)]),
+    ])
+
+@pytest.fixture
+def catalog():
+    return Catalog([make_course(c) for c in ["CS 1101", "CS 2201", "CS 3251", "MATH 3100", "MATH 1300"]], version="v1")
+
+def test_matches_and_categories(catalog):
+    cs, math = make_program("CS"), make_program("Math", upper_subject="MATH")
+    index = RequirementIndex([cs, math], catalog)
+    assert index.categories_for("CS 1101") == [("CS", "Core"), ("Math", "Core")]
+    assert index.categories_for("MATH 3100") == [("Math", "Upper")]
+    assert index.categories_for("MATH 1300") == []
+    assert index.satisfies("CS 3251", "Upper")
+    assert not index.satisfies("CS 3251", "Upper", program_name="Math")
+
+def test_postings_shared_and_rebuilt_per_program(catalog):
+    cs, math = make_program("CS"), make_program("Math", upper_subject="MATH")
+    first = program_postings(cs, catalog)
+    RequirementIndex([cs, math], catalog)
+    assert program_postings(cs, catalog) is first
+    # A reloaded program is a new object and is indexed on its own
+    reloaded = make_program("CS", upper_subject="MATH")
+    assert program_postings(reloaded, catalog) is not first
+    assert program_postings(cs, catalog) is first
+
+def test_postings_follow_catalog_snapshot(catalog):
+    cs = make_program("CS")
+    program_postings(cs, catalog)
+    newer = Catalog(catalog.courses + [make_course("CS 4260")], version="v2")
+    assert "CS 4260" in program_postings(cs, newer)
+    assert "CS 4260" not in program_postings(cs, catalog)
+
+def test_assigner_uses_index_for_catalog_courses(catalog):
+    cs = make_program("CS")
+    assigner = RequirementAssigner([cs], catalog=catalog)
+    course = catalog.get_by_course_code("CS 3251")
+    assert assigner.get_assignable_categories(course) == [("CS", "Upper")]
+    assert assigner.assign_course_to_requirement(course, "Upper")
+    assert not assigner.assign_course_to_requirement(catalog.get_by_course_code("MATH 3100"), "Upper")
+    # Courses that are not from the catalog snapshot are checked directly
+    assert assigner.get_assignable_categories(make_course("CS 3999")) == [("CS", "Upper")]
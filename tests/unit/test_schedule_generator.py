@@ -0,0 +1,78 @@
+import pytest
+from models.courses.catalog import Catalog
+from models.graph.dependency_graph import DependencyGraph
+from models.requirements import Program, RequirementCategory
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.schedule_generator import ScheduleGenerator
+from models.planning.semester import Semester
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    return Catalog([
+        make_course('CS 1101'),
+        make_course('CS 2201', prereqs=[['CS 1101']]),
+        make_course('CS 3251', prereqs=[['CS 2201']]),
+        make_course('CS 3270', prereqs=[['CS 2201']]),
+        make_course('MATH 1300', 4),
+        make_course('MATH 1301', 4, prereqs=[['MATH 1300']]),
+        make_course('PHYS 1601', 4, coreqs=[['PHYS 1601L']]),
+        make_course('PHYS 1601L', 1, coreqs=[['PHYS 1601']]),
+    ], version="v1")
+
+@pytest.fixture
+def program():
+    return Program("CS", "major", 26, [
+        RequirementCategory("Core", 9, [CourseListRequirement(['CS 1101', 'CS 2201', 'CS 3251'])]),
+        RequirementCategory("Upper", 3, [CourseFilterRequirement(subject="CS", min_level=3000)]),
+        RequirementCategory("Math", 8, [CourseListRequirement(['MATH 1300', 'MATH 1301'])]),
+        RequirementCategory("Science", 5, [CourseListRequirement(['PHYS 1601', 'PHYS 1601L'])]),
+    ])
+
+def generate(catalog, program, completed=(), assignments=None, max_credits=10, num_semesters=8):
+    generator = ScheduleGenerator(catalog, DependencyGraph(catalog), [program], max_credits=max_credits)
+    courses = [catalog.get_by_course_code(code) for code in completed]
+    return generator.generate(courses, assignments or {}, Semester("Fall", 2024), num_semesters)
+
+def test_schedule_respects_prerequisites_caps_and_coreqs(catalog, program):
+    result = generate(catalog, program)
+    assert [term["courses"] for term in result["semesters"]] == [
+        ['CS 1101', 'MATH 1300'],
+        ['CS 2201', 'MATH 1301'],
+        ['CS 3251', 'PHYS 1601', 'PHYS 1601L'],
+        ['CS 3270'],
+    ]
+    assert [term["term"] for term in result["semesters"]] == ['Fall 2024', 'Spring 2025', 'Fall 2025', 'Spring 2026']
+    assert all(term["credits"] <= 10 for term in result["semesters"])
+    assert result["semesters"][3]["assignments"] == {'CS 3270': [('CS', 'Upper')]}
+    assert result["complete"] and result["unmet"] == []
+
+def test_schedule_starts_from_progress_and_reports_unmet(catalog, program):
+    assignments = {'CS 1101': [('CS', 'Core')]}
+    result = generate(catalog, program, completed=['CS 1101'], assignments=assignments, num_semesters=1)
+    assert result["semesters"][0]["courses"] == ['CS 2201', 'MATH 1300']
+    assert not result["complete"]
+    assert {entry["category"] for entry in result["unmet"]} == {"Core", "Upper", "Math", "Science"}
+    assert assignments == {'CS 1101': [('CS', 'Core')]}
+
+def test_lab_waits_for_a_term_its_lecture_fits_in():
+    # The lecture is a target of its own, so it is reached before its lab; the lab ranks higher
+    # (BIO 2200 needs it), but beside CS 1101 only the lab would fit in the first term
+    catalog = Catalog([
+        make_course('CS 1101'),
+        make_course('CS 2201', prereqs=[['CS 1101']]),
+        make_course('CS 3251', prereqs=[['CS 2201']]),
+        make_course('BIO 1100', 4),
+        make_course('BIO 1100L', 1, coreqs=[['BIO 1100']]),
+        make_course('BIO 2200', 1, prereqs=[['BIO 1100L']]),
+    ], version="v1")
+    codes = ['CS 1101', 'CS 2201', 'CS 3251', 'BIO 1100', 'BIO 1100L', 'BIO 2200']
+    program = Program("Bio", "major", 15, [RequirementCategory("Core", 15, [CourseListRequirement(codes)])])
+    result = generate(catalog, program, max_credits=5)
+    assert [term["courses"] for term in result["semesters"]] == [
+        ['CS 1101'],
+        ['BIO 1100', 'BIO 1100L'],
+        ['CS 2201', 'BIO 2200'],
+        ['CS 3251'],
+    ]
+    assert result["complete"]
@@ -0,0 +1,41 @@
+import json
+import pytest
+from api.schemas import CourseSchema
+from api.streaming import course_fragment, course_fragments, json_array, ndjson, recommendations_json, recommendation_lines
+from models.courses.catalog import Catalog
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    codes = [f"CS {1100 + i}" for i in range(7)]
+    return Catalog([make_course(code, title=f"Title {code} – \"quoted\"", axle=["HCA"], prerequisites=[["CS 1101"]])
+                    for code in codes], version="v1")
+
+def test_fragment_matches_course_schema_and_is_reused(catalog):
+    course = catalog.courses[0]
+    fields = course.to_dict()
+    expected = CourseSchema(**{name: fields[name] for name in CourseSchema.model_fields})
+    assert json.loads(course_fragment(catalog, course)) == json.loads(expected.model_dump_json())
+    assert course_fragment(catalog, course) is course_fragment(catalog, course)
+
+@pytest.mark.parametrize("chunk_items", [1, 3, 7, 100])
+def test_array_and_ndjson_chunks_join_to_every_course(catalog, chunk_items):
+    chunks = list(json_array(course_fragments(catalog, catalog.courses), chunk_items))
+    assert len(chunks) == -(-7 // chunk_items) + 1
+    assert [c["course_code"] for c in json.loads(b"".join(chunks))] == [c.course_code for c in catalog.courses]
+
+    lines = b"".join(ndjson(course_fragments(catalog, catalog.courses), chunk_items)).splitlines()
+    assert [json.loads(line)["course_code"] for line in lines] == [c.course_code for c in catalog.courses]
+    assert b"".join(json_array([], chunk_items)) == b"[]"
+
+def test_recommendations_are_spliced_from_fragments(catalog):
+    a, b, c = catalog.courses[:3]
+    ranked = {"recommendations": {"Core": [a, [b, c]], "Empty \"one\"": []}, "totals": {"Core": 9, "Empty \"one\"": 0},
+              "offset": 2, "limit": 2}
+    data = json.loads(recommendations_json(catalog, ranked))
+    assert data["recommendations"]["Core"][0] == json.loads(course_fragment(catalog, a))
+    assert [course["course_code"] for course in data["recommendations"]["Core"][1]] == [b.course_code, c.course_code]
+    assert (data["recommendations"]["Empty \"one\""], data["totals"], data["offset"], data["limit"]) == ([], ranked["totals"], 2, 2)
+
+    lines = [json.loads(line) for line in recommendation_lines(catalog, ranked)]
+    assert [(line["category"], line["total"], len(line["items"])) for line in lines] == [("Core", 9, 2), ("Empty \"one\"", 0, 0)]
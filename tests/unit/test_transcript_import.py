@@ -0,0 +1,72 @@
+import json
+import pytest
+from models.courses.catalog import Catalog
+from models.requirements import Program, RequirementCategory
+from models.requirements.requirement_types import CourseListRequirement, CourseFilterRequirement
+from models.planning.plan_store import MemoryPlanStore, PlanManager
+from models.planning.transcript_import import TranscriptImporter, read_transcripts
+from tests.helpers import make_course
+
+@pytest.fixture
+def catalog():
+    return Catalog([make_course(c) for c in ["CS 1101", "CS 2201", "CS 3251", "MATH 1300"]], version="v1")
+
+@pytest.fixture
+def programs():
+    return [
+        (7, Program("CS", "major", 12, [
+            RequirementCategory("Core", 6, [CourseListRequirement(["CS 1101", "CS 2201"])]),
+            RequirementCategory("Upper", 3, [CourseFilterRequirement(subject="CS", min_level=3000)]),
+        ])),
+        (9, Program("Math", "minor", 3, [
+            RequirementCategory("Math", 3, [CourseFilterRequirement(subject="MATH")]),
+        ])),
+    ]
+
+def transcript(student_id, program_ids, courses):
+    return json.dumps({"student_id": student_id, "program_ids": program_ids,
+                       "courses": [{"course_code": code, "term": term} for code, term in courses]})
+
+def test_readers_parse_jsonl_and_grouped_csv_rows():
+    jsonl = [transcript("s1", [0], [("CS 1101", "Fall 2023")]), "", "not json"]
+    records = list(read_transcripts(jsonl, "jsonl"))
+    assert [(r.student_id, r.program_ids, r.courses, r.error) for r in records[:1]] == [("s1", [0], [("CS 1101", "Fall 2023")], None)]
+    assert records[1].student_id == "line 3" and records[1].error
+
+    csv_lines = ["student_id,program_ids,course_code,term",
+                 "s1,0;1,CS 1101,Fall 2023", "s1,0;1,MATH 1300,Spring 2024", "s2,x,CS 1101,Fall 2023", "s3,1,,"]
+    records = list(read_transcripts(csv_lines, "csv"))
+    assert [(r.student_id, r.program_ids, r.courses) for r in records if r.error is None] == [
+        ("s1", [0, 1], [("CS 1101", "Fall 2023"), ("MATH 1300", "Spring 2024")]), ("s3", [1], [])]
+    assert [r.student_id for r in records if r.error] == ["s2"]
+
+    with pytest.raises(ValueError):
+        read_transcripts([], "xml")
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_creates_plans_and_reports_failures(catalog, programs, workers):
+    lines = [
+        transcript("s1", [0, 1], [("CS 2201", "Spring 2024"), ("CS 1101", "Fall 2023"), ("MATH 1300", "Fall 2023")]),
+        transcript("s2", [0], [("CS 9999", "Fall 2023"), ("CS 1101", "Fall 2023")]),
+        transcript("s3", [5], []),
+        transcript("s4", [0], [("CS 1101", "Winter 2023")]),
+        transcript("s5", [1], []),
+    ]
+    manager = PlanManager(MemoryPlanStore(), lambda: catalog, lambda ids: [p for db_id, p in programs if db_id in ids])
+    report = TranscriptImporter(catalog, programs, manager.import_plan, policy_config=[], workers=workers, chunk_size=2).run(
+        read_transcripts(lines))
+
+    assert report["plans_created"] == 3 and report["failed"] == 2
+    assert sorted(report["plan_ids"]) == ["s1", "s2", "s5"]
+    assert sorted(f["student_id"] for f in report["failures"]) == ["s3", "s4"]
+    # Courses the catalog does not have are left out of the plan and listed, not a failure
+    assert report["skipped_courses"] == {"s2": ["CS 9999"]}
+    assert [c.get_course_code() for c in manager.get(report["plan_ids"]["s2"]).student_state.get_completed_courses()] == ["CS 1101"]
+
+    planner = manager.get(report["plan_ids"]["s1"])
+    assert [c.get_course_code() for c in planner.student_state.get_completed_courses()] == ["CS 1101", "MATH 1300", "CS 2201"]
+    semester = planner.student_state.get_current_semester()
+    assert (semester.season, semester.year) == ("Fall", 2024)
+    assignments = planner.get_assignments()
+    assert assignments["CS 1101"] == [("CS", "Core")] and assignments["MATH 1300"] == [("Math", "Math")]
+    assert [p.name for p in manager.get(report["plan_ids"]["s5"]).plan_config.programs] == ["Math"]
@@ -0,0 +1,68 @@
+import random
+import pytest
+from models.graph.closure import TransitiveClosure
+from models.graph.dependency_graph import DependencyGraph
+from tests.helpers import make_course, MockCatalog
+
+@pytest.fixture
+def graph():
+    # D needs (B or C); B and C need A; E needs D; F stands alone
+    return DependencyGraph(MockCatalog([
+        make_course('A'),
+        make_course('B', prereqs=[['A']]),
+        make_course('C', prereqs=[['A']]),
+        make_course('D', prereqs=[['B', 'C']]),
+        make_course('E', prereqs=[['D']]),
+        make_course('F'),
+    ]))
+
+def reachable(direct, start):
+    seen, stack = set(), [start]
+    while stack:
+        node = stack.pop()
+        for j in range(len(direct)):
+            if direct[node] >> j & 1 and j not in seen:
+                seen.add(j)
+                stack.append(j)
+    return sum(1 << j for j in seen)
+
+def test_ancestors_and_descendants(graph):
+    assert sorted(graph.get_all_prerequisites('E')) == ['A', 'B', 'C', 'D']
+    assert sorted(graph.get_all_dependents('A')) == ['B', 'C', 'D', 'E']
+    assert graph.get_all_dependents('F') == [] and graph.get_all_prerequisites('Z') == []
+    assert graph.requires('E', 'A')
+    assert not graph.requires('A', 'E')
+    assert not graph.requires('E', 'F')
+
+def test_cycles_terminate():
+    closure = TransitiveClosure([0b010, 0b100, 0b001])
+    assert closure.ancestors == (0b111, 0b111, 0b111)
+
+def test_incremental_update_matches_rebuild():
+    rng = random.Random(7)
+    size = 40
+    direct = [sum(1 << j for j in range(i) if rng.random() < 0.08) for i in range(size)]
+    closure = TransitiveClosure(direct)
+    for _ in range(30):
+        course = rng.randrange(size)
+        bits = sum(1 << j for j in range(size) if j != course and rng.random() < 0.06)
+        closure = closure.with_prerequisites(course, bits)
+        direct[course] = bits
+        rebuilt = TransitiveClosure(direct)
+        assert closure.ancestors == rebuilt.ancestors
+        assert closure.descendants == rebuilt.descendants
+    assert all(closure.ancestors[i] == reachable(direct, i) for i in range(size))
+
+def test_next_snapshot_derives_closure_from_previous(graph, monkeypatch):
+    before = graph.closure()
+    updates = []
+    update = TransitiveClosure.with_prerequisites
+    monkeypatch.setattr(TransitiveClosure, "with_prerequisites",
+                        lambda self, course_id, bits: updates.append(course_id) or update(self, course_id, bits))
+    courses = [make_course(c.course_code, prerequisites=c.prerequisites) for c in graph.catalog.courses]
+    courses[4] = make_course('E', prereqs=[['D'], ['F']])
+    newer = DependencyGraph(MockCatalog(courses), previous=graph)
+    assert newer.closure() is not before
+    assert updates == [graph.index.get('E')]
+    assert sorted(newer.get_all_prerequisites('E')) == ['A', 'B', 'C', 'D', 'F']
+    assert newer.get_all_dependents('F') == ['E']